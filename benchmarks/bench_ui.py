@@ -0,0 +1,143 @@
+"""Frame-cost benchmark for overlay updates, run headless.
+
+    python benchmarks/bench_ui.py
+    python benchmarks/bench_ui.py --sizes 10 100 500 --ticks 60 --output ui.json
+
+Drives WarframeOverlay + OverlayController.process_world_state / update_cycle_display
+under QT_QPA_PLATFORM=offscreen with synthetic world states of increasing size and
+reports, per countdown tick: CPU time, layout time (processing the posted
+LayoutRequest/resize events) and Python allocations.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+TIERS = ['Lith', 'Meso', 'Neo', 'Axi', 'Requiem', 'Omni']
+MISSIONS = ['Capture', 'Survival', 'Defense', 'Exterminate', 'Rescue', 'Sabotage', 'Mobile Defense', 'Disruption']
+ENEMIES = ['Grineer', 'Corpus', 'Infested', 'Orokin', 'Crossfire']
+
+def synthetic_state(base, fissures, baro_items, seed=1):
+    """Copy of a real world state with `fissures` fissures and a Baro visit carrying `baro_items` items."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    iso = lambda dt: dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+    state = copy.deepcopy(base)
+    state['fissures'] = [{
+        'id': f"synthetic{i}",
+        'tier': rng.choice(TIERS),
+        'missionType': rng.choice(MISSIONS),
+        'node': f"Node {i} (Planet {i % 17})",
+        'enemy': rng.choice(ENEMIES),
+        'expiry': iso(now + timedelta(minutes=rng.randint(5, 180))),
+        'isHard': rng.random() < 0.4,
+        'isStorm': rng.random() < 0.15,
+    } for i in range(fissures)]
+    state['voidTrader'] = {
+        'active': True,
+        'location': 'Strata Relay (Earth)',
+        'activation': iso(now - timedelta(hours=2)),
+        'inventory': [{'item': f"Primed Synthetic Mod {i}", 'ducats': 300 + i, 'credits': 100000} for i in range(baro_items)],
+    }
+    for key in ('earthCycle', 'cetusCycle', 'vallisCycle', 'cambionCycle', 'zarimanCycle'):
+        state.setdefault(key, {})['expiry'] = iso(now + timedelta(minutes=rng.randint(10, 90)))
+    return state
+
+def make_controller():
+    """An OverlayController with hotkeys, timers and network disabled."""
+    from PyQt6.QtWidgets import QApplication
+    import config
+    import app
+
+    # The overlay autosaves geometry/notes; keep that away from the real config
+    config.CONFIG_FILE = os.path.join(tempfile.mkdtemp(prefix='pyframe-bench-'), 'config.json')
+
+    qt_app = QApplication.instance() or QApplication([])
+
+    class BenchController(app.OverlayController):
+        def __init__(self):
+            # Skip OverlayController.__init__ (hotkeys, timers, network); keep only render state
+            app.QObject.__init__(self)
+            self.app = qt_app
+            self.overlay = app.WarframeOverlay()
+            self.init_view_state()
+            self.engine = type('NoNetwork', (), {'last_fetch_time': time.time() + 3600})()
+
+        def update_world_data(self, force=False):
+            pass
+
+    controller = BenchController()
+    controller.overlay.show()
+    qt_app.processEvents()
+    return qt_app, controller
+
+def measure(app, controller, state, ticks):
+    """Apply state once, then run `ticks` countdown updates; return per-tick stats."""
+    start = time.process_time()
+    controller.process_world_state(state)
+    app.processEvents()
+    apply_ms = (time.process_time() - start) * 1000
+
+    cpu, layout, allocs = [], [], []
+    for _ in range(ticks):
+        tracemalloc.start()
+        t0 = time.process_time()
+        controller.update_cycle_display()
+        t1 = time.process_time()
+        app.processEvents() # Layout / polish / paint requests queued by setText
+        t2 = time.process_time()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        cpu.append((t1 - t0) * 1000)
+        layout.append((t2 - t1) * 1000)
+        allocs.append(peak / 1024)
+
+    return {
+        'apply_ms': round(apply_ms, 3),
+        'tick_cpu_ms': round(statistics.median(cpu), 3),
+        'tick_cpu_p90_ms': round(sorted(cpu)[int(len(cpu) * 0.9)], 3),
+        'tick_layout_ms': round(statistics.median(layout), 3),
+        'tick_alloc_peak_kb': round(statistics.median(allocs), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen overlay frame-cost benchmark")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 50, 100, 250, 500], help="Fissure counts")
+    parser.add_argument('--baro', type=int, nargs='*', default=[0, 50, 200], help="Baro inventory sizes")
+    parser.add_argument('--ticks', type=int, default=30)
+    parser.add_argument('--output', help="Write results JSON here")
+    args = parser.parse_args()
+
+    with open(os.path.join(BENCH_DIR, 'fixtures', 'world_state.json'), 'rb') as f:
+        base = json.load(f)
+
+    app, controller = make_controller()
+    results = []
+    print(f"{'fissures':>9}{'baro':>6}{'apply ms':>10}{'tick cpu':>10}{'p90':>8}{'layout':>9}{'alloc kb':>10}")
+    for baro in args.baro:
+        for size in args.sizes:
+            row = {'fissures': size, 'baro_items': baro,
+                   **measure(app, controller, synthetic_state(base, size, baro), args.ticks)}
+            results.append(row)
+            print(f"{size:>9}{baro:>6}{row['apply_ms']:>10}{row['tick_cpu_ms']:>10}{row['tick_cpu_p90_ms']:>8}"
+                  f"{row['tick_layout_ms']:>9}{row['tick_alloc_peak_kb']:>10}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'ticks': args.ticks, 'results': results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Refresh the replay fixtures from the real upstream services.
+
+    python benchmarks/record_fixtures.py "Volt Prime"
+
+The committed fixtures are trimmed, synthetic stand-ins of the same shape; re-record
+before comparing numbers against real-world payload sizes. In particular the
+__NEXT_DATA__ block in overframe_item.html was written by hand; re-recording it is
+the way to check html_parse.item_meta against a real item page.
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import http_client
+import item_registry
+import relic_values
+import update_cache
+import node_rewards
+from api_clients import OverframeClient, WarframeAPI
+from replay_server import FIXTURES_DIR
+
+def record(item="Volt Prime"):
+    market_key = item.lower().replace(' ', '_') + '_set'
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    targets = {
+        'world_state.json': f"{WarframeAPI.WORLD_STATE_URL}/?language=en",
+        'items_search.json': f"https://api.warframestat.us/items/search/{item.lower()}",
+        'market_orders.json': f"{WarframeAPI.MARKET_BASE_URL}/items/{market_key}/orders",
+        'market_item.json': f"{WarframeAPI.MARKET_BASE_URL}/items/{market_key}",
+        'wiki_parse.json': f"https://warframe.fandom.com/api.php?action=parse&page={item.replace(' ', '_')}&prop=text&format=json&section=0&redirects=1",
+        'overframe_item.html': OverframeClient.get_item_url(item),
+        'sitemap.xml': update_cache.SITEMAP_URL,
+        'market_items.json': item_registry.MARKET_ITEMS_URL,
+        'items_all.json': item_registry.WARFRAMESTAT_ITEMS_URL,
+        'relics.json': relic_values.DROPS_URL,
+        'mission_rewards.json': node_rewards.REWARDS_URL,
+    }
+    for name, url in targets.items():
+        if not url: continue
+        resp = http_client.get(url, headers=headers if 'market' in name else OverframeClient.HEADERS, timeout=30)
+        print(f"{resp.status_code} {len(resp.content):>8} B  {name}")
+        if resp.status_code == 200:
+            with open(os.path.join(FIXTURES_DIR, name), 'wb') as f:
+                f.write(resp.content)
+
+    build_url, _ = OverframeClient.get_top_build(item)
+    if build_url:
+        resp = http_client.get(build_url, headers=OverframeClient.HEADERS, timeout=30)
+        with open(os.path.join(FIXTURES_DIR, 'overframe_build.html'), 'wb') as f:
+            f.write(resp.content)
+        print(f"{resp.status_code} {len(resp.content):>8} B  overframe_build.html")
+
+    with open(os.path.join(FIXTURES_DIR, 'market_tradeable.json'), 'w') as f:
+        json.dump({'tradeable': [market_key]}, f, indent=1)
+
+if __name__ == "__main__":
+    record(sys.argv[1] if len(sys.argv) > 1 else "Volt Prime")
@@ -0,0 +1,234 @@
+"""Local stand-in for every upstream the overlay talks to, replaying fixture files.
+
+Requests arrive as /<original host>/<original path> (see http_client.UPSTREAM_OVERRIDE).
+Latency and errors can be injected globally or per host, and changed while running:
+
+    server = ReplayServer(latency=0.05, error_rate=0.1)
+    server.start()
+    http_client.set_upstream_override(server.base_url)
+
+Or standalone, to point a real overlay at it:
+
+    python benchmarks/replay_server.py --port 8099 --latency 80
+    set PYFRAME_UPSTREAM_OVERRIDE=http://127.0.0.1:8099
+
+It also stands in for a world-state push feed: any path ending in /events is a
+server-sent-event stream that sends the world_state.json fixture as a "snapshot"
+event, then whatever publish() is given, with heartbeats in between. drop_push()
+cuts every subscriber; push_enabled = False answers 404 so clients must poll.
+Responses carry an ETag and honour If-None-Match (304), like a conditional poll.
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# (host, path regex) -> fixture file. First match wins.
+ROUTES = [
+    ('api.warframestat.us', r'^/items/search/', 'items_search.json'),
+    ('api.warframestat.us', r'^/items/?$', 'items_all.json'),
+    ('api.warframe.market', r'^/v1/items$', 'market_items.json'),
+    ('api.warframestat.us', r'^/(pc|ps4|xb1|swi)/?', 'world_state.json'),
+    ('api.warframe.market', r'^/v1/items/[^/]+/orders$', 'market_orders.json'),
+    ('api.warframe.market', r'^/v1/items/[^/]+$', 'market_item.json'),
+    ('warframe.fandom.com', r'^/api\.php', 'wiki_parse.json'),
+    ('overframe.gg', r'^/items/arsenal/', 'overframe_item.html'),
+    ('overframe.gg', r'^/build/', 'overframe_build.html'),
+    ('overframe.gg', r'^/sitemap\.xml$', 'sitemap.xml'),
+    ('warframe.market', r'^/static/assets/', 'icon.png'),
+    ('drops.warframestat.us', r'^/data/relics\.json$', 'relics.json'),
+    ('drops.warframestat.us', r'^/data/missionRewards\.json$', 'mission_rewards.json'),
+]
+
+CONTENT_TYPES = {'.json': 'application/json', '.html': 'text/html; charset=utf-8', '.png': 'image/png',
+                 '.xml': 'application/xml'}
+
+class ReplayServer:
+    def __init__(self, fixtures_dir=FIXTURES_DIR, host='127.0.0.1', port=0,
+                 latency=0.0, jitter=0.0, error_rate=0.0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency         # seconds added to every response
+        self.jitter = jitter           # +/- uniform seconds on top of latency
+        self.error_rate = error_rate   # probability of answering 503
+        self.host_latency = {}         # host -> seconds (overrides latency)
+        self.host_error_rate = {}      # host -> probability (overrides error_rate)
+        self.hang_hosts = set()        # hosts that never answer (until shutdown)
+        self.requests = []             # (host, path, status) log
+        self.push_enabled = True
+        self.push_heartbeat = 15.0     # seconds between ": heartbeat" comments
+        self._push_clients = []        # one queue per connected /events subscriber
+        self._files = {}
+        self._lock = threading.Lock()
+        self._shutdown = threading.Event()
+
+        tradeable = self._load('market_tradeable.json')
+        self.tradeable = set(json.loads(tradeable)['tradeable']) if tradeable else None
+
+        handler = type('ReplayHandler', (_ReplayHandler,), {'replay': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="ReplayServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._shutdown.set()
+        self.drop_push()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def push_clients(self):
+        return len(self._push_clients)
+
+    def publish(self, event, data):
+        """Send an event ('snapshot' with a full state, 'update' with changed sections) to every subscriber."""
+        payload = json.dumps(data)
+        with self._lock:
+            for q in self._push_clients:
+                q.put((event, payload))
+
+    def drop_push(self):
+        """Close every push connection (clients should fall back to polling, then reconnect)."""
+        with self._lock:
+            for q in self._push_clients:
+                q.put(None)
+
+    def _load(self, name):
+        with self._lock:
+            if name not in self._files:
+                path = os.path.join(self.fixtures_dir, name)
+                self._files[name] = open(path, 'rb').read() if os.path.exists(path) else None
+            return self._files[name]
+
+    def resolve(self, host, path):
+        """Return (status, body, content_type) for a request."""
+        for route_host, pattern, fixture in ROUTES:
+            if route_host == host and re.search(pattern, path):
+                # Market name probes: only known url_names exist, like the real API
+                if host == 'api.warframe.market' and self.tradeable is not None and path.count('/') > 2:
+                    key = path.split('/')[3]
+                    if key not in self.tradeable:
+                        return 404, b'{"error": "not found"}', 'application/json'
+                body = self._load(fixture)
+                if body is None:
+                    return 404, b'', 'text/plain'
+                return 200, body, CONTENT_TYPES.get(os.path.splitext(fixture)[1], 'application/octet-stream')
+        return 404, b'', 'text/plain'
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    replay = None
+    protocol_version = 'HTTP/1.1' # keep-alive, like the real upstreams
+
+    def do_GET(self):
+        replay = self.replay
+        _, host, rest = self.path.split('/', 2) if self.path.count('/') >= 2 else ('', '', '')
+        path = '/' + rest.split('?', 1)[0]
+
+        if host in replay.hang_hosts:
+            replay._shutdown.wait()
+            return
+
+        delay = replay.host_latency.get(host, replay.latency)
+        if replay.jitter:
+            delay = max(0.0, delay + random.uniform(-replay.jitter, replay.jitter))
+        if delay:
+            time.sleep(delay)
+
+        if random.random() < replay.host_error_rate.get(host, replay.error_rate):
+            status, body, ctype = 503, b'{"error": "injected"}', 'application/json'
+        elif path.endswith('/events'):
+            if replay.push_enabled:
+                replay.requests.append((host, path, 200))
+                return self.serve_push()
+            status, body, ctype = 404, b'', 'text/plain'
+        else:
+            status, body, ctype = replay.resolve(host, path)
+
+        etag = None
+        if status == 200:
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self.headers.get('If-None-Match') == etag:
+                status, body = 304, b''
+
+        replay.requests.append((host, path, status))
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_push(self):
+        replay = self.replay
+        q = queue.Queue()
+        with replay._lock:
+            replay._push_clients.append(q)
+
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        try:
+            self.send_event('snapshot', replay._load('world_state.json').decode('utf-8'))
+            while not replay._shutdown.is_set():
+                try:
+                    item = q.get(timeout=replay.push_heartbeat)
+                except queue.Empty:
+                    self.wfile.write(b": heartbeat\n\n")
+                    self.wfile.flush()
+                    continue
+                if item is None:
+                    break
+                self.send_event(*item)
+        except OSError:
+            pass # Subscriber went away
+        finally:
+            with replay._lock:
+                replay._push_clients.remove(q)
+
+    def send_event(self, event, payload):
+        data = ''.join(f"data: {line}\n" for line in payload.splitlines())
+        self.wfile.write(f"event: {event}\n{data}\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded upstream fixtures")
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', type=float, default=0, help="Added latency in ms")
+    parser.add_argument('--jitter', type=float, default=0, help="Latency jitter in ms")
+    parser.add_argument('--error-rate', type=float, default=0, help="Probability of a 503 (0-1)")
+    args = parser.parse_args()
+
+    server = ReplayServer(port=args.port, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                          error_rate=args.error_rate)
+    print(f"Replaying {server.fixtures_dir} on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
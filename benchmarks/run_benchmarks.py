@@ -0,0 +1,341 @@
+"""Benchmark the network and parsing paths against the local replay server.
+
+    python benchmarks/run_benchmarks.py                  # run + compare against baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline  # run + store results as the new baseline
+    python benchmarks/run_benchmarks.py --latency 80 --only search_cold
+
+Every metric is "lower is better". A metric more than --threshold percent above the
+baseline (twice that for p90s) and worse by more than ABSOLUTE_FLOOR is reported as a
+regression and makes the script exit with status 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import fileio
+import http_client
+from replay_server import ReplayServer
+from api_clients import OverframeClient
+from engine import DataEngine, parse_world_state
+import relic_values
+import node_rewards
+import enrich_catalogue
+import parse_pool
+from snapshot_store import SnapshotStore
+
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+QUERY = "Volt Prime"
+
+def _timed(fn, repeat):
+    """Run fn `repeat` times; return sorted durations in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+def _summary(samples):
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'p90_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 3),
+    }
+
+def _clear_caches(engine):
+    http_client.CACHE.clear()
+    http_client.reset_breakers()
+    engine.results.clear()
+
+def _search_once(engine):
+    """What SearchWorker.run does, minus the Qt signal."""
+    return engine.search(QUERY)
+
+def bench_search_cold(ctx):
+    engine = ctx['engine']
+    def run():
+        _clear_caches(engine)
+        _search_once(engine)
+    return _summary(_timed(run, ctx['repeat']))
+
+def bench_search_warm(ctx):
+    engine = ctx['engine']
+    _search_once(engine)
+    return _summary(_timed(lambda: _search_once(engine), ctx['repeat'] * 5))
+
+def bench_search_errors(ctx):
+    """Cold search while ~30% of upstream responses are 503s."""
+    server, engine = ctx['server'], ctx['engine']
+    server.error_rate = 0.3
+    try:
+        def run():
+            _clear_caches(engine)
+            _search_once(engine)
+        return _summary(_timed(run, ctx['repeat']))
+    finally:
+        server.error_rate = 0.0
+
+def bench_search_deadline(ctx):
+    """Cold search with the wiki hanging: bounded by the search deadline, not the upstream."""
+    server, engine = ctx['server'], ctx['engine']
+    server.hang_hosts.add('warframe.fandom.com')
+    try:
+        def run():
+            _clear_caches(engine)
+            engine.search(QUERY, deadline=2)
+        return _summary(_timed(run, max(3, ctx['repeat'] // 5)))
+    finally:
+        server.hang_hosts.discard('warframe.fandom.com')
+
+def bench_search_concurrent(ctx):
+    """Four identical cold searches at once (e.g. repeated Enter presses); they share in-flight requests."""
+    server, engine = ctx['server'], ctx['engine']
+    upstream = []
+    def run():
+        _clear_caches(engine)
+        before = len(server.requests)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: _search_once(engine), range(4)))
+        upstream.append(len(server.requests) - before)
+    result = _summary(_timed(run, ctx['repeat']))
+    result['upstream_requests'] = statistics.median(upstream)
+    return result
+
+def bench_search_worker(ctx):
+    """End-to-end SearchWorker (QThread) latency, if PyQt6 is installed."""
+    try:
+        from PyQt6.QtCore import QCoreApplication
+        from app import SearchWorker
+    except ImportError:
+        return None
+    app = QCoreApplication.instance() or QCoreApplication([])
+    engine = ctx['engine']
+
+    def run():
+        _clear_caches(engine)
+        worker = SearchWorker(engine, QUERY)
+        worker.start()
+        while not worker.wait(5):
+            app.processEvents()
+    return _summary(_timed(run, ctx['repeat']))
+
+def bench_process_world_state(ctx):
+    with open(os.path.join(BENCH_DIR, 'fixtures', 'world_state.json'), 'rb') as f:
+        state = json.load(f)
+    return _summary(_timed(lambda: parse_world_state(state), ctx['repeat'] * 20))
+
+def bench_decode_world_state(ctx):
+    """JSON-decode a world-state payload (orjson if installed, else json)."""
+    with open(os.path.join(BENCH_DIR, 'fixtures', 'world_state.json'), 'rb') as f:
+        payload = f.read()
+    return _summary(_timed(lambda: fileio.loads(payload), ctx['repeat'] * 20))
+
+def bench_top_build_parse(ctx):
+    # Warm the response cache so only HTML parsing is measured
+    OverframeClient.get_top_build(QUERY)
+    result = _summary(_timed(lambda: OverframeClient.get_top_build(QUERY), ctx['repeat']))
+
+    gc.collect()
+    tracemalloc.start()
+    OverframeClient.get_top_build(QUERY)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result['peak_kb'] = round(peak / 1024, 1)
+    return result
+
+def _max_tick_gap(fn):
+    """Run fn on a thread while this one ticks every 1ms (like a Qt timer); return the longest gap in ms."""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(fn)
+        gap, last = 0.0, time.perf_counter()
+        while not future.done():
+            time.sleep(0.001)
+            now = time.perf_counter()
+            gap, last = max(gap, now - last), now
+        future.result()
+    return gap * 1000
+
+def bench_parse_stall(ctx):
+    """Longest UI-thread stall while a search thread parses a build page: in-process vs the warm parse pool."""
+    OverframeClient.get_top_build(QUERY) # Warm the response cache
+    inline = sorted(_max_tick_gap(lambda: OverframeClient.get_top_build(QUERY)) for _ in range(ctx['repeat']))
+    parse_pool.warm_up()
+    deadline = time.time() + 30
+    while not parse_pool.is_ready() and time.time() < deadline:
+        time.sleep(0.05)
+    try:
+        pooled = sorted(_max_tick_gap(lambda: OverframeClient.get_top_build(QUERY)) for _ in range(ctx['repeat']))
+    finally:
+        parse_pool.shutdown()
+    return {'inline_stall_ms': round(statistics.median(inline), 3),
+            'pool_stall_ms': round(statistics.median(pooled), 3)}
+
+def bench_relic_values(ctx):
+    """Value every fixture relic (all refinements and squad sizes) in one pass."""
+    if relic_values.np is None:
+        return None # NumPy not installed
+    with open(os.path.join(BENCH_DIR, 'fixtures', 'relics.json'), 'rb') as f:
+        table = relic_values.RelicTable.from_drops(json.load(f))
+    prices = {name: float(len(name)) for name in table.items}
+    def run():
+        valuator = relic_values.RelicValuator(table)
+        valuator.update(prices.get, prices.get)
+        valuator.best('Axi')
+    return _summary(_timed(run, ctx['repeat'] * 20))
+
+def bench_node_rewards(ctx):
+    """Build the node -> rewards index, then join it with every fixture fissure/invasion node (per world-state update)."""
+    data = fileio.load_json(os.path.join(BENCH_DIR, 'fixtures', 'mission_rewards.json'))
+    view = parse_world_state(fileio.load_json(os.path.join(BENCH_DIR, 'fixtures', 'world_state.json')))
+    nodes = sorted({f.node for f in view['fissures']} | {node for _, node in view['invasions']})
+    result = {'build_' + k: v for k, v in _summary(_timed(lambda: node_rewards.NodeRewards.from_drops(data), ctx['repeat'])).items()}
+    index = node_rewards.NodeRewards.from_drops(data)
+    result.update({'join_' + k: v for k, v in _summary(_timed(lambda: index.lookup(nodes), ctx['repeat'] * 20)).items()})
+    return result
+
+def bench_enrich_crawl(ctx):
+    """Metadata crawl of a 200-item catalogue (8 workers, no rate limit), then a run where nothing changed.
+
+    Measures the crawl plumbing (pool, breaker, checkpoints) against the synthetic item page;
+    it says nothing about whether item_meta's keys match live Overframe markup."""
+    items = {f"item {i}": {'id': str(i), 'slug': f"item-{i}", 'name': f"Item {i}", 'lastmod': '2026-01-01',
+                           'url': f"https://overframe.gg/items/arsenal/{i}/item-{i}/"} for i in range(200)}
+    path = os.path.join(tempfile.mkdtemp(), 'overframe_cache.json')
+    def crawl():
+        fileio.atomic_write_json(path, items)
+        enrich_catalogue.enrich_catalogue(rate=None, path=path)
+    result = {'full_' + k: v for k, v in _summary(_timed(crawl, max(3, ctx['repeat'] // 5))).items()}
+    result.update({'unchanged_' + k: v for k, v in
+                   _summary(_timed(lambda: enrich_catalogue.enrich_catalogue(path=path), ctx['repeat'])).items()})
+    return result
+
+def bench_startup(ctx):
+    """Fresh interpreter: import the engine and warm-start from a snapshot store holding the fixture state."""
+    # A throwaway store, so the user's own history neither skews the number nor gets touched
+    directory = tempfile.mkdtemp()
+    SnapshotStore(directory).append(fileio.load_json(os.path.join(BENCH_DIR, 'fixtures', 'world_state.json')))
+    code = "import sys, engine; engine.SNAPSHOT_DIR = sys.argv[1]; engine.DataEngine().warm_start()"
+    env = dict(os.environ, PYFRAME_UPSTREAM_OVERRIDE=ctx['server'].base_url)
+    def run():
+        subprocess.run([sys.executable, '-c', code, directory], cwd=SRC_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+    return _summary(_timed(run, max(3, ctx['repeat'] // 3)))
+
+BENCHMARKS = {
+    'search_cold': bench_search_cold,
+    'search_warm': bench_search_warm,
+    'search_errors': bench_search_errors,
+    'search_deadline': bench_search_deadline,
+    'search_concurrent': bench_search_concurrent,
+    'search_worker': bench_search_worker,
+    'process_world_state': bench_process_world_state,
+    'decode_world_state': bench_decode_world_state,
+    'top_build_parse': bench_top_build_parse,
+    'parse_stall': bench_parse_stall,
+    'relic_values': bench_relic_values,
+    'node_rewards': bench_node_rewards,
+    'enrich_crawl': bench_enrich_crawl,
+    'startup': bench_startup,
+}
+
+# A metric only regresses if it is also this much worse in absolute terms (by unit suffix):
+# sub-millisecond timings routinely swing by more than the percentage threshold
+ABSOLUTE_FLOOR = {'_ms': 2.0, '_kb': 256}
+# Tail percentiles of ~15 samples are noisy; they gate at this multiple of the threshold
+TAIL_THRESHOLD_FACTOR = 2
+
+def is_regression(metric, value, base, threshold):
+    if metric.endswith('p90_ms'):
+        threshold *= TAIL_THRESHOLD_FACTOR
+    floor = next((f for suffix, f in ABSOLUTE_FLOOR.items() if metric.endswith(suffix)), 0)
+    return (value - base) / base * 100 > threshold and value - base > floor
+
+def compare(results, baseline, threshold):
+    """Print a table against the baseline; return the list of regressed metrics."""
+    regressions = []
+    print(f"\n{'metric':<36}{'current':>12}{'baseline':>12}{'delta':>10}")
+    for name, metrics in results.items():
+        if metrics is None:
+            print(f"{name:<36}{'skipped':>12}")
+            continue
+        for metric, value in metrics.items():
+            key = f"{name}.{metric}"
+            base = baseline.get('results', {}).get(name, {}) or {}
+            base = base.get(metric)
+            if base:
+                delta = (value - base) / base * 100
+                flag = "  REGRESSION" if is_regression(metric, value, base, threshold) else ""
+                if flag:
+                    regressions.append(key)
+                print(f"{key:<36}{value:>12}{base:>12}{delta:>+9.1f}%{flag}")
+            else:
+                print(f"{key:<36}{value:>12}{'-':>12}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="PyFrame benchmark suite")
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--latency', type=float, default=30, help="Injected upstream latency in ms")
+    parser.add_argument('--jitter', type=float, default=5, help="Latency jitter in ms")
+    parser.add_argument('--threshold', type=float, default=20, help="Regression threshold in percent")
+    parser.add_argument('--only', nargs='*', choices=list(BENCHMARKS), help="Run a subset")
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--output', help="Also write results JSON here")
+    args = parser.parse_args()
+
+    server = ReplayServer(latency=args.latency / 1000, jitter=args.jitter / 1000).start()
+    http_client.set_upstream_override(server.base_url)
+    ctx = {'server': server, 'engine': DataEngine(), 'repeat': args.repeat}
+
+    results = {}
+    try:
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = BENCHMARKS[name](ctx)
+    finally:
+        server.stop()
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'latency_ms': args.latency,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(report, f, indent=2)
+        compare(results, {}, args.threshold)
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    else:
+        print("No baseline yet; run with --save-baseline to create one.")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,6 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 # Run the main script
 if __name__ == "__main__":
-    from src.main import OverlayController
+    from src.app import OverlayController
     controller = OverlayController()
     controller.run()
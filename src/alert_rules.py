@@ -0,0 +1,123 @@
+"""User-configurable reward alerts over the world state.
+
+All watch terms from all rules compile into one case-insensitive alternation regex,
+so a poll costs one scan per *new* entry no matter how many terms are configured.
+Entries already seen in a previous snapshot are never re-evaluated, so each match
+is reported once.
+
+Rules live in config.json under "alert_rules":
+    [{"name": "Potatoes", "terms": ["catalyst", "reactor"], "sections": ["invasions", "alerts"]}]
+"sections" is optional (default: all of SECTIONS); "enabled": false disables a rule.
+"""
+import re
+
+SECTIONS = ('invasions', 'alerts', 'fissures', 'baro', 'nightwave')
+
+# Same rewards the Activities tab has always highlighted
+DEFAULT_REWARD_TERMS = ['catalyst', 'reactor', 'forma', 'vandal', 'wraith', 'mutagen mass', 'fieldron', 'detonite', 'exilus', 'adapter']
+
+DEFAULT_RULES = [
+    {"name": "Valuable rewards", "terms": DEFAULT_REWARD_TERMS, "sections": ["invasions", "alerts"]},
+]
+
+def compile_terms(terms):
+    """One regex matching any term (longest first so 'mutagen mass' beats 'mutagen')."""
+    unique = sorted({t.lower().strip() for t in terms if t and t.strip()}, key=len, reverse=True)
+    if not unique:
+        return None
+    return re.compile('|'.join(re.escape(t) for t in unique), re.IGNORECASE)
+
+def reward_string(reward):
+    """World-state reward -> "3x Fieldron + Orokin Catalyst Blueprint"."""
+    if reward.get('asString'):
+        return reward['asString']
+    parts = [f"{c['count']}x {c['type']}" if c.get('count', 1) > 1 else c.get('type', '')
+             for c in reward.get('countedItems', [])]
+    return " + ".join(p for p in parts + list(reward.get('items', [])) if p)
+
+def invasion_reward(inv, side):
+    """Reward text for one side of an invasion ('attacker' / 'defender')."""
+    # Older payloads: {side}Reward.asString; current ones: {side}.reward.countedItems
+    return reward_string(inv.get(f'{side}Reward') or (inv.get(side) or {}).get('reward') or {})
+
+def iter_entries(state):
+    """Yield (section, entry_id, text) for every alertable world-state entry."""
+    for inv in state.get('invasions', []) or []:
+        if inv.get('completed', False): continue
+        for side in ('attacker', 'defender'):
+            reward = invasion_reward(inv, side)
+            if reward:
+                yield 'invasions', f"{inv.get('id')}:{side}", f"{reward} ({inv.get('node', 'Unknown')})"
+
+    for alert in state.get('alerts', []) or []:
+        mission = alert.get('mission') or {}
+        reward = reward_string(mission.get('reward') or {})
+        yield 'alerts', alert.get('id'), f"{reward} - {mission.get('type', '')} ({mission.get('node', 'Unknown')})"
+
+    for f in state.get('fissures', []) or []:
+        tags = ' '.join(t for t, on in (('Steel Path', f.get('isHard')), ('Void Storm', f.get('isStorm'))) if on)
+        yield 'fissures', f.get('id'), f"{f.get('tier')} {f.get('missionType')} - {f.get('node')} ({f.get('enemy')}) {tags}".strip()
+
+    trader = state.get('voidTrader') or {}
+    if trader.get('active'):
+        visit = trader.get('activation', '')
+        for item in trader.get('inventory', []) or []:
+            name = item.get('item', '')
+            yield 'baro', f"{visit}:{name}", name
+
+    for c in (state.get('nightwave') or {}).get('activeChallenges', []) or []:
+        yield 'nightwave', c.get('id'), f"{c.get('title', '')} - {c.get('desc', '')}"
+
+class AlertEngine:
+    def __init__(self, rules=None):
+        self.seen = set() # (section, entry_id) from previous snapshots
+        self.set_rules(DEFAULT_RULES if rules is None else rules)
+
+    def set_rules(self, rules):
+        """(Re)compile rules into a single matcher."""
+        self.rules = [r for r in rules if r.get('enabled', True) and r.get('terms')]
+        self.term_rules = {} # lowercased term -> [rule index]
+        for idx, rule in enumerate(self.rules):
+            for term in rule['terms']:
+                self.term_rules.setdefault(term.lower().strip(), []).append(idx)
+        self.pattern = compile_terms(self.term_rules)
+        # A match of "forma blueprint" must also count for a rule watching just "forma"
+        self.contained = {t: [u for u in self.term_rules if u in t] for t in self.term_rules}
+
+    def _new_entries(self, state):
+        current = set()
+        fresh = []
+        for section, entry_id, text in iter_entries(state):
+            key = (section, entry_id)
+            current.add(key)
+            if entry_id is not None and key not in self.seen:
+                fresh.append((section, entry_id, text))
+        # Only remember what is still live; expired ids can't come back
+        self.seen = current
+        return fresh
+
+    def prime(self, state):
+        """Mark everything in state as already seen (e.g. warm start) without alerting."""
+        if state:
+            self._new_entries(state)
+
+    def evaluate(self, state):
+        """Return [{'rule', 'section', 'text', 'terms'}] for entries new since the last call."""
+        if not state:
+            return []
+        fresh = self._new_entries(state)
+        if not self.pattern:
+            return []
+
+        alerts = []
+        for section, entry_id, text in fresh:
+            hits = {}
+            for m in self.pattern.finditer(text):
+                for term in self.contained.get(m.group(0).lower(), ()):
+                    for idx in self.term_rules[term]:
+                        hits.setdefault(idx, []).append(term)
+            for idx, terms in hits.items():
+                rule = self.rules[idx]
+                if section in rule.get('sections', SECTIONS):
+                    alerts.append({'rule': rule['name'], 'section': section, 'text': text, 'terms': sorted(set(terms))})
+        return alerts
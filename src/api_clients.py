@@ -1,28 +1,54 @@
-import requests
-from bs4 import BeautifulSoup
+import http_client
+from metrics import REGISTRY
+import html_parse
+import parse_pool
+from alert_rules import compile_terms, invasion_reward, DEFAULT_REWARD_TERMS
+from item_registry import ItemRegistry
 import json
 import os
-import re
 import urllib3
 
 # Suppress SSL warnings since we use verify=False for stability
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Response cache lifetimes (seconds)
+TTL_MARKET_ORDERS = 5 * 60
+TTL_MARKET_ITEM = 24 * 60 * 60
+TTL_WIKI = 24 * 60 * 60
+TTL_DROPS = 24 * 60 * 60
+TTL_OVERFRAME = 6 * 60 * 60
+TTL_ICON = 7 * 24 * 60 * 60
+
 # Load Overframe Cache
 CACHE_FILE = os.path.join(os.path.dirname(__file__), 'data', 'overframe_cache.json')
 OVERFRAME_CACHE = {}
-if os.path.exists(CACHE_FILE):
+
+def reload_overframe_cache():
+    """(Re)load the Overframe catalogue in place so existing references stay valid."""
+    if not os.path.exists(CACHE_FILE):
+        return
     try:
         with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            OVERFRAME_CACHE = json.load(f)
+            data = json.load(f)
+        OVERFRAME_CACHE.clear()
+        OVERFRAME_CACHE.update(data)
     except:
         print("Failed to load Overframe cache.")
 
+reload_overframe_cache()
+
+# Canonical identities (market url_name, wiki title, uniqueName, Overframe page) per item
+ITEMS = ItemRegistry()
+
 class OverframeClient:
     HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
 
     @staticmethod
     def get_item_url(item_name):
+        entry = ITEMS.resolve(item_name)
+        if entry and entry.get('overframe'):
+            return entry['overframe']['url']
+
         key = item_name.lower().strip()
         # Direct match
         if key in OVERFRAME_CACHE:
@@ -42,16 +68,10 @@ class OverframeClient:
 
         try:
             # 1. Fetch Item Page
-            resp = requests.get(item_url, headers=OverframeClient.HEADERS)
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            
-            # 2. Find Top Build Link
-            # Look for links starting with /build/
-            # They are usually sorted by rating by default.
-            build_links = []
-            for a in soup.find_all('a', href=True):
-                if a['href'].startswith('/build/') and '/new/' not in a['href']:
-                    build_links.append(a['href'])
+            resp = http_client.get(item_url, headers=OverframeClient.HEADERS, ttl=TTL_OVERFRAME)
+            with REGISTRY.timed('parse.overframe_item', bytes=len(resp.content)):
+                # 2. Find Top Build Link (sorted by rating by default); parsed off-process
+                build_links = parse_pool.run(html_parse.build_links, resp.content)
             
             if not build_links:
                 return None, "No builds found."
@@ -61,132 +81,65 @@ class OverframeClient:
             top_build_url = f"https://overframe.gg{top_build_path}"
             
             # 3. Fetch Build Page
-            resp = requests.get(top_build_url, headers=OverframeClient.HEADERS)
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            
-            # 4. Extract Mods & Stats
-            mods = []
-            arcanes = []
-            stats = []
-
-            # 4a. Mods (Pattern: div class*=Mod_container__ -> p class*=Mod_name__)
-            # Capturing metadata for improved display
-            mod_containers = soup.find_all('div', class_=re.compile(r'Mod_container__'))
-            for mc in mod_containers:
-                mod_data = {'name': 'Unknown', 'cost': '', 'polarity': '', 'rarity': 'common'}
-                
-                # Name
-                name_tag = mc.find(class_=re.compile(r'Mod_name__'))
-                if name_tag:
-                    mod_data['name'] = name_tag.get_text(strip=True)
-                
-                # Image
-                img_tag = mc.find('img')
-                if img_tag:
-                    mod_data['image_url'] = img_tag.get('src')
-                
-                # Drain
-                drain_tag = mc.find(class_=re.compile(r'Mod_drain__'))
-                if drain_tag:
-                    mod_data['cost'] = drain_tag.get_text(strip=True)
-                
-                # Polarity (icon class usually)
-                # Look for <i class="wfic ...">
-                polarity_icon = mc.find('i', class_=re.compile(r'Mod_polarity__'))
-                if polarity_icon:
-                    classes = polarity_icon.get('class', [])
-                    for c in classes:
-                        if c.startswith('wfic-AP_'):
-                            mod_data['polarity'] = c.replace('wfic-AP_', '').title()
-                
-                # Rarity (from container class)
-                # Mod_rare__McUwv, Mod_common__..., Mod_uncommon__..., Mod_legendary__...
-                container_classes = mc.find('div', class_=re.compile(r'Mod_mod__'))
-                if container_classes:
-                    c_classes = container_classes.get('class', [])
-                    for c in c_classes:
-                        if 'rare' in c: mod_data['rarity'] = 'gold'
-                        elif 'common' in c: mod_data['rarity'] = 'brown' # Bronzeish
-                        elif 'uncommon' in c: mod_data['rarity'] = 'silver'
-                        elif 'legendary' in c: mod_data['rarity'] = 'white' # Primed
-                        elif 'requiem' in c: mod_data['rarity'] = 'red'
-
-                if mod_data['name'] != 'Unknown':
-                    mods.append(mod_data)
-            
-            # 4b. Arcanes
-            arcane_containers = soup.find_all('div', class_=re.compile(r'ArcaneMod_arcaneMod__'))
-            for ac in arcane_containers:
-                name_tag = ac.find(class_=re.compile(r'ArcaneMod_name__'))
-                if name_tag:
-                    # Try to detect rarity too
-                    rarity = 'silver'
-                    classes = ac.get('class', [])
-                    for c in classes:
-                         if 'rare' in c: rarity = 'gold'
-                         elif 'legendary' in c: rarity = 'white'
-                    
-                    arcanes.append({'name': name_tag.get_text(strip=True), 'rarity': rarity})
-
-            # 4c. Stats
-            stat_containers = soup.find_all('div', class_=re.compile(r'TitleStat_titleStat__'))
-            for sc in stat_containers:
-                label = sc.find('dt')
-                value = sc.find('dd')
-                if label and value:
-                    stats.append((label.get_text(strip=True), value.get_text(strip=True)))
-
-            # Deduplicate preserving order
-            seen = set()
-            unique_mods = []
-            for m in mods:
-                if m['name'] not in seen:
-                    unique_mods.append(m)
-                    seen.add(m['name'])
-            
-            # Use improved mod list
-            filtered_mods = unique_mods[:10] # Standard build size
+            resp = http_client.get(top_build_url, headers=OverframeClient.HEADERS, ttl=TTL_OVERFRAME)
+
+            # 4. Extract Mods, Arcanes & Stats
+            with REGISTRY.timed('parse.overframe_build', bytes=len(resp.content)):
+                build = parse_pool.run(html_parse.parse_build, resp.content)
 
-            return top_build_url, {
-                'mods': filtered_mods,
-                'arcanes': arcanes,
-                'stats': stats
-            }
+            return top_build_url, build
 
         except Exception as e:
             return None, str(e)
 
 class WarframeAPI:
-    WORLD_STATE_URL = "https://api.warframestat.us/pc"
+    WORLD_STATE_BASE_URL = "https://api.warframestat.us"
+    WORLD_STATE_URL = f"{WORLD_STATE_BASE_URL}/pc"
     MARKET_BASE_URL = "https://api.warframe.market/v1"
+    PLATFORMS = ('pc', 'ps4', 'xb1', 'swi')
+    LANGUAGES = ('de', 'en', 'es', 'fr', 'it', 'ko', 'pl', 'pt', 'ru', 'tr', 'uk', 'zh')
 
     @staticmethod
-    def get_world_state():
+    def get_world_state(platform='pc', language='en'):
+        return WarframeAPI.fetch_world_state(platform, language)[0]
+
+    @staticmethod
+    def fetch_world_state(platform='pc', language='en', etag=None):
+        """Conditional world-state fetch. Returns (state, etag, changed); state is None on failure or 304."""
         try:
-            # We use the 'en' locale for consistent naming
             # Disable verify to fix common SSL cert issues on some windows machines with this specific API
             # Add Cache-Control to prevent stale data
             # Add timestamp to force fresh fetch
             import time
             headers = {'Cache-Control': 'no-cache', 'Pragma': 'no-cache'}
-            response = requests.get(f"{WarframeAPI.WORLD_STATE_URL}/?language=en&_={int(time.time())}", verify=False, headers=headers)
-            return response.json() if response.status_code == 200 else None
+            if etag:
+                headers['If-None-Match'] = etag
+            url = f"{WarframeAPI.WORLD_STATE_BASE_URL}/{platform}/?language={language}&_={int(time.time())}"
+            response = http_client.get(url, verify=False, headers=headers, retries=1)
+            if response.status_code == 304:
+                return None, etag, False
+            if response.status_code != 200:
+                return None, None, False
+            return response.json(), response.headers.get('ETag'), True
         except Exception as e:
-            print(f"Error fetching world state: {e}")
-            return None
+            print(f"Error fetching world state ({platform}/{language}): {e}")
+            return None, None, False
+
+    # Filter mostly for "good" rewards: Potatoes, Forma, Wraith/Vandal parts (one combined regex)
+    INTERESTING_REWARDS = compile_terms(DEFAULT_REWARD_TERMS)
 
     @staticmethod
     def process_invasions(invasions):
-        # Filter mostly for "good" rewards: Potatoes, Forma, Wraith/Vandal parts
+        """[(reward, node)] for running invasions with an interesting reward on either side."""
         interesting = []
         for inv in invasions:
             if inv.get('completed', False): continue
             
             rewards = []
             for side in ['attacker', 'defender']:
-                reward = inv.get(f'{side}Reward', {}).get('asString', '')
-                if any(x in reward.lower() for x in ['catalyst', 'reactor', 'forma', 'vandal', 'wraith', 'mutagen mass', 'fieldron', 'detonite', 'exilus', 'adapter']):
-                    rewards.append(f"{reward} ({inv.get('node', 'Unknown')})")
+                reward = invasion_reward(inv, side)
+                if WarframeAPI.INTERESTING_REWARDS.search(reward):
+                    rewards.append((reward, inv.get('node', 'Unknown')))
             
             if rewards:
                 interesting.extend(rewards)
@@ -212,10 +165,16 @@ class WarframeAPI:
         # Try WarframeStat Items API for drop data
         try:
             url = f"https://api.warframestat.us/items/search/{item_name.lower()}"
-            resp = requests.get(url)
+            resp = http_client.get(url, ttl=TTL_DROPS)
             if resp.status_code == 200:
                 results = resp.json()
-                item = next((i for i in results if i.get('name', '').lower() == item_name.lower()), None)
+                entry = ITEMS.resolve(item_name)
+                unique_name = entry.get('unique_name') if entry else None
+                item = None
+                if unique_name:
+                    item = next((i for i in results if i.get('uniqueName') == unique_name), None)
+                if not item:
+                    item = next((i for i in results if i.get('name', '').lower() == item_name.lower()), None)
                 if not item and results: item = results[0]
                 
                 if item:
@@ -240,106 +199,140 @@ class WarframeAPI:
             return f"Drop API error: {e}"
 
     @staticmethod
-    def get_market_item_price(item_name):
+    def order_stats(orders):
+        """Summarise warframe.market orders: in-game sell prices plus best in-game buy."""
+        sells = sorted(o['platinum'] for o in orders if o['user']['status'] == 'ingame' and o['order_type'] == 'sell')
+        buys = [o['platinum'] for o in orders if o['user']['status'] == 'ingame' and o['order_type'] == 'buy']
+        if not sells:
+            return {'sellers': 0, 'min': None, 'median': None, 'mean': None, 'max': None, 'buy_max': max(buys) if buys else None}
+        mid = len(sells) // 2
+        median = sells[mid] if len(sells) % 2 else (sells[mid - 1] + sells[mid]) / 2
+        return {
+            'sellers': len(sells),
+            'min': sells[0],
+            'median': median,
+            'mean': round(sum(sells) / len(sells), 1),
+            'max': sells[-1],
+            'buy_max': max(buys) if buys else None,
+        }
+
+    @staticmethod
+    def lookup_market_price(item_name, with_icon=True):
+        """Resolve item_name on warframe.market and return structured price info.
+
+        Returns {'price': int|None, 'stats': dict, 'full_name': str, 'icon_url': str|None,
+        'url_key': str|None, 'prime_set': bool}.
+        'url_key' is None when the item isn't tradeable / wasn't found.
+        """
         # Warframe Market requires headers sometimes to avoid 403
         headers = {'User-Agent': 'Mozilla/5.0'}
         
         # Clean name
         clean_name = item_name.lower().strip().replace(" ", "_").replace("'", "")
         
-        def fetch_price(url_key, display_name):
+        def fetch_icon(url_key):
             try:
-                # 1. Fetch Icon (Optional)
-                icon_url = None
-                try:
-                    info_url = f"{WarframeAPI.MARKET_BASE_URL}/items/{url_key}"
-                    info_resp = requests.get(info_url, headers=headers)
-                    if info_resp.status_code == 200:
-                        payload = info_resp.json().get('payload', {}).get('item', {})
-                        items_in_set = payload.get('items_in_set', [])
-                        # Find the item that matches the url_key or just the first one
-                        target_item = next((i for i in items_in_set if i.get('url_name') == url_key), None)
-                        if not target_item and items_in_set: target_item = items_in_set[0]
-                        
-                        if target_item:
-                            icon_url = f"https://warframe.market/static/assets/{target_item.get('thumb')}"
-                except:
-                    pass # Ignore icon errors
+                info_url = f"{WarframeAPI.MARKET_BASE_URL}/items/{url_key}"
+                info_resp = http_client.get(info_url, headers=headers, ttl=TTL_MARKET_ITEM)
+                if info_resp.status_code == 200:
+                    payload = info_resp.json().get('payload', {}).get('item', {})
+                    items_in_set = payload.get('items_in_set', [])
+                    # Find the item that matches the url_key or just the first one
+                    target_item = next((i for i in items_in_set if i.get('url_name') == url_key), None)
+                    if not target_item and items_in_set: target_item = items_in_set[0]
+                    
+                    if target_item:
+                        return f"https://warframe.market/static/assets/{target_item.get('thumb')}"
+            except:
+                pass # Ignore icon errors
+            return None
 
-                # 2. Get orders
+        def fetch_price(url_key, thumb=None):
+            try:
+                # 1. Get orders (probes that 404 stop here, without the icon request)
                 url = f"{WarframeAPI.MARKET_BASE_URL}/items/{url_key}/orders"
-                response = requests.get(url, headers=headers)
+                response = http_client.get(url, headers=headers, ttl=TTL_MARKET_ORDERS)
                 
-                if response.status_code == 404:
+                if response.status_code != 200:
                     return None
-                    
-                if response.status_code == 200:
-                    orders = response.json().get('payload', {}).get('orders', [])
-                    online_orders = [o for o in orders if o['user']['status'] == 'ingame' and o['order_type'] == 'sell']
-                    
-                    price_str = ""
-                    if online_orders:
-                        price = min(o['platinum'] for o in online_orders)
-                        price_str = f"<b>Market Price:</b> <span style='color:#00ff88; font-size:14px;'>{price}p</span> (Lowest Online)"
-                    else:
-                        price_str = "<b>Market Price:</b> No players in-game."
-                    
-                    return price_str, icon_url
-                return None
+
+                stats = WarframeAPI.order_stats(response.json().get('payload', {}).get('orders', []))
+
+                # 2. Fetch Icon (Optional)
+                if thumb:
+                    icon_url = f"https://warframe.market/static/assets/{thumb}"
+                else:
+                    icon_url = fetch_icon(url_key) if with_icon else None
+                return stats, icon_url
             except:
                 return None
 
-        # 1. Try exact name (e.g. "volt_prime_set")
-        # Most items are "set" on market if they have parts. Warframes are definitely "sets".
-        # But for non-prime, "volt" isn't tradeable.
-        
-        res = fetch_price(clean_name, item_name)
-        if res: return res[0], item_name, res[1]
-        
-        # 2. Try adding "_set"
-        res = fetch_price(f"{clean_name}_set", item_name)
-        if res: return res[0], item_name, res[1]
-
-        # 3. If original was not prime, try finding Prime variant
-        if "prime" not in clean_name:
-            prime_name_url = f"{clean_name}_prime_set"
-            res = fetch_price(prime_name_url, item_name + " Prime")
+        entry = ITEMS.resolve(item_name)
+        if entry:
+            # Known item: its market key (or its Prime's) is known, so at most one request
+            candidates = []
+            prime = ITEMS.variant(entry, 'Prime')
+            if entry.get('market'):
+                candidates.append((entry['market'], entry['name'], False, entry.get('thumb')))
+            elif prime and prime.get('market'):
+                candidates.append((prime['market'], prime['name'], True, prime.get('thumb')))
+        else:
+            # 1. Try exact name (e.g. "volt_prime_set")
+            # Most items are "set" on market if they have parts. Warframes are definitely "sets".
+            # But for non-prime, "volt" isn't tradeable.
+            candidates = [(clean_name, item_name, False, None), (f"{clean_name}_set", item_name, False, None)]
+
+            # 3. If original was not prime, try finding Prime variant
+            if "prime" not in clean_name:
+                candidates.append((f"{clean_name}_prime_set", item_name + " Prime", True, None))
+
+        for url_key, full_name, prime_set, thumb in candidates:
+            res = fetch_price(url_key, thumb)
             if res:
-                return f"{res[0]} (Prime Set)", item_name + " Prime", res[1]
+                stats, icon_url = res
+                return {'price': stats['min'], 'stats': stats, 'full_name': full_name, 'icon_url': icon_url, 'url_key': url_key, 'prime_set': prime_set}
+
+        return {'price': None, 'stats': None, 'full_name': item_name, 'icon_url': None, 'url_key': None, 'prime_set': False}
+
+    @staticmethod
+    def format_market_price(info):
+        if not info['url_key']:
+            return "<b>Market Price:</b> Item not tradeable or not found."
+        if info['price'] is None:
+            price_str = "<b>Market Price:</b> No players in-game."
+        else:
+            price_str = f"<b>Market Price:</b> <span style='color:#00ff88; font-size:14px;'>{info['price']}p</span> (Lowest Online)"
+        return f"{price_str} (Prime Set)" if info['prime_set'] else price_str
 
-        return "<b>Market Price:</b> Item not tradeable or not found.", item_name, None
+    @staticmethod
+    def get_market_item_price(item_name):
+        info = WarframeAPI.lookup_market_price(item_name)
+        return WarframeAPI.format_market_price(info), info['full_name'], info['icon_url']
 
     @staticmethod
     def get_wiki_info(item_name):
         # Use Parse API to get HTML of the first section
         # https://warframe.fandom.com/api.php?action=parse&page=Volt&prop=text&format=json&section=0
         try:
-            # First clean up the name for Wiki URL (Spaces -> Underscores)
-            wiki_title = item_name.replace(" ", "_").title()
+            # First clean up the name for Wiki URL (Spaces -> Underscores), unless the registry knows the page
+            entry = ITEMS.resolve(item_name)
+            wiki_title = entry['wiki'] if entry and entry.get('wiki') else item_name.replace(" ", "_").title()
             
             url = f"https://warframe.fandom.com/api.php?action=parse&page={wiki_title}&prop=text&format=json&section=0&redirects=1"
             headers = {'User-Agent': 'PyFrameOverlay/1.0'}
-            resp = requests.get(url, headers=headers)
-            
-            data = resp.json()
-            if 'error' in data:
-                return f"Wiki: {data['error'].get('info', 'Page not found')}"
+            resp = http_client.get(url, headers=headers, ttl=TTL_WIKI)
             
-            html_content = data.get('parse', {}).get('text', {}).get('*', '')
-            
-            # Use BeautifulSoup to extract just the first paragraph
-            if html_content:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                # Find the first paragraph that isn't a likely warning/box
-                # Usually the first <p> after some infoboxes
-                for p in soup.find_all('p'):
-                    # Use separator to avoid "Volthas" (merging valid tags without space)
-                    text = p.get_text(separator=' ', strip=True)
-                    
-                    # Filter out short/empty paragraphs or Update notes
-                    if len(text) > 50 and "Update" not in text: 
-                         # Return full paragraph up to 800 chars 
-                         return f"<h3>Wiki: {item_name}</h3>{text[:800]}{'...' if len(text) > 800 else ''}"
+            # Decode + extract the first paragraph off-process; only the text comes back
+            with REGISTRY.timed('parse.wiki', bytes=len(resp.content)):
+                summary = parse_pool.run(html_parse.wiki_summary, resp.content)
+            if 'error' in summary:
+                return f"Wiki: {summary['error']}"
+
+            if summary['found']:
+                text = summary['text']
+                if text:
+                    # Return full paragraph up to 800 chars 
+                    return f"<h3>Wiki: {item_name}</h3>{text[:800]}{'...' if len(text) > 800 else ''}"
                 
                 # Fallback
                 return f"Wiki: Found page, click for details."
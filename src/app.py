@@ -0,0 +1,623 @@
+"""The overlay controller (Qt, hotkeys, engine wiring). Started by main.py."""
+import os
+import sys
+import threading
+import time
+from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QStyle
+from PyQt6.QtCore import QTimer, QObject, pyqtSignal, QThread
+from overlay import WarframeOverlay, PriceToast
+from api_clients import WarframeReference, reload_overframe_cache, ITEMS
+from update_cache import update_all
+from engine import DataEngine, parse_world_state, format_quick_price, render_invasions, node_html
+from engine_client import RemoteEngine
+from config import ConfigManager
+from metrics import REGISTRY
+from alert_rules import AlertEngine, DEFAULT_RULES
+from fissure_index import FissureIndex, BUILTIN_PRESETS
+from prefetch import NotesPrefetcher, parse_noted_items
+import parse_pool
+from pynput import keyboard
+
+DIAGNOSTICS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'diagnostics')
+# Hidden longer than this -> discard the web page's renderer memory (reloads on show)
+HIDDEN_DISCARD_DELAY_MS = 60 * 1000
+
+class SearchWorker(QThread):
+    finished = pyqtSignal(str, str) # summary_html, bis_url
+
+    def __init__(self, engine, query):
+        super().__init__()
+        self.engine = engine
+        self.query = query
+
+    def run(self):
+        # Answer from the result cache / offline bundle immediately; the live search then
+        # refreshes only the expired sections
+        try:
+            offline = self.engine.search_offline(self.query)
+        except Exception as e:
+            print(f"Offline search failed: {e}")
+            offline = None
+        if offline:
+            self.finished.emit(offline['summary_html'], offline['bis_url'])
+            if offline.get('fresh'):
+                return
+
+        try:
+            result = self.engine.search(self.query)
+            self.finished.emit(result['summary_html'], result['bis_url'])
+        except Exception as e:
+            if not offline:
+                self.finished.emit(f"Search failed: {e}", "https://overframe.gg")
+
+class PriceRefreshWorker(QThread):
+    finished = pyqtSignal(object) # quick_price result
+
+    def __init__(self, engine, name):
+        super().__init__()
+        self.engine = engine
+        self.name = name
+
+    def run(self):
+        try:
+            self.finished.emit(self.engine.refresh_price(self.name))
+        except Exception as e:
+            print(f"Price refresh failed: {e}")
+
+class CatalogueUpdateWorker(QThread):
+    finished = pyqtSignal(object) # diff report (or None on failure)
+
+    def __init__(self):
+        super().__init__()
+        self.stop_event = threading.Event() # Ends the item metadata crawl early (it resumes next run)
+
+    def run(self):
+        self.finished.emit(update_all(stop=self.stop_event, enrich=ConfigManager.get("crawl_item_metadata", False)))
+
+class PrefetchWorker(QThread):
+    status_changed = pyqtSignal(object) # {name: status}
+
+    def __init__(self, prefetcher, is_busy):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.is_busy = is_busy
+
+    def run(self):
+        self.prefetcher.run(is_busy=self.is_busy,
+                            should_stop=self.isInterruptionRequested,
+                            on_update=self.status_changed.emit)
+
+class OverlayController(QObject):
+    toggle_requested = pyqtSignal()
+    quit_requested = pyqtSignal()
+    diagnostics_requested = pyqtSignal()
+    world_state_pushed = pyqtSignal(str, object) # stream key, state
+    price_check_requested = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.app = QApplication(sys.argv)
+        self.overlay = WarframeOverlay()
+        self.visible = True
+        
+        # State storage for cycles
+        self.init_view_state()
+
+        # Data engine: in-process by default, or a shared daemon (see engine_server.py)
+        engine_url = ConfigManager.get("engine_url")
+        streams = ConfigManager.get("world_streams") or None
+        push_url = ConfigManager.get("world_push_url") or None
+        self.engine = RemoteEngine(engine_url, streams) if engine_url else DataEngine(streams, push_url)
+        if not engine_url:
+            # Searches parse here: spawn the HTML parse workers now, in the background
+            parse_pool.warm_up()
+        if ConfigManager.get("world_stream") in self.engine.streams:
+            self.engine.set_active(ConfigManager.get("world_stream"))
+        self.overlay.set_streams(list(self.engine.streams), self.engine.active)
+        self.overlay.stream_changed.connect(self.switch_stream)
+        # Pushed states arrive on a background thread; hop to the GUI thread via the signal
+        self.world_state_pushed.connect(self.on_stream_state)
+        self.engine.add_listener(self.world_state_pushed.emit)
+        
+        # Reward alerts (rules from config; evaluated only against new world-state entries, per stream)
+        rules = ConfigManager.get("alert_rules") or DEFAULT_RULES
+        self.alerts = {key: AlertEngine(rules) for key in self.engine.streams}
+        self.tray = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray = QSystemTrayIcon(self.app.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation))
+            self.tray.setToolTip("PyFrame Overlay")
+            self.tray.show()
+
+        # Initialize Reference Tab
+        self.overlay.set_reference_text(WarframeReference.DAMAGE_TABLE)
+
+        # Connect internal signals for thread safety
+        self.toggle_requested.connect(self.toggle_visibility_safe)
+        self.quit_requested.connect(self.quit_app_safe)
+        self.diagnostics_requested.connect(self.toggle_diagnostics)
+        self.price_check_requested.connect(self.quick_price_check)
+        self.overlay.export_trace_triggered.connect(self.export_trace)
+        self.overlay.minimize_triggered.connect(self.toggle_visibility_safe)
+
+        # Connect search signal
+        self.overlay.search_triggered.connect(self.handle_search)
+        self.overlay.exit_triggered.connect(self.quit_app_safe)
+
+        # Setup hotkey listener
+        self.listener = keyboard.GlobalHotKeys({
+            '<ctrl>+<alt>+o': self.emit_toggle,
+            '<ctrl>+<alt>+x': self.emit_quit,
+            '<ctrl>+<alt>+d': self.diagnostics_requested.emit,
+            ConfigManager.get("price_check_hotkey", "<ctrl>+<alt>+p"): self.price_check_requested.emit
+        })
+        self.listener.start()
+
+        # Clipboard price check toast
+        self.price_toast = PriceToast()
+        self.price_refresh_worker = None
+
+        # Timer for data fetching (Sync every 2 mins)
+        self.fetch_timer = QTimer()
+        self.fetch_timer.timeout.connect(self.update_world_data)
+        self.fetch_timer.start(120000)
+
+        # Timer for UI countdowns (Every 1 second)
+        self.ui_timer = QTimer()
+        self.ui_timer.timeout.connect(self.update_cycle_display)
+        self.ui_timer.start(1000)
+
+        # Timer for catalogue refresh (Every 6 hours; conditional requests make no-op runs cheap)
+        self.catalogue_worker = None
+        self.catalogue_timer = QTimer()
+        self.catalogue_timer.timeout.connect(self.refresh_catalogue)
+        self.catalogue_timer.start(6 * 60 * 60 * 1000)
+        QTimer.singleShot(30000, self.refresh_catalogue)
+
+        # Notes-driven prefetch: re-run before market cache entries expire,
+        # and shortly after the user stops typing in the Notes tab
+        self.search_worker = None
+        self.shown_bis_url = None
+        self.prefetcher = NotesPrefetcher(self.engine)
+        self.prefetch_worker = None
+        self.prefetch_timer = QTimer()
+        self.prefetch_timer.timeout.connect(self.run_prefetch)
+        self.prefetch_timer.start(4 * 60 * 1000)
+        self.notes_debounce = QTimer()
+        self.notes_debounce.setSingleShot(True)
+        self.notes_debounce.timeout.connect(self.run_prefetch)
+        self.overlay.notes_input.textChanged.connect(lambda: self.notes_debounce.start(3000))
+        QTimer.singleShot(5000, self.run_prefetch)
+
+        # Diagnostics tab refresh (only runs while the tab is open)
+        self.diagnostics_timer = QTimer()
+        self.diagnostics_timer.timeout.connect(self.refresh_diagnostics)
+
+        # Hidden mode: after this long hidden, discard the web page entirely (not just freeze it)
+        self.discard_timer = QTimer()
+        self.discard_timer.setSingleShot(True)
+        self.discard_timer.timeout.connect(lambda: self.overlay.release_resources(discard_page=True))
+
+        # Initial Load: Try cache first, then fetch
+        self.load_cached_world_data()
+        self.update_world_data()
+
+    def init_view_state(self):
+        """Render state derived from the world state (filled by process_world_state)."""
+        self.world_state = None # Raw state currently shown
+        self.cycle_data = {}
+        self.nightwave_html = ""
+        self.activities_static_html = ""
+        self.fissures_data = []
+        self.fissure_index = FissureIndex()
+        self.best_relics = {} # fissure tier -> top relics by expected value
+        self.invasions = [] # [(reward, node)]
+        self.invasions_html = ""
+        self.node_rewards = {} # node on screen -> its reward table
+        self.expanded_nodes = set() # nodes whose reward table is shown under their row
+        self.overlay.node_toggled.connect(self.toggle_node)
+
+        # Fissure filter presets: built-ins + user presets from config
+        self.fissure_presets = {p['name']: p for p in BUILTIN_PRESETS + (ConfigManager.get("fissure_presets") or [])}
+        selected = ConfigManager.get("fissure_preset", "All")
+        self.fissure_preset = self.fissure_presets.get(selected, BUILTIN_PRESETS[0])
+        self.overlay.set_fissure_presets(list(self.fissure_presets), self.fissure_preset['name'])
+        self.overlay.fissure_preset_changed.connect(self.set_fissure_preset)
+
+    def set_fissure_preset(self, name):
+        self.fissure_preset = self.fissure_presets.get(name, BUILTIN_PRESETS[0])
+        ConfigManager.save_config({"fissure_preset": self.fissure_preset['name']})
+        # Answered from the index; apply instantly rather than waiting for the next tick
+        self.update_cycle_display()
+
+    def emit_toggle(self):
+        self.toggle_requested.emit()
+
+    def emit_quit(self):
+        self.quit_requested.emit()
+
+    def load_cached_world_data(self):
+        """Warm start from the latest stored snapshot."""
+        state = self.engine.warm_start()
+        # Entries from before the restart were already alerted on
+        for key, alerts in self.alerts.items():
+            alerts.prime(self.engine.get_world_state(key))
+        if state:
+            print("Loaded world state from snapshot history.")
+            self.process_world_state(state)
+
+    def switch_stream(self, key):
+        """Show another platform/language; its state is already tracked, so this doesn't wait on the network."""
+        state = self.engine.set_active(key)
+        ConfigManager.save_config({"world_stream": self.engine.active})
+        if state:
+            self.process_world_state(state)
+        else:
+            self.overlay.update_cycles_tab(f"Loading {key}...")
+            self.overlay.update_activities_tab(f"Loading {key}...")
+
+    def refresh_catalogue(self):
+        """Refresh the Overframe item catalogue in the background."""
+        if self.catalogue_worker and self.catalogue_worker.isRunning():
+            return
+        self.catalogue_worker = CatalogueUpdateWorker()
+        self.catalogue_worker.finished.connect(self.on_catalogue_updated)
+        self.catalogue_worker.start()
+
+    def on_catalogue_updated(self, report):
+        if not report: return
+        if report['added'] or report['removed'] or report['changed'] or report.get('enriched'):
+            reload_overframe_cache()
+            self.overlay.setup_autocomplete()
+        if report.get('registry'):
+            ITEMS.reload()
+        if report.get('relics'):
+            self.update_best_relics()
+        if report.get('nodes'):
+            self.update_node_rewards()
+
+    def is_searching(self):
+        return bool(self.search_worker and self.search_worker.isRunning())
+
+    def run_prefetch(self):
+        """Parse noted items and warm their caches in the background."""
+        names = parse_noted_items(self.overlay.notes_input.toPlainText())
+        if self.prefetch_worker and self.prefetch_worker.isRunning() and list(self.prefetcher.status) == names:
+            return
+
+        self.prefetcher.set_items(names)
+        self.on_prefetch_status(self.prefetcher.status)
+        # A running worker picks up the new list itself; never block the GUI thread on it
+        if not names or (self.prefetch_worker and self.prefetch_worker.isRunning()): return
+
+        self.prefetch_worker = PrefetchWorker(self.prefetcher, self.is_searching)
+        self.prefetch_worker.status_changed.connect(self.on_prefetch_status)
+        self.prefetch_worker.finished.connect(self.on_prefetch_finished)
+        self.prefetch_worker.start(QThread.Priority.LowestPriority)
+
+    def on_prefetch_finished(self):
+        # Items noted just as the worker ran out of work are still pending
+        if self.prefetch_worker.isInterruptionRequested(): return
+        if any(st['state'] == 'pending' for st in self.prefetcher.status.values()):
+            self.run_prefetch()
+
+    def on_prefetch_status(self, status):
+        self.overlay.update_notes_status(NotesPrefetcher.format_status(status))
+
+    def toggle_diagnostics(self):
+        if self.overlay.toggle_diagnostics_tab():
+            self.refresh_diagnostics()
+            self.diagnostics_timer.start(2000)
+        else:
+            self.diagnostics_timer.stop()
+
+    def refresh_diagnostics(self):
+        self.overlay.update_diagnostics(REGISTRY.format_html())
+
+    def export_trace(self):
+        path = os.path.join(DIAGNOSTICS_DIR, time.strftime('trace-%Y%m%d-%H%M%S.json'))
+        try:
+            REGISTRY.export_trace(path)
+            self.overlay.set_diagnostics_status(f"Saved {path}")
+        except Exception as e:
+            self.overlay.set_diagnostics_status(f"Export failed: {e}")
+
+    def toggle_visibility_safe(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.exit_hidden_mode()
+            self.overlay.show()
+            self.overlay.raise_()
+            self.overlay.activateWindow()
+        else:
+            self.overlay.hide()
+            self.enter_hidden_mode()
+
+    def enter_hidden_mode(self):
+        """Nobody is looking: stop per-second rendering and release heavy resources.
+
+        World-state polling keeps running (it is cheap and keeps history/alerts current).
+        """
+        self.ui_timer.stop()
+        self.diagnostics_timer.stop()
+        self.prefetch_timer.stop()
+        self.overlay.release_resources()
+        self.discard_timer.start(HIDDEN_DISCARD_DELAY_MS)
+
+    def exit_hidden_mode(self):
+        self.discard_timer.stop()
+        self.overlay.restore_resources()
+        # Render immediately with current data, then resume the timers
+        self.update_cycle_display()
+        self.ui_timer.start(1000)
+        self.prefetch_timer.start(4 * 60 * 1000)
+        if self.overlay.tabs.indexOf(self.overlay.tab_diag) >= 0:
+            self.refresh_diagnostics()
+            self.diagnostics_timer.start(2000)
+
+    def quit_app_safe(self):
+        self.listener.stop()
+        if self.catalogue_worker and self.catalogue_worker.isRunning():
+            self.catalogue_worker.stop_event.set()
+        if self.prefetch_worker and self.prefetch_worker.isRunning():
+            self.prefetch_worker.requestInterruption()
+        self.engine.stop()
+        parse_pool.shutdown()
+        if self.tray:
+            self.tray.hide()
+        self.overlay.close()
+        if hasattr(self.overlay, 'browser'):
+            self.overlay.browser.setPage(None)
+        self.app.quit()
+
+    def handle_search(self, query):
+        # Update UI to show searching status
+        loading_html = f"""
+        <style>
+            .loading {{ color: #00d2ff; font-size: 14px; font-weight: bold; }}
+            .sub {{ color: #888; font-size: 12px; }}
+        </style>
+        <br><br>
+        <div align='center'>
+            <div class='loading'>Searching for '{query}'...</div>
+            <div class='sub'>Fetching Market Data...</div>
+            <div class='sub'>Querying Wiki...</div>
+            <div class='sub'>Locating Drop Tables...</div>
+            <div class='sub'>Finding Builds...</div>
+        </div>
+        """
+        self.overlay.update_search_results(loading_html)
+        
+        # Start background thread
+        self.shown_bis_url = None
+        self.search_worker = SearchWorker(self.engine, query)
+        self.search_worker.finished.connect(self.on_search_completed)
+        self.search_worker.start()
+
+    def quick_price_check(self):
+        """Hotkey: price the clipboard (or search box) item from cache, refreshing in the background if stale."""
+        text = QApplication.clipboard().text().strip() or self.overlay.search_input.text().strip()
+        if not text: return
+        result = self.engine.quick_price(text)
+        self.price_toast.show_price(result['query'], format_quick_price(result))
+
+        if result['stale'] and result['query'] and not (self.price_refresh_worker and self.price_refresh_worker.isRunning()):
+            self.price_refresh_worker = PriceRefreshWorker(self.engine, result['query'])
+            self.price_refresh_worker.finished.connect(self.on_price_refreshed)
+            self.price_refresh_worker.start()
+
+    def on_price_refreshed(self, result):
+        if result:
+            self.price_toast.update_price(result['query'], format_quick_price(dict(result, stale=False)))
+
+    def on_search_completed(self, summary_html, bis_url):
+        # Update Search Tab (Top Section)
+        self.overlay.update_search_results(summary_html)
+        
+        # BiS Mods URL (Bottom Section - Auto loads into Search Tab Webview)
+        # The live refresh after an offline answer usually has the same build; don't reload it
+        if bis_url == self.shown_bis_url:
+            return
+        self.shown_bis_url = bis_url
+        if bis_url.startswith("http"):
+            self.overlay.load_build_url(bis_url)
+        else:
+            # Load Overframe home or search if no direct hit
+            self.overlay.load_build_url(bis_url if "http" in bis_url else "https://overframe.gg")
+
+    def update_cycle_display(self):
+        if not self.cycle_data: return
+
+        now = time.time()
+        cycle_lines = []
+        needs_refresh = False
+
+        term_map = {
+            'earth': 'Earth', 'cetus': 'Cetus', 'vallis': 'Vallis', 
+            'cambion': 'Cambion', 'zariman': 'Zariman'
+        }
+
+        cycle_lines.append("<b>Cycles:</b>")
+        
+        for key, label in term_map.items():
+            info = self.cycle_data.get(key)
+            if not info:
+                cycle_lines.append(f"{label}: N/A")
+                continue
+            
+            expiry = info.expiry
+            state_str = (info.state or 'Unknown').capitalize()
+
+            if expiry:
+                total_seconds = int(expiry - now)
+
+                if total_seconds <= 0:
+                    needs_refresh = True
+                    # Just show 0s or Validating if it's lagging behind
+                    time_str = "Syncing..."
+                else:
+                    # Format time left
+                    hours = total_seconds // 3600
+                    minutes = (total_seconds % 3600) // 60
+                    seconds = total_seconds % 60
+                    
+                    parts = []
+                    if hours > 0: parts.append(f"{hours}h")
+                    parts.append(f"{minutes}m")
+                    parts.append(f"{seconds}s")
+                    time_str = " ".join(parts)
+                
+                cycle_lines.append(f"{label}: {state_str} ({time_str})")
+            else:
+                cycle_lines.append(f"{label}: {state_str}")
+
+        if needs_refresh:
+            # Prevent spamming API (Cooldown of 15s)
+            # If a cycle ends, it needs a bit to update serverside anyway
+            if time.time() - self.engine.last_fetch_time > 15:
+                print("Cycle expired, refreshing...")
+                # Not due on the regular schedule yet, so force the fetch
+                self.update_world_data(force=True)
+
+        final_html = "<br>".join(cycle_lines) + "<br><br>" + self.nightwave_html
+        self.overlay.update_cycles_tab(final_html)
+        
+        # --- Update Fissures (Live Countdown) ---
+        if self.fissures_data:
+            fissure_html = f"<b>Active Fissures ({self.fissure_preset['name']}):</b><br>"
+            
+            # Already sorted by tier, then expiry; only rows matching the preset are rendered
+            active = [f for f in self.fissure_index.query(self.fissure_preset) if f.expiry > now]
+            if not active:
+                fissure_html += "<div style='font-size:11px; color:#888;'>No fissures match this filter.</div>"
+            
+            current_tier = None
+            for f in active:
+                tier = f.tier
+                if tier != current_tier:
+                    current_tier = tier
+                    fissure_html += f"<div style='margin-top:5px; margin-bottom:2px; font-weight:bold; color:#aaa;'>--- {tier} ---</div>"
+                    relics = self.best_relics.get(tier)
+                    if relics:
+                        picks = ", ".join(f"{r['relic']} {r['platinum']:.0f}p/{r['ducats']:.0f}d" for r in relics)
+                        fissure_html += f"<div style='font-size:10px; color:#e0c060;'>Best: {picks}</div>"
+                
+                # Time Left
+                minutes = int((f.expiry - now) // 60)
+                
+                # Format
+                mission = f.mission_type or 'Unknown'
+                node, node_detail = node_html(f.node or 'Unknown', self.node_rewards, self.expanded_nodes)
+                enemy = f.enemy or ''
+                
+                modifiers = []
+                if f.is_hard: modifiers.append("SP")
+                if f.is_storm: modifiers.append("Storm")
+                mod_str = f" <span style='color:#ff5555; font-size:10px;'>{' '.join(modifiers)}</span>" if modifiers else ""
+                
+                fissure_html += f"<div style='font-size:11px;'>{mission} - {node} ({enemy}){mod_str} <span style='color:#00d2ff;'>{minutes}m</span></div>{node_detail}"
+            
+            # Combine static + dynamic
+            self.overlay.update_activities_tab(self.activities_static_html + self.invasions_html + fissure_html)
+        else:
+            self.overlay.update_activities_tab(self.activities_static_html + self.invasions_html)
+
+    def process_world_state(self, state):
+        """Updates UI with the provided world state dictionary."""
+        if not state: return
+
+        try:
+            with REGISTRY.timed('parse.world_state'):
+                view = parse_world_state(state)
+            # Store Data for Local Countdown
+            self.world_state = state
+            self.cycle_data = view['cycles']
+            self.nightwave_html = view['nightwave_html']
+            self.activities_static_html = view['activities_static_html']
+            self.fissures_data = view['fissures']
+            self.fissure_index = FissureIndex(self.fissures_data)
+            self.invasions = view['invasions']
+            self.update_best_relics()
+            self.update_node_rewards()
+
+            # Force UI update immediately
+            self.update_cycle_display()
+
+        except Exception as e:
+            err_msg = f"Error parsing state: {e}"
+            self.overlay.update_cycles_tab(err_msg)
+
+    def update_best_relics(self):
+        """Top relics for every fissure tier on screen (revalued only when prices changed)."""
+        try:
+            self.best_relics = self.engine.best_relics(
+                self.fissure_index.facet_values('tier'),
+                ConfigManager.get("relic_refinement", "Radiant"), ConfigManager.get("relic_squad_size", 4)) or {}
+        except Exception as e:
+            print(f"Relic valuation failed: {e}")
+            self.best_relics = {}
+
+    def update_node_rewards(self):
+        """Join the fissure and invasion nodes on screen with the local reward tables (one lookup per update, not per row)."""
+        nodes = {f.node for f in self.fissures_data if f.node} | {node for _, node in self.invasions}
+        try:
+            self.node_rewards = self.engine.node_rewards(sorted(nodes)) or {}
+        except Exception as e:
+            print(f"Node reward lookup failed: {e}")
+            self.node_rewards = {}
+        # Forget expansions for nodes that left the screen
+        self.expanded_nodes &= nodes
+        self.invasions_html = render_invasions(self.invasions, self.node_rewards, self.expanded_nodes)
+
+    def toggle_node(self, node):
+        self.expanded_nodes ^= {node}
+        self.invasions_html = render_invasions(self.invasions, self.node_rewards, self.expanded_nodes)
+        self.update_cycle_display()
+
+    def update_world_data(self, force=False):
+        # Fetch every due stream (concurrently) in one go; pushed streams aren't due unless forced
+        results = self.engine.refresh_streams(force=force)
+
+        alerts = []
+        for key, stream_state in results.items():
+            alerts += self.evaluate_alerts(key, stream_state)
+        self.notify_alerts(alerts)
+
+        if self.engine.active not in results:
+            return # Active stream not due yet
+        state = results[self.engine.active]
+        if state is self.world_state:
+            return # 304: nothing new
+        if state:
+            # Process it
+            self.process_world_state(state)
+        else:
+            self.overlay.update_cycles_tab("Failed to fetch world state data.<br>Check internet connection.")
+            self.overlay.update_activities_tab("Failed to fetch world state.")
+
+    def on_stream_state(self, key, state):
+        """A pushed (or drop catch-up) state for one stream."""
+        self.notify_alerts(self.evaluate_alerts(key, state))
+        if key == self.engine.active and state is not self.world_state:
+            self.process_world_state(state)
+
+    def evaluate_alerts(self, key, state):
+        if not state or key not in self.alerts:
+            return []
+        alerts = self.alerts[key].evaluate(state)
+        if len(self.alerts) > 1:
+            for a in alerts:
+                a['rule'] = f"[{key.upper()}] {a['rule']}"
+        return alerts
+
+    def notify_alerts(self, alerts):
+        """Raise one notification per new rule match (tray if available, else overlay banner)."""
+        if not alerts: return
+        lines = [f"{a['rule']}: {a['text']}" for a in alerts]
+        if self.tray:
+            title = alerts[0]['rule'] if len(alerts) == 1 else f"{len(alerts)} new reward alerts"
+            self.tray.showMessage(title, "\n".join(lines[:5]), QSystemTrayIcon.MessageIcon.Information, 8000)
+        self.overlay.show_notification("<br>".join(lines[:5]))
+
+    def run(self):
+        self.overlay.show()
+        sys.exit(self.app.exec())
@@ -0,0 +1,88 @@
+"""Build the offline data bundle from the live services.
+
+    python src/build_bundle.py                    # every catalogue item -> data/offline_bundle.json.gz
+    python src/build_bundle.py --limit 50 -w 4    # quick partial build
+    python src/build_bundle.py --delta            # also write the delta from the previous version
+
+Each catalogue item gets the same sections a live search shows (market price stats,
+drops, wiki intro, top build URL). Items that fail keep their previous record, and
+items whose sections didn't change keep their old "updated" time.
+See data_bundle.py for the format.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+from api_clients import OVERFRAME_CACHE
+from data_bundle import BUNDLE_FILE, DataBundle, load_bundle, write_delta
+from engine import DataEngine
+from price_check import HTTP_CACHE_FILE
+
+DEFAULT_WORKERS = 8
+
+def build(names, previous=None, workers=DEFAULT_WORKERS, progress=None):
+    """Fetch sections for every name concurrently; returns a new DataBundle one version past `previous`."""
+    engine = DataEngine()
+    items = dict(previous.items) if previous else {}
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(engine.fetch_sections, name) for name in names}
+        for i, (name, fut) in enumerate(futures.items(), 1):
+            try:
+                record, previous_record = fut.result(), items.get(name.lower())
+                # Unchanged sections keep the old record (and timestamp) so deltas stay small
+                if previous_record is None or dict(previous_record, updated=0) != dict(record, updated=0):
+                    items[name.lower()] = record
+            except Exception as e:
+                failed += 1
+                print(f"\n{name}: {e}", file=sys.stderr)
+            if progress:
+                progress(i, len(names))
+
+    # Drop items that left the catalogue
+    catalogue = {v['name'].lower() for v in OVERFRAME_CACHE.values()}
+    items = {k: v for k, v in items.items() if k in catalogue}
+    return DataBundle(items, (previous.version if previous else 0) + 1), failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline search bundle")
+    parser.add_argument('-o', '--output', default=BUNDLE_FILE)
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--limit', type=int, help="Only (re)fetch the first N catalogue items")
+    parser.add_argument('--delta', action='store_true', help="Also write a delta from the previous bundle")
+    parser.add_argument('--no-cache', action='store_true', help="Don't read/write the on-disk response cache")
+    args = parser.parse_args(argv)
+
+    if not OVERFRAME_CACHE:
+        print("Item catalogue is empty; run update_cache.py first.", file=sys.stderr)
+        return 1
+
+    previous = load_bundle(args.output)
+    names = sorted(v['name'] for v in OVERFRAME_CACHE.values())[:args.limit]
+
+    if not args.no_cache:
+        http_client.CACHE.load(HTTP_CACHE_FILE)
+    start = time.time()
+    progress = lambda done, total: print(f"\r{done}/{total}", end='', file=sys.stderr, flush=True)
+    try:
+        bundle, failed = build(names, previous, args.workers, progress)
+    finally:
+        if not args.no_cache:
+            http_client.CACHE.save(HTTP_CACHE_FILE)
+
+    bundle.save(args.output)
+    print(f"\rBundle v{bundle.version}: {len(bundle.items)} items ({failed} failed) in {time.time() - start:.1f}s "
+          f"-> {args.output} ({os.path.getsize(args.output) // 1024} KB)", file=sys.stderr)
+
+    if args.delta and previous:
+        delta = bundle.diff(previous)
+        path = write_delta(delta, os.path.dirname(os.path.abspath(args.output)))
+        print(f"Delta v{previous.version}->v{bundle.version}: {len(delta['items'])} changed, "
+              f"{len(delta['removed'])} removed -> {path}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,10 @@
+import copy
 import json
 import os
+import threading
+import time
+import atexit
+from fileio import atomic_write_bytes
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'data', 'config.json')
 
@@ -11,34 +16,117 @@ DEFAULT_CONFIG = {
         "height": 600
     },
     "notes": "",
+    "last_tab": 0,
+    "engine_url": "", # e.g. "http://127.0.0.1:8765" to share an engine_server.py daemon
+    "alert_rules": [], # see alert_rules.py; empty = built-in reward rules
+    "fissure_presets": [], # see fissure_index.py, e.g. {"name": "Axi SP Capture", "tier": ["Axi"], "missionType": ["Capture"], "steel_path": true}
+    "fissure_preset": "All",
+    "world_streams": ["pc/en"], # platform/language; {"stream": "ps4/en", "interval": 300} to poll less often
+    "world_stream": "pc/en", # Stream shown in the overlay
+    "relic_refinement": "Radiant", # Relic suggestions per fissure tier (see relic_values.py)
+    "relic_squad_size": 4,
+    "price_check_hotkey": "<ctrl>+<alt>+p", # Price toast for the clipboard / search box item
+    "crawl_item_metadata": False, # Background refresh also crawls ~2,500 Overframe item pages (see enrich_catalogue.py)
+    "world_push_url": "", # Optional SSE feed, e.g. "https://host/{platform}/events?language={language}"; polling is the fallback
     "version": "1.0.0"
 }
 
+# Quiet period after the last change before writing to disk
+SAVE_DEBOUNCE_SECONDS = 1.5
+
 class ConfigManager:
+    """In-memory config store with debounced, atomic write-behind persistence.
+
+    Callers mutate state through save_config(); that only marks the store dirty.
+    A background thread writes the file once changes settle, via temp file + rename,
+    so autosave can run on every keystroke/drag without touching disk each time.
+    """
+    _lock = threading.Condition()
+    _write_lock = threading.Lock()
+    _data = None
+    _dirty = False
+    _deadline = 0.0
+    _writer = None
+
     @staticmethod
-    def load_config():
-        """Load config from disk or return default."""
+    def _read_from_disk():
         if not os.path.exists(os.path.dirname(CONFIG_FILE)):
             os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-            
+
+        data = copy.deepcopy(DEFAULT_CONFIG)
         if os.path.exists(CONFIG_FILE):
             try:
                 with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    return {**DEFAULT_CONFIG, **json.load(f)} # Merge with defaults
+                    data.update(json.load(f)) # Merge with defaults
             except Exception as e:
                 print(f"Error loading config: {e}")
-                return DEFAULT_CONFIG
-        return DEFAULT_CONFIG
+        return data
+
+    @staticmethod
+    def _ensure_loaded():
+        if ConfigManager._data is None:
+            ConfigManager._data = ConfigManager._read_from_disk()
+
+    @staticmethod
+    def load_config():
+        """Return a copy of the current config (read from disk once per process)."""
+        with ConfigManager._lock:
+            ConfigManager._ensure_loaded()
+            return copy.deepcopy(ConfigManager._data)
+
+    @staticmethod
+    def get(key, default=None):
+        with ConfigManager._lock:
+            ConfigManager._ensure_loaded()
+            return copy.deepcopy(ConfigManager._data.get(key, default))
 
     @staticmethod
     def save_config(data):
-        """Save config to disk."""
-        try:
-            # Ensure proper structure merging
-            current = ConfigManager.load_config()
-            current.update(data)
-            
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(current, f, indent=4)
-        except Exception as e:
-            print(f"Error saving config: {e}")
+        """Merge data into the in-memory config and schedule a debounced write."""
+        with ConfigManager._lock:
+            ConfigManager._ensure_loaded()
+            changed = any(ConfigManager._data.get(k) != v for k, v in data.items())
+            if not changed:
+                return
+            ConfigManager._data.update(copy.deepcopy(data))
+            ConfigManager._dirty = True
+            ConfigManager._deadline = time.monotonic() + SAVE_DEBOUNCE_SECONDS
+
+            if ConfigManager._writer is None:
+                ConfigManager._writer = threading.Thread(target=ConfigManager._write_loop, name="ConfigWriter", daemon=True)
+                ConfigManager._writer.start()
+            ConfigManager._lock.notify()
+
+    @staticmethod
+    def flush():
+        """Write pending changes immediately (e.g. on exit)."""
+        # Serialise writers so an older snapshot can never land after a newer one
+        with ConfigManager._write_lock:
+            with ConfigManager._lock:
+                if not ConfigManager._dirty:
+                    return
+                ConfigManager._dirty = False
+                payload = json.dumps(ConfigManager._data, indent=4).encode('utf-8')
+            try:
+                atomic_write_bytes(CONFIG_FILE, payload)
+            except Exception as e:
+                print(f"Error saving config: {e}")
+                with ConfigManager._lock:
+                    ConfigManager._dirty = True # Retry later rather than spinning
+                    ConfigManager._deadline = time.monotonic() + 10
+
+    @staticmethod
+    def _write_loop():
+        while True:
+            with ConfigManager._lock:
+                while not ConfigManager._dirty:
+                    ConfigManager._lock.wait()
+                # Debounce: keep waiting while changes keep arriving
+                while True:
+                    remaining = ConfigManager._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    ConfigManager._lock.wait(remaining)
+            ConfigManager.flush()
+
+atexit.register(ConfigManager.flush)
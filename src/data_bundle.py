@@ -0,0 +1,126 @@
+"""Versioned offline data bundle: search sections for every catalogue item, no network needed.
+
+Shipped next to overframe_cache.json as offline_bundle.json.gz (gzip JSON):
+    {"format": 1, "version": 7, "created": 1760000000.0,
+     "items": {"volt prime": {"query": ..., "full_name": ..., "market": {...},
+                              "drops": html, "wiki": html, "bis_url": ..., "updated": ts}}}
+
+Deltas (offline_bundle.delta-<base>-<version>.json.gz) carry only the items that
+changed since base_version plus the removed keys; load_bundle() applies every delta
+that chains onto the loaded version. Build both with build_bundle.py.
+"""
+import glob
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from fileio import atomic_write_bytes, loads
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+BUNDLE_FILE = os.path.join(DATA_DIR, 'offline_bundle.json.gz')
+FORMAT = 1
+
+def _read(path):
+    with gzip.open(path, 'rb') as f:
+        return loads(f.read())
+
+def _write(path, obj):
+    atomic_write_bytes(path, gzip.compress(json.dumps(obj, separators=(',', ':')).encode('utf-8'), 9))
+
+def delta_path(base_version, version, directory=DATA_DIR):
+    return os.path.join(directory, f"offline_bundle.delta-{base_version}-{version}.json.gz")
+
+class DataBundle:
+    def __init__(self, items=None, version=0, created=None):
+        self.items = items or {}
+        self.version = version
+        self.created = created or time.time()
+        self._lock = threading.Lock()
+        self._index_names()
+
+    def _index_names(self):
+        # full_name / market key -> item key, so "Volt Prime Set" or "volt_prime_set" find "volt prime"
+        self.aliases = {}
+        for key, rec in self.items.items():
+            self.aliases[rec.get('full_name', '').lower()] = key
+            url_key = (rec.get('market') or {}).get('url_key')
+            if url_key:
+                self.aliases[url_key.replace('_', ' ')] = key
+
+    @classmethod
+    def load(cls, path):
+        data = _read(path)
+        if data.get('format') != FORMAT:
+            raise ValueError(f"Unsupported bundle format {data.get('format')}")
+        return cls(data['items'], data['version'], data.get('created'))
+
+    def save(self, path=BUNDLE_FILE):
+        with self._lock:
+            _write(path, {'format': FORMAT, 'version': self.version, 'created': self.created, 'items': self.items})
+
+    def lookup(self, query):
+        """Return the record for a typed name, or None."""
+        key = re.sub(r'\s+', ' ', query.lower().strip())
+        for candidate in (key, f"{key} set", f"{key} prime set"):
+            if candidate in self.items:
+                return self.items[candidate]
+            if candidate in self.aliases:
+                return self.items.get(self.aliases[candidate])
+        return None
+
+    def put(self, record):
+        """Add/replace a record (e.g. from a live search)."""
+        key = record['query'].lower().strip()
+        with self._lock:
+            self.items[key] = record
+            self.aliases[record.get('full_name', '').lower()] = key
+
+    # --- Deltas ---
+
+    def diff(self, base):
+        """Delta that turns `base` into this bundle."""
+        changed = {k: rec for k, rec in self.items.items() if base.items.get(k) != rec}
+        removed = [k for k in base.items if k not in self.items]
+        return {'format': FORMAT, 'base_version': base.version, 'version': self.version,
+                'created': self.created, 'items': changed, 'removed': removed}
+
+    def apply_delta(self, delta):
+        if delta.get('format') != FORMAT or delta['base_version'] != self.version:
+            raise ValueError(f"Delta {delta.get('base_version')}->{delta.get('version')} doesn't apply to version {self.version}")
+        with self._lock:
+            self.items.update(delta['items'])
+            for key in delta['removed']:
+                self.items.pop(key, None)
+            self.version = delta['version']
+            self.created = delta['created']
+            self._index_names()
+
+def write_delta(delta, directory=DATA_DIR):
+    path = delta_path(delta['base_version'], delta['version'], directory)
+    _write(path, delta)
+    return path
+
+def load_bundle(path=BUNDLE_FILE):
+    """Load the bundle and apply any deltas that chain onto it. Returns None if there is no bundle."""
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = DataBundle.load(path)
+    except Exception as e:
+        print(f"Failed to load offline bundle: {e}")
+        return None
+
+    deltas = {}
+    for delta_file in glob.glob(os.path.join(os.path.dirname(path), 'offline_bundle.delta-*.json.gz')):
+        m = re.search(r'delta-(\d+)-(\d+)\.json\.gz$', delta_file)
+        if m:
+            deltas[int(m.group(1))] = delta_file
+    while bundle.version in deltas:
+        try:
+            bundle.apply_delta(_read(deltas.pop(bundle.version)))
+        except Exception as e:
+            print(f"Failed to apply bundle delta: {e}")
+            break
+    return bundle
@@ -0,0 +1,581 @@
+"""Headless data engine: fetching, caching and parsing, with no Qt dependency.
+
+The overlay uses it in-process; engine_server.py exposes the same engine over a
+local JSON API so several overlays / scripts can share one poller and one cache.
+"""
+import base64
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import quote
+import http_client
+from api_clients import WarframeAPI, ITEMS, TTL_ICON, TTL_MARKET_ORDERS
+from item_registry import extract_name
+from snapshot_store import SnapshotStore, SNAPSHOT_DIR
+from world_source import PushSubscription
+from data_bundle import load_bundle
+from search_cache import CachedResult, SearchResultCache
+import relic_values
+import node_rewards
+from metrics import REGISTRY
+from world_model import WorldState
+
+# Legacy single-file cache (written to the CWD by older versions); imported once into the snapshot store
+LEGACY_CACHE_FILE = "world_state_cache.json"
+
+POLL_INTERVAL_SECONDS = 120
+DEFAULT_STREAM = "pc/en"
+# A stream counts as due this much before its interval elapses (timer jitter)
+DUE_SLACK_SECONDS = 5
+# A search renders whatever sections arrived by then; the rest land in the result cache later
+SEARCH_DEADLINE_SECONDS = 8
+SECTION_WORKERS = 8
+
+def parse_world_state(state):
+    """Turn a world state (raw dict or WorldState) into the pieces the overlay renders.
+
+    Returns {'world': WorldState, 'cycles': {key: Cycle}, 'nightwave_html': str,
+    'activities_static_html': str, 'invasions': [(reward, node)], 'fissures': (Fissure, ...)}.
+    Expiries are epoch seconds.
+    """
+    world = state if isinstance(state, WorldState) else WorldState(state)
+
+    # Nightwave (Static until next fetch)
+    nightwave_html = ""
+    if world.nightwave:
+        nightwave_html += "<b>Nightwave:</b><br>"
+        for c in world.nightwave[:3]:
+            nightwave_html += f"- {c.title} ({c.reputation})<br>"
+
+    # --- Activities (Static Parts) ---
+    html = ""
+
+    # Sortie
+    sortie = world.sortie
+    if sortie:
+        html += f"<b>Sortie ({sortie.boss} - {sortie.faction}):</b><br>"
+        for idx, mission in enumerate(sortie.missions, 1):
+            html += f"{idx}. {mission.mission_type} - {mission.modifier or 'None'}<br>"
+        html += "<br>"
+
+    # Archon Hunt
+    archon = world.archon_hunt
+    if archon:
+        html += f"<b>Archon Hunt ({archon.boss}):</b><br>"
+        for idx, mission in enumerate(archon.missions, 1):
+            html += f"{idx}. {mission.mission_type}<br>"
+        html += "<br>"
+
+    # Void Trader
+    html += f"<b>Void Trader:</b><br>{WarframeAPI.process_void_trader(world.void_trader)}<br><br>"
+
+    return {
+        'world': world,
+        'cycles': world.cycles,
+        'nightwave_html': nightwave_html,
+        'activities_static_html': html,
+        # Rendered by the overlay (render_invasions) so rows can expand their node's rewards
+        'invasions': WarframeAPI.process_invasions(world.invasions),
+        'fissures': world.fissures,
+    }
+
+def render_node_rewards(entry, per_rotation=4):
+    """Compact drop table for one node (node_rewards entry): likeliest rewards per rotation."""
+    lines = [entry['game_mode']] if entry.get('game_mode') else []
+    for rotation, items in entry['rotations']:
+        picks = ", ".join(f"{item} {chance:g}%" for item, chance in items[:per_rotation])
+        more = f" (+{len(items) - per_rotation} more)" if len(items) > per_rotation else ""
+        lines.append(f"{rotation + ': ' if rotation else ''}{picks}{more}")
+    return f"<div style='font-size:10px; color:#999; margin-left:12px; margin-bottom:3px;'>{'<br>'.join(lines)}</div>"
+
+def node_html(node, rewards, expanded):
+    """(name html, detail html) for a row's node: a toggle link, plus its drop table when expanded, if the reward table is known."""
+    entry = rewards.get(node)
+    if not entry:
+        return node, ""
+    arrow = "&#9662;" if node in expanded else "&#9656;"
+    link = f"<a href='node:{quote(node)}' style='color:inherit; text-decoration:none;'>{node} {arrow}</a>"
+    return link, render_node_rewards(entry) if node in expanded else ""
+
+def render_invasions(invasions, rewards=None, expanded=()):
+    """'Interesting Invasions' block from parse_world_state's [(reward, node)]."""
+    if not invasions:
+        return ""
+    html = "<b>Interesting Invasions:</b><br>"
+    for reward, node in invasions:
+        name, detail = node_html(node, rewards or {}, expanded)
+        html += f"- {reward} ({name})<br>{detail}"
+    return html + "<br>"
+
+def build_summary_html(full_name, price_text, drop_text, wiki_text, img_html=""):
+    return f"""
+        <style>
+            h3 {{ margin-top: 0; margin-bottom: 5px; color: #00d2ff; font-size: 14px; }}
+            div {{ margin-bottom: 10px; }}
+            b {{ color: #eee; }}
+        </style>
+        <div style="overflow: auto;">
+            {img_html}
+            <h2 style='color: #fff; margin-bottom: 1px; margin-top: 0px;'>{full_name}</h2>
+            <div style='margin-bottom: 5px;'>{price_text}</div>
+        </div>
+        <div style="clear: both;"></div>
+        <div>{drop_text}</div>
+        <div style='font-size: 11px;'>{wiki_text}</div>
+        """
+
+def render_search_result(record, img_html="", offline=False, late=()):
+    """Search result dict from a section record (live, or from the offline bundle).
+
+    late lists sections that missed the search deadline (shown with their previous value, if any).
+    """
+    market = record['market']
+    price_text = WarframeAPI.format_market_price(market)
+    if 'market' in late and not market.get('url_key'):
+        price_text = "<b>Market Price:</b> warframe.market didn't answer in time."
+    if late:
+        price_text += f" <span style='color:#888; font-size:11px;'>({', '.join(late)} timed out; showing what arrived)</span>"
+    if offline:
+        as_of = datetime.fromtimestamp(record.get('updated', 0)).strftime('%Y-%m-%d')
+        price_text += f" <span style='color:#888; font-size:11px;'>(offline data from {as_of}, refreshing...)</span>"
+    summary_html = build_summary_html(record['full_name'], price_text, record['drops'], record['wiki'], img_html)
+    return {'full_name': record['full_name'], 'price': market['price'], 'summary_html': summary_html,
+            'bis_url': record['bis_url'], 'offline': offline}
+
+def format_quick_price(result):
+    """Compact HTML for the price-check toast."""
+    market = result['market']
+    html = f"<b>{result['name'] or 'Unknown item'}</b><br>"
+    stats = market.get('stats') if market else None
+    if not market:
+        html += "<span style='color:#888;'>No cached price yet</span>"
+    elif not market.get('url_key'):
+        html += "<span style='color:#888;'>Not tradeable</span>"
+    elif not stats or stats['min'] is None:
+        html += "<span style='color:#888;'>No sellers in-game</span>"
+    else:
+        html += f"<span style='color:#00ff88; font-size:15px;'>{stats['min']}p</span>"
+        html += f" <span style='color:#aaa;'>median {stats['median']}p · {stats['sellers']} sellers"
+        if stats.get('buy_max'):
+            html += f" · buy {stats['buy_max']}p"
+        html += "</span>"
+    if result.get('ducats'):
+        html += f"<br><span style='color:#e0c060;'>{result['ducats']} ducats</span>"
+    if result['stale']:
+        html += "<br><span style='color:#888; font-size:10px;'>Updating...</span>"
+    return html
+
+def icon_html(icon_url):
+    """Fetch an icon and inline it as base64 (QTextBrowser can't load remote images)."""
+    if not icon_url:
+        return ""
+    try:
+        img_data = http_client.get(icon_url, ttl=TTL_ICON).content
+        b64_img = base64.b64encode(img_data).decode('utf-8')
+        return f"<img src='data:image/png;base64,{b64_img}' width='64' height='64' style='float:left; margin-right:10px; border-radius:5px;'>"
+    except:
+        return ""
+
+def parse_stream_key(key):
+    """'ps4/de' -> ('ps4', 'de'); a bare platform defaults to English."""
+    platform, _, language = (key or DEFAULT_STREAM).strip().lower().partition('/')
+    if platform not in WarframeAPI.PLATFORMS:
+        raise ValueError(f"Unknown platform '{platform}' (expected one of {', '.join(WarframeAPI.PLATFORMS)})")
+    language = language or 'en'
+    if language not in WarframeAPI.LANGUAGES:
+        raise ValueError(f"Unknown language '{language}' (expected one of {', '.join(WarframeAPI.LANGUAGES)})")
+    return platform, language
+
+class WorldStateStream:
+    """One platform/language world state with its own schedule and snapshot history.
+
+    Kept current either by a push subscription (see world_source.py) or, while no
+    push channel is connected, by conditional polling (If-None-Match).
+    """
+
+    def __init__(self, key, interval=POLL_INTERVAL_SECONDS, snapshots=None):
+        self.platform, self.language = parse_stream_key(key)
+        self.key = f"{self.platform}/{self.language}"
+        self.interval = interval
+        # pc/en keeps the original history directory; other streams get their own
+        directory = SNAPSHOT_DIR if self.key == DEFAULT_STREAM else os.path.join(SNAPSHOT_DIR, self.key.replace('/', '_'))
+        self.snapshots = snapshots or SnapshotStore(directory)
+        self.state = None
+        self.etag = None
+        self.last_fetch_time = 0
+        self.push = None
+        self._lock = threading.Lock()
+
+    def is_due(self, now=None):
+        if self.push and self.push.connected:
+            return False # Push keeps it current; polling resumes when the channel drops
+        return (now or time.time()) - self.last_fetch_time >= self.interval - DUE_SLACK_SECONDS
+
+    def _record(self, state):
+        self.state = state
+        # Record it in the snapshot history
+        try:
+            self.snapshots.append(state)
+        except Exception as e:
+            print(f"Failed to save snapshot ({self.key}): {e}")
+
+    def refresh(self):
+        """Poll once. Returns the current state (the same object if unchanged), or None on failure."""
+        state, etag, changed = WarframeAPI.fetch_world_state(self.platform, self.language, self.etag)
+        with self._lock:
+            self.last_fetch_time = time.time()
+            if not changed:
+                return self.state if etag else None # 304 keeps the ETag; failures drop it
+            self.etag = etag
+            self._record(state)
+            return state
+
+    def apply_push(self, state):
+        with self._lock:
+            self.last_fetch_time = time.time()
+            self.etag = None # Our copy no longer matches any polled version
+            self._record(state)
+
+class DataEngine:
+    """Owns the world-state pollers, snapshot history and search pipeline.
+
+    Several platform/language streams can be tracked at once; due streams are
+    fetched concurrently so adding one doesn't add its latency to the others.
+    """
+
+    def __init__(self, streams=None, push_url=None):
+        self._lock = threading.Lock()
+        # Push feed URL template, e.g. "https://example.org/{platform}/events?language={language}"
+        self.push_url = push_url
+        self.listeners = []
+        self.streams = {}
+        for key in streams or [DEFAULT_STREAM]:
+            self.add_stream(key)
+        self.active = next(iter(self.streams))
+        self._pool = ThreadPoolExecutor(max_workers=len(WarframeAPI.PLATFORMS), thread_name_prefix="WorldState")
+        self._section_pool = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix="SearchSection")
+        self._poller = None
+        self._stop = threading.Event()
+        self._bundle = False # Not loaded yet
+        self._relics = False # Not loaded yet
+        self._relics_mtime = None
+        self._nodes = False # Not loaded yet
+        self._nodes_mtime = None
+        self.results = SearchResultCache()
+
+    # --- World state ---
+
+    def add_stream(self, key, interval=POLL_INTERVAL_SECONDS):
+        """Track another stream ('xb1/en', {'stream': 'ps4/de', 'interval': 300}); returns its key."""
+        if isinstance(key, dict):
+            key, interval = key.get('stream', DEFAULT_STREAM), key.get('interval', interval)
+        stream = WorldStateStream(key, interval)
+        with self._lock:
+            if stream.key in self.streams:
+                return stream.key
+            self.streams[stream.key] = stream
+        if self.push_url:
+            url = self.push_url.format(platform=stream.platform, language=stream.language)
+            stream.push = PushSubscription(url, on_state=lambda state: self._on_push(stream, state),
+                                           on_status=lambda connected: self._on_push_status(stream, connected)).start()
+        return stream.key
+
+    def add_listener(self, callback):
+        """callback(key, state) for every pushed state (called from the push thread)."""
+        self.listeners.append(callback)
+
+    def _notify(self, key, state):
+        for callback in self.listeners:
+            callback(key, state)
+
+    def _on_push(self, stream, state):
+        stream.apply_push(state)
+        self._notify(stream.key, state)
+
+    def _on_push_status(self, stream, connected):
+        if connected or self._stop.is_set():
+            return
+        # Channel dropped: poll now to catch anything missed; the regular schedule takes over from here
+        state = stream.refresh()
+        if state:
+            self._notify(stream.key, state)
+
+    def set_active(self, key):
+        platform, language = parse_stream_key(key)
+        key = f"{platform}/{language}"
+        if key not in self.streams:
+            self.add_stream(key)
+        self.active = key
+        return self.streams[key].state
+
+    @property
+    def snapshots(self):
+        return self.streams[self.active].snapshots
+
+    @property
+    def state(self):
+        return self.streams[self.active].state
+
+    @property
+    def last_fetch_time(self):
+        return self.streams[self.active].last_fetch_time
+
+    def warm_start(self):
+        """Load every stream's latest stored state (importing the legacy cache file once); returns the active one."""
+        with self._lock:
+            default = self.streams.get(DEFAULT_STREAM)
+            if default and not default.snapshots.count and os.path.exists(LEGACY_CACHE_FILE):
+                try:
+                    with open(LEGACY_CACHE_FILE, 'r') as f:
+                        default.snapshots.append(json.load(f), ts=os.path.getmtime(LEGACY_CACHE_FILE))
+                except Exception as e:
+                    print(f"Failed to import legacy cache: {e}")
+
+            for stream in self.streams.values():
+                if stream.state is None:
+                    stream.state = stream.snapshots.latest_state()
+            return self.state
+
+    def refresh_streams(self, force=False):
+        """Fetch all due streams concurrently. Returns {key: state or None} for the streams fetched."""
+        now = time.time()
+        due = [s for s in list(self.streams.values()) if force or s.is_due(now)]
+        futures = {s.key: self._pool.submit(s.refresh) for s in due}
+        return {key: future.result() for key, future in futures.items()}
+
+    def refresh_world_state(self):
+        """Return a current active world state, polling unless push is live (other due streams ride along)."""
+        active = self.streams[self.active]
+        results = self.refresh_streams()
+        if active.key not in results:
+            results[active.key] = active.state if active.push and active.push.connected else active.refresh()
+        return results[active.key]
+
+    def get_world_state(self, key=None):
+        stream = self.streams.get(key or self.active)
+        return stream.state if stream else None
+
+    def start_polling(self, interval=POLL_INTERVAL_SECONDS):
+        """Poll due streams on a background thread (used by the daemon)."""
+        if self._poller: return
+
+        def loop():
+            while not self._stop.is_set():
+                self.refresh_streams()
+                # Wake often enough for the most frequently polled stream
+                self._stop.wait(min([interval] + [s.interval for s in self.streams.values()]))
+
+        self._poller = threading.Thread(target=loop, name="WorldStatePoller", daemon=True)
+        self._poller.start()
+
+    def stop(self):
+        self._stop.set()
+        for stream in self.streams.values():
+            if stream.push:
+                stream.push.stop()
+        self._pool.shutdown(wait=False)
+        self._section_pool.shutdown(wait=False)
+
+    # --- Search ---
+
+    @property
+    def bundle(self):
+        """Offline data bundle (see data_bundle.py), loaded on first use; None if not installed."""
+        with self._lock:
+            if self._bundle is False:
+                self._bundle = load_bundle()
+            return self._bundle
+
+    def search_offline(self, query):
+        """Answer a search without network: the memoised result (even if partly stale), else the bundle.
+
+        Returns None if neither knows the item; 'fresh' is True only when no section has expired.
+        """
+        entry = self.results.get(query)
+        if entry:
+            return dict(self._render(entry), fresh=not entry.stale())
+        bundle = self.bundle
+        record = bundle.lookup(query) if bundle else None
+        if not record:
+            return None
+        with REGISTRY.timed('search.offline'):
+            return dict(render_search_result(record, offline=True), fresh=False)
+
+    def _fetch_section(self, entry, section, query):
+        """Fetch one section live into entry (runs on the section pool)."""
+        # Price Check (resolves the item; the other sections use its name).
+        # Re-resolve with the query that first resolved it, so the entry keeps one identity
+        if section == 'market':
+            with REGISTRY.timed('search.market'):
+                entry.set('market', WarframeAPI.lookup_market_price(entry.query))
+            return
+        # If the price check missed the deadline, the other sections go by the typed name
+        market = entry.sections.get('market')
+        full_name = market['full_name'] if market else query
+
+        # Wiki Info
+        if section == 'wiki':
+            with REGISTRY.timed('search.wiki'):
+                entry.set('wiki', WarframeAPI.get_wiki_info(full_name))
+
+        # Drop / Acqusition Info
+        elif section == 'drops':
+            with REGISTRY.timed('search.drops'):
+                entry.set('drops', WarframeAPI.get_drop_locations(full_name))
+
+        elif section == 'icon':
+            with REGISTRY.timed('search.icon'):
+                entry.set('icon', icon_html(market['icon_url'] if market else None))
+
+        # BiS Mods URL
+        elif section == 'bis_url':
+            with REGISTRY.timed('search.build'):
+                entry.set('bis_url', WarframeAPI.get_bis_mods(full_name))
+
+    def _refresh(self, entry, query, sections, deadline=None):
+        """Fetch the given sections live into entry: the price check first, then the rest concurrently.
+
+        With a deadline (time.monotonic() value) it returns once the deadline passes; sections
+        still running keep their previous value until they finish. Returns the late sections.
+        """
+        entry.query = entry.query or query
+
+        def run(batch):
+            futures = {self._section_pool.submit(self._fetch_section, entry, s, query): s for s in batch}
+            if not futures:
+                return []
+            done, pending = wait(futures, timeout=None if deadline is None else max(0, deadline - time.monotonic()))
+            for fut in done:
+                fut.result() # Re-raise section errors
+            return [futures[fut] for fut in pending]
+
+        late = run([s for s in sections if s == 'market'])
+        return late + run([s for s in sections if s != 'market'])
+
+    def _render(self, entry, late=()):
+        if late:
+            # Partial: not memoised, the late sections show up once they land
+            return render_search_result(entry.record(entry.query or ''), entry.sections.get('icon', ''), late=late)
+        if entry.result is None:
+            entry.result = render_search_result(entry.record(''), entry.sections.get('icon', ''))
+        return entry.result
+
+    def _seed(self, query):
+        """New cache entry, pre-filled from the offline bundle with the bundle's timestamps."""
+        entry = CachedResult()
+        record = self.bundle.lookup(query) if self.bundle else None
+        if record:
+            entry.query = record['query']
+            for section in ('market', 'wiki', 'drops', 'bis_url'):
+                entry.set(section, record[section], fetched_at=record.get('updated', 0))
+        return entry
+
+    def fetch_sections(self, query):
+        """Fetch every search section live (except the icon). Returns a bundle record (see data_bundle.py)."""
+        entry = CachedResult()
+        self._refresh(entry, query, ('market', 'wiki', 'drops', 'bis_url'))
+        return entry.record(query)
+
+    def search(self, query, deadline=SEARCH_DEADLINE_SECONDS):
+        """Search, refetching only expired sections, for at most `deadline` seconds (None waits for all).
+
+        Returns {'full_name', 'price', 'summary_html', 'bis_url', 'offline'}.
+        """
+        late = []
+        with REGISTRY.timed('search.total', query=query):
+            entry = self.results.get(query) or self._seed(query)
+            stale = entry.stale()
+            if stale:
+                late = self._refresh(entry, query, stale, time.monotonic() + deadline if deadline else None)
+            self.results.put(query, entry)
+        # Later offline answers for this item use the fresh sections
+        if stale and self.bundle and 'market' in entry.sections:
+            self.bundle.put(entry.record(query))
+        return self._render(entry, late)
+
+    def quick_price(self, text):
+        """Price and ducats for free text (e.g. the clipboard) from memory only - no network.
+
+        Returns {'name', 'market' (or None), 'ducats', 'age' (seconds, or None), 'stale'}.
+        """
+        with REGISTRY.timed('quickcheck'):
+            item = ITEMS.match(text)
+            name = item['name'] if item else extract_name(text)
+            market, age = None, None
+            entry = self.results.get(name) if name else None
+            if entry and 'market' in entry.sections:
+                market, age = entry.sections['market'], time.time() - entry.fetched['market']
+            else:
+                record = self.bundle.lookup(name) if self.bundle and name else None
+                if record:
+                    market, age = record['market'], time.time() - record.get('updated', 0)
+            # "Volt" prices as the Volt Prime set; ducats follow what was priced
+            priced = ITEMS.resolve(market['full_name']) if market else None
+            return {'name': market['full_name'] if market else name, 'query': name, 'market': market,
+                    'ducats': (priced or item or {}).get('ducats'), 'age': age,
+                    'stale': market is None or age >= TTL_MARKET_ORDERS}
+
+    def refresh_price(self, name):
+        """Fetch just the market section for name into the result cache; returns quick_price(name)."""
+        entry = self.results.get(name) or self._seed(name)
+        self._refresh(entry, name, ('market',))
+        self.results.put(name, entry)
+        return self.quick_price(name)
+
+    # --- Relics ---
+
+    def _reward_price(self, name, prices):
+        # A fresh price from a recent search/price check beats the bulk list
+        entry = self.results.get(name)
+        if entry and 'market' not in entry.stale():
+            stats = entry.sections['market'].get('stats')
+            if stats and stats.get('median') is not None:
+                return stats['median']
+        return prices.get(relic_values.price_key(name))
+
+    def best_relics(self, tiers, refinement='Radiant', squad=4, count=3):
+        """{tier: [{'relic', 'platinum', 'ducats'}]} for fissure tiers; {} without NumPy or relic tables."""
+        with self._lock:
+            # (Re)load when the drop tables change on disk (update_cache.py refreshes them daily)
+            mtime = relic_values.drops_mtime()
+            if self._relics is False or self._relics_mtime != mtime:
+                self._relics, self._relics_mtime = relic_values.load_valuator(), mtime
+            valuator = self._relics
+        if valuator is None:
+            return {}
+        with REGISTRY.timed('relics.value'):
+            prices = relic_values.load_prices()
+            valuator.update(lambda name: self._reward_price(name, prices), lambda name: (ITEMS.resolve(name) or {}).get('ducats'))
+            return {tier: valuator.best(tier, refinement, squad, count) for tier in tiers}
+
+    def node_rewards(self, nodes):
+        """{node: {'node', 'game_mode', 'rotations'}} for world-state node names; {} without reward tables."""
+        with self._lock:
+            # (Re)load when the reward tables change on disk (update_cache.py refreshes them daily)
+            mtime = node_rewards.rewards_mtime()
+            if self._nodes is False or self._nodes_mtime != mtime:
+                with REGISTRY.timed('nodes.index'):
+                    self._nodes, self._nodes_mtime = node_rewards.load_index(), mtime
+            index = self._nodes
+        return index.lookup(nodes) if index else {}
+
+    def baro_history(self, query, key=None):
+        """[{'item', 'last_seen', 'visits'}] for Baro items matching query, newest first (snapshot history)."""
+        stream = self.streams.get(key or self.active)
+        if not stream:
+            return []
+        return [{'item': item, 'last_seen': last_seen, 'visits': visits}
+                for item, last_seen, visits in stream.snapshots.baro_last_seen(query)]
+
+    def fissure_history(self, tier, mission_type, steel_path=False, key=None):
+        """{'count', 'per_day', 'last_seen'} for one fissure kind (snapshot history)."""
+        stream = self.streams.get(key or self.active)
+        count, per_day, last_seen = stream.snapshots.fissure_frequency(tier, mission_type, steel_path) if stream else (0, 0.0, None)
+        return {'count': count, 'per_day': round(per_day, 3), 'last_seen': last_seen}
+
+    def lookup_price(self, query):
+        """Market price lookup only (structured, see WarframeAPI.lookup_market_price)."""
+        return WarframeAPI.lookup_market_price(query)
@@ -0,0 +1,100 @@
+"""Client for a shared engine daemon (engine_server.py).
+
+RemoteEngine mirrors the DataEngine methods the overlay uses, so the controller
+can run against either without caring which.
+"""
+import time
+from urllib.parse import quote
+import http_client
+
+class RemoteEngine:
+    TIMEOUT = 30
+
+    def __init__(self, base_url, streams=None):
+        self.base_url = base_url.rstrip('/')
+        # key -> latest state; entries may be "ps4/en" or {"stream": "ps4/en", ...} (the daemon owns schedules)
+        keys = [s.get('stream', 'pc/en') if isinstance(s, dict) else s for s in streams or ['pc/en']]
+        self.streams = {key: None for key in keys}
+        self.active = next(iter(self.streams))
+        self.last_fetch_time = 0
+
+    def _get(self, path):
+        resp = http_client.get(f"{self.base_url}{path}", timeout=self.TIMEOUT)
+        if resp.status_code != 200:
+            return None
+        return resp.json()
+
+    def _fetch(self, key):
+        try:
+            self.streams[key] = self._get(f"/worldstate?stream={quote(key)}")
+        except Exception as e:
+            print(f"Engine daemon unavailable: {e}")
+            self.streams[key] = None
+        return self.streams[key]
+
+    def add_stream(self, key):
+        self.streams.setdefault(key, None)
+        return key
+
+    def set_active(self, key):
+        self.add_stream(key)
+        self.active = key
+        return self.streams[key] or self._fetch(key)
+
+    def add_listener(self, callback):
+        pass # The daemon handles push itself; we read its copy on our poll schedule
+
+    def get_world_state(self, key=None):
+        return self.streams.get(key or self.active)
+
+    def warm_start(self):
+        return self._fetch(self.active)
+
+    def refresh_streams(self, force=False):
+        # The daemon polls upstream on its own schedule (and concurrently); we just read its latest copies
+        self.last_fetch_time = time.time()
+        return {key: self._fetch(key) for key in list(self.streams)}
+
+    def refresh_world_state(self):
+        return self.refresh_streams()[self.active]
+
+    def search(self, query):
+        result = self._get(f"/search?q={quote(query)}")
+        if result is None:
+            raise RuntimeError("Engine daemon search failed")
+        return result
+
+    def search_offline(self, query):
+        try:
+            return self._get(f"/search?q={quote(query)}&offline=1")
+        except Exception:
+            return None
+
+    def quick_price(self, text):
+        return self._get(f"/quickprice?q={quote(text)}")
+
+    def refresh_price(self, name):
+        return self._get(f"/quickprice?q={quote(name)}&refresh=1")
+
+    def best_relics(self, tiers, refinement='Radiant', squad=4, count=3):
+        tier_params = ''.join(f"&tier={quote(t)}" for t in tiers)
+        return self._get(f"/relics?refinement={quote(refinement)}&squad={squad}&count={count}{tier_params}") or {}
+
+    def baro_history(self, query, key=None):
+        stream = f"&stream={quote(key)}" if key else ''
+        return self._get(f"/history/baro?q={quote(query)}{stream}") or []
+
+    def fissure_history(self, tier, mission_type, steel_path=False, key=None):
+        stream = f"&stream={quote(key)}" if key else ''
+        return self._get(f"/history/fissures?tier={quote(tier)}&mission={quote(mission_type)}&sp={int(steel_path)}{stream}") \
+            or {'count': 0, 'per_day': 0.0, 'last_seen': None}
+
+    def node_rewards(self, nodes):
+        node_params = '&'.join(f"node={quote(n)}" for n in nodes)
+        return self._get(f"/nodes?{node_params}") or {}
+
+    def lookup_price(self, query):
+        return self._get(f"/price?q={quote(query)}")
+
+    def stop(self):
+        pass
@@ -0,0 +1,160 @@
+"""Local JSON API over a shared DataEngine.
+
+Run one daemon and point any number of overlays (config "engine_url") or scripts at it,
+so they share one world-state poller and one response cache:
+
+    python src/engine_server.py --port 8765 --streams pc/en ps4/en
+
+Endpoints (GET, JSON):
+    /health              poller status
+    /streams             tracked platform/language streams
+    /worldstate          latest raw world state (?stream=ps4/en; unknown streams start being polled,
+                         up to --max-streams in total; 400 for an invalid key)
+    /search?q=<item>     full search result (summary HTML, build URL, price)
+                         (&offline=1: answer from the offline bundle only; 404 if not bundled)
+    /price?q=<item>      structured market price lookup
+    /quickprice?q=<text> cached price + ducats for free text, no upstream calls (&refresh=1 refetches the price)
+    /relics?tier=Axi     best relics per fissure tier (&refinement=, &squad=, &count=)
+    /nodes?node=<node>   reward tables for world-state nodes (repeat node=)
+    /history/baro?q=<item>
+                         when Baro last carried matching items, and on how many visits
+    /history/fissures?tier=Axi&mission=Survival&sp=1
+                         how often a fissure kind appeared (count, per day, last seen)
+                         (both read the snapshot history; &stream=ps4/en for another tracked stream)
+"""
+import argparse
+import json
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import parse_pool
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_STREAMS = 8 # Every tracked stream is polled until the daemon exits
+
+class EngineRequestHandler(BaseHTTPRequestHandler):
+    engine = None # Set by make_server()
+    max_streams = MAX_STREAMS
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        query = params.get('q', [''])[0].strip()
+
+        try:
+            if parsed.path == '/health':
+                self.send_json({'ok': True, 'last_fetch': self.engine.last_fetch_time, 'now': time.time(),
+                                'streams': {k: s.last_fetch_time for k, s in self.engine.streams.items()}})
+            elif parsed.path == '/streams':
+                self.send_json({'active': self.engine.active, 'streams': list(self.engine.streams)})
+            elif parsed.path == '/worldstate':
+                try:
+                    key = self.stream_param(params)
+                except ValueError as e:
+                    return self.send_json({'error': str(e)}, 400)
+                if key and key not in self.engine.streams:
+                    if len(self.engine.streams) >= self.max_streams:
+                        return self.send_json({'error': f"Stream limit reached ({self.max_streams})"}, 403)
+                    key = self.engine.add_stream(key)
+                    self.engine.refresh_streams()
+                state = self.engine.get_world_state(key)
+                if state is None:
+                    self.send_json({'error': 'World state not available yet'}, 503)
+                else:
+                    self.send_json(state)
+            elif parsed.path == '/search' and query and params.get('offline'):
+                result = self.engine.search_offline(query)
+                if result is None:
+                    self.send_json({'error': 'Not in offline bundle'}, 404)
+                else:
+                    self.send_json(result)
+            elif parsed.path == '/search' and query:
+                self.send_json(self.engine.search(query))
+            elif parsed.path == '/quickprice' and query:
+                if params.get('refresh'):
+                    self.send_json(self.engine.refresh_price(query))
+                else:
+                    self.send_json(self.engine.quick_price(query))
+            elif parsed.path == '/relics':
+                refinement = params.get('refinement', ['Radiant'])[0]
+                squad = int(params.get('squad', ['4'])[0])
+                count = int(params.get('count', ['3'])[0])
+                self.send_json(self.engine.best_relics(params.get('tier', []), refinement, squad, count))
+            elif parsed.path == '/nodes':
+                self.send_json(self.engine.node_rewards(params.get('node', [])))
+            elif parsed.path.startswith('/history/'):
+                try:
+                    key = self.stream_param(params)
+                except ValueError as e:
+                    return self.send_json({'error': str(e)}, 400)
+                if key and key not in self.engine.streams:
+                    return self.send_json({'error': f"Stream '{key}' is not tracked"}, 404)
+                if parsed.path == '/history/baro' and query:
+                    self.send_json(self.engine.baro_history(query, key))
+                elif parsed.path == '/history/fissures' and params.get('tier') and params.get('mission'):
+                    self.send_json(self.engine.fissure_history(params['tier'][0], params['mission'][0],
+                                                               params.get('sp', ['0'])[0] not in ('', '0'), key))
+                else:
+                    self.send_json({'error': 'Not found'}, 404)
+            elif parsed.path == '/price' and query:
+                self.send_json(self.engine.lookup_price(query))
+            else:
+                self.send_json({'error': 'Not found'}, 404)
+        except Exception as e:
+            self.send_json({'error': str(e)}, 500)
+
+    def stream_param(self, params):
+        """Normalised ?stream= key ('PS4' -> 'ps4/en'), or None; ValueError if invalid."""
+        key = params.get('stream', [None])[0]
+        if not key:
+            return None
+        from engine import parse_stream_key # Already loaded by main(); see the import note there
+        return '/'.join(parse_stream_key(key))
+
+    def send_json(self, obj, status=200):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Keep the console quiet; errors are reported in responses
+
+def make_server(engine, host=DEFAULT_HOST, port=DEFAULT_PORT, max_streams=MAX_STREAMS):
+    handler = type('BoundEngineRequestHandler', (EngineRequestHandler,), {'engine': engine, 'max_streams': max_streams})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PyFrame headless data engine")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--streams', nargs='*', default=None, help="platform/language streams to poll (default: pc/en)")
+    parser.add_argument('--push-url', help="World-state push feed URL template ({platform}, {language}); polling is the fallback")
+    parser.add_argument('--max-streams', type=int, default=MAX_STREAMS, help="Cap on streams clients can make the daemon track (default: %(default)s)")
+    parser.add_argument('--no-poll', action='store_true', help="Serve the last snapshot only; don't poll upstream")
+    args = parser.parse_args(argv)
+
+    # Imported here, not at the top: parse-pool workers re-run this script's top level
+    from engine import DataEngine
+    engine = DataEngine(streams=args.streams, push_url=args.push_url)
+    engine.warm_start()
+    parse_pool.warm_up()
+    if not args.no_poll:
+        engine.start_polling()
+
+    server = make_server(engine, args.host, args.port, args.max_streams)
+    print(f"PyFrame engine listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+        parse_pool.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
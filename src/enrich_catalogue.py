@@ -0,0 +1,134 @@
+"""Enrich the Overframe catalogue with per-item metadata (category, mastery rank, image).
+
+update_cache.py only knows what the sitemap says (id, slug, name, URL, lastmod). This
+crawls each item's page - concurrently, with its own rate limit and circuit breaker so
+searches keep their share of Overframe - and stores the metadata in the catalogue entry together with the
+sitemap lastmod it was fetched at:
+
+    "volt prime": {..., "lastmod": "2026-01-10", "category": "Warframe", "mastery": 0,
+                   "image": "https://...", "enriched": "2026-01-10", "enriched_at": 1767..}
+
+Only items whose lastmod changed since (or that were never enriched) are fetched.
+Progress is checkpointed to the catalogue every few seconds, so an interrupted crawl
+resumes where it stopped.
+
+    python src/enrich_catalogue.py            # enrich new/changed items
+    python src/enrich_catalogue.py --force    # re-crawl everything
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fileio import atomic_write_json, load_json
+import html_parse
+import http_client
+from update_cache import CACHE_FILE, HEADERS
+
+CRAWL_WORKERS = 8
+CRAWL_RATE = 5.0 # Overframe item pages per second: ~2,500 items in about 8 minutes
+CHECKPOINT_SECONDS = 10
+# The crawl trips its own breaker, so a walled crawl doesn't skip Overframe for searches
+CRAWL_CIRCUIT = 'overframe.gg (crawl)'
+# Items without a sitemap lastmod are re-crawled after this long
+REFRESH_SECONDS = 30 * 24 * 60 * 60
+
+def is_due(item, now):
+    """True if the item's metadata is missing or older than its sitemap lastmod."""
+    if 'enriched_at' not in item:
+        return True
+    if item.get('lastmod'):
+        return item.get('enriched') != item['lastmod']
+    return now - item['enriched_at'] > REFRESH_SECONDS
+
+def _fetch_meta(item, limiter, stop):
+    if stop.is_set():
+        return None
+    if limiter:
+        limiter.acquire()
+    if stop.is_set():
+        return None
+    resp = http_client.get(item['url'], headers=HEADERS, retries=1, timeout=(5, 20), circuit=CRAWL_CIRCUIT)
+    if resp.status_code != 200:
+        raise RuntimeError(f"HTTP {resp.status_code}")
+    return html_parse.item_meta(resp.content)
+
+def enrich_catalogue(force=False, workers=CRAWL_WORKERS, rate=CRAWL_RATE, progress=None, stop=None, path=CACHE_FILE):
+    """Fetch metadata for every due catalogue item. Returns {'due', 'enriched', 'failed', 'stopped'}.
+
+    progress(done, total) is called as items finish; setting `stop` (threading.Event)
+    ends the crawl early, keeping what was fetched so far.
+    """
+    catalogue = load_json(path, {}) or {}
+    now = time.time()
+    due = [key for key, item in catalogue.items() if item and item.get('url') and (force or is_due(item, now))]
+    report = {'due': len(due), 'enriched': 0, 'failed': 0, 'stopped': False}
+    if not due:
+        return report
+
+    stop = stop or threading.Event()
+    limiter = http_client.RateLimiter(rate) if rate else None
+    dirty = False
+    last_checkpoint = time.monotonic()
+
+    # 1. Crawl with bounded concurrency; results are merged here, on one thread
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="CatalogueCrawl")
+    futures = {}
+    try:
+        futures = {pool.submit(_fetch_meta, catalogue[key], limiter, stop): key for key in due}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                meta = future.result()
+            except http_client.CircuitOpenError:
+                # Overframe is walling or failing us; stop now and resume next run
+                report['failed'] += 1
+                stop.set()
+                continue
+            except Exception as e:
+                report['failed'] += 1
+                print(f"Enrich {key} failed: {e}")
+                continue
+            if meta is None:
+                continue # Stopped before it was fetched
+
+            item = catalogue[key]
+            item.update(meta, enriched=item.get('lastmod'), enriched_at=time.time())
+            report['enriched'] += 1
+            dirty = True
+            if progress:
+                progress(done, len(due))
+
+            # 2. Checkpoint, so an interrupted crawl doesn't start over
+            if time.monotonic() - last_checkpoint > CHECKPOINT_SECONDS:
+                atomic_write_json(path, catalogue, indent=2)
+                dirty = False
+                last_checkpoint = time.monotonic()
+    finally:
+        report['stopped'] = stop.is_set()
+        # Queued items return immediately once stop is set (also on Ctrl+C); cancel them
+        # by hand rather than shutdown(cancel_futures=True), which needs Python 3.9
+        stop.set()
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=True)
+        if dirty:
+            atomic_write_json(path, catalogue, indent=2)
+
+    print(f"Catalogue metadata: {report['enriched']}/{report['due']} items enriched, {report['failed']} failed"
+          f"{' (stopped early; resumes next run)' if report['stopped'] else ''}")
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich the Overframe catalogue with item metadata")
+    parser.add_argument('--force', action='store_true', help="Re-crawl every item, not just new/changed ones")
+    parser.add_argument('-w', '--workers', type=int, default=CRAWL_WORKERS)
+    parser.add_argument('--rate', type=float, default=CRAWL_RATE, help="Item pages per second")
+    args = parser.parse_args(argv)
+
+    report = enrich_catalogue(force=args.force, workers=args.workers, rate=args.rate,
+                              progress=lambda done, total: print(f"\r{done}/{total}", end='', file=sys.stderr, flush=True))
+    return 1 if report['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
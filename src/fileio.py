@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+
+# Optional fast decoder (pip install orjson); same results as json.loads, several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Decode JSON from bytes or str, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def atomic_write_bytes(path, data):
+    """Write bytes to path via a temp file in the same directory + rename.
+
+    Readers never see a half-written file: either the old content or the new.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave temp files lying around on failure
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, obj, indent=None):
+    """Serialise obj as JSON and write it atomically."""
+    atomic_write_bytes(path, json.dumps(obj, indent=indent).encode('utf-8'))
+
+
+def load_json(path, default=None):
+    """Load JSON from path, returning default if missing or unreadable."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except Exception as e:
+        print(f"Failed to load {os.path.basename(path)}: {e}")
+        return default
@@ -0,0 +1,71 @@
+"""Per-update index of active fissures for instant filtering.
+
+The fissure list is sorted and bucketed once per world-state update; filter presets
+are answered by intersecting buckets (and memoised) instead of re-scanning and
+re-sorting every second.
+
+Presets are dicts; every key is optional and omitted keys don't filter:
+    {"name": "Axi SP Capture", "tier": ["Axi"], "missionType": ["Capture"], "steel_path": true}
+Supported keys: tier, missionType, enemy (lists), steel_path, storm (bools).
+"""
+
+TIER_ORDER = {'Lith': 1, 'Meso': 2, 'Neo': 3, 'Axi': 4, 'Requiem': 5, 'Omnia': 6}
+
+# Preset key -> Fissure attribute (see world_model.py)
+LIST_FACETS = {'tier': 'tier', 'missionType': 'mission_type', 'enemy': 'enemy'}
+BOOL_FACETS = {'steel_path': 'is_hard', 'storm': 'is_storm'}
+
+BUILTIN_PRESETS = [
+    {"name": "All"},
+    {"name": "Normal", "steel_path": False, "storm": False},
+    {"name": "Steel Path", "steel_path": True},
+    {"name": "Void Storms", "storm": True},
+]
+
+class FissureIndex:
+    def __init__(self, fissures=()):
+        # Sort once per update: by tier, then expiry (same order the tab has always used)
+        self.fissures = sorted(
+            (f for f in fissures if f.expiry),
+            key=lambda f: (TIER_ORDER.get(f.tier, 99), f.expiry))
+        self.buckets = {}
+        for pos, f in enumerate(self.fissures):
+            for facet, field in LIST_FACETS.items():
+                self.buckets.setdefault((facet, getattr(f, field)), []).append(pos)
+            for facet, field in BOOL_FACETS.items():
+                self.buckets.setdefault((facet, bool(getattr(f, field))), []).append(pos)
+        self._memo = {}
+
+    @staticmethod
+    def _preset_key(preset):
+        return tuple(sorted((k, tuple(v) if isinstance(v, list) else v)
+                            for k, v in preset.items() if k in LIST_FACETS or k in BOOL_FACETS))
+
+    def query(self, preset):
+        """Return the fissures matching preset, in display order."""
+        key = self._preset_key(preset)
+        if key in self._memo:
+            return self._memo[key]
+
+        selected = None
+        for facet, value in key:
+            if facet in LIST_FACETS:
+                positions = set()
+                for v in value:
+                    positions.update(self.buckets.get((facet, v), ()))
+            else:
+                positions = set(self.buckets.get((facet, bool(value)), ()))
+            selected = positions if selected is None else selected & positions
+            if not selected:
+                break
+
+        if selected is None:
+            result = self.fissures
+        else:
+            result = [self.fissures[pos] for pos in sorted(selected)]
+        self._memo[key] = result
+        return result
+
+    def facet_values(self, facet):
+        """Distinct values present for a list facet (for building filter UIs)."""
+        return sorted({v for (f, v) in self.buckets if f == facet and v is not None})
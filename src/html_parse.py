@@ -0,0 +1,168 @@
+"""Pure page parsers: raw response bytes in, compact results out.
+
+No network, Qt or shared state, so parse_pool.py can run them in worker processes
+and only the small extracted results cross back to the UI process.
+"""
+import re
+from bs4 import BeautifulSoup
+from fileio import loads
+
+def build_links(html):
+    """Overframe item page -> build page paths, in page order (top rated first)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    # Look for links starting with /build/
+    return [a['href'] for a in soup.find_all('a', href=True)
+            if a['href'].startswith('/build/') and '/new/' not in a['href']]
+
+def parse_build(html):
+    """Overframe build page -> {'mods': [...], 'arcanes': [...], 'stats': [(label, value)]}."""
+    soup = BeautifulSoup(html, 'html.parser')
+    mods = []
+    arcanes = []
+    stats = []
+
+    # 1. Mods (Pattern: div class*=Mod_container__ -> p class*=Mod_name__)
+    # Capturing metadata for improved display
+    for mc in soup.find_all('div', class_=re.compile(r'Mod_container__')):
+        mod_data = {'name': 'Unknown', 'cost': '', 'polarity': '', 'rarity': 'common'}
+
+        # Name
+        name_tag = mc.find(class_=re.compile(r'Mod_name__'))
+        if name_tag:
+            mod_data['name'] = name_tag.get_text(strip=True)
+
+        # Image
+        img_tag = mc.find('img')
+        if img_tag:
+            mod_data['image_url'] = img_tag.get('src')
+
+        # Drain
+        drain_tag = mc.find(class_=re.compile(r'Mod_drain__'))
+        if drain_tag:
+            mod_data['cost'] = drain_tag.get_text(strip=True)
+
+        # Polarity (icon class usually)
+        # Look for <i class="wfic ...">
+        polarity_icon = mc.find('i', class_=re.compile(r'Mod_polarity__'))
+        if polarity_icon:
+            for c in polarity_icon.get('class', []):
+                if c.startswith('wfic-AP_'):
+                    mod_data['polarity'] = c.replace('wfic-AP_', '').title()
+
+        # Rarity (from container class)
+        # Mod_rare__McUwv, Mod_common__..., Mod_uncommon__..., Mod_legendary__...
+        container_classes = mc.find('div', class_=re.compile(r'Mod_mod__'))
+        if container_classes:
+            for c in container_classes.get('class', []):
+                if 'rare' in c: mod_data['rarity'] = 'gold'
+                elif 'common' in c: mod_data['rarity'] = 'brown' # Bronzeish
+                elif 'uncommon' in c: mod_data['rarity'] = 'silver'
+                elif 'legendary' in c: mod_data['rarity'] = 'white' # Primed
+                elif 'requiem' in c: mod_data['rarity'] = 'red'
+
+        if mod_data['name'] != 'Unknown':
+            mods.append(mod_data)
+
+    # 2. Arcanes
+    for ac in soup.find_all('div', class_=re.compile(r'ArcaneMod_arcaneMod__')):
+        name_tag = ac.find(class_=re.compile(r'ArcaneMod_name__'))
+        if name_tag:
+            # Try to detect rarity too
+            rarity = 'silver'
+            for c in ac.get('class', []):
+                if 'rare' in c: rarity = 'gold'
+                elif 'legendary' in c: rarity = 'white'
+            arcanes.append({'name': name_tag.get_text(strip=True), 'rarity': rarity})
+
+    # 3. Stats
+    for sc in soup.find_all('div', class_=re.compile(r'TitleStat_titleStat__')):
+        label = sc.find('dt')
+        value = sc.find('dd')
+        if label and value:
+            stats.append((label.get_text(strip=True), value.get_text(strip=True)))
+
+    # Deduplicate preserving order; standard build size
+    seen = set()
+    unique_mods = []
+    for m in mods:
+        if m['name'] not in seen:
+            unique_mods.append(m)
+            seen.add(m['name'])
+
+    return {'mods': unique_mods[:10], 'arcanes': arcanes, 'stats': stats}
+
+def wiki_summary(payload):
+    """MediaWiki parse API response -> {'error': info} or {'found': bool, 'text': first real paragraph or None}."""
+    data = loads(payload)
+    if 'error' in data:
+        return {'error': data['error'].get('info', 'Page not found')}
+
+    html_content = data.get('parse', {}).get('text', {}).get('*', '')
+    if not html_content:
+        return {'found': False, 'text': None}
+
+    # Find the first paragraph that isn't a likely warning/box
+    # Usually the first <p> after some infoboxes
+    for p in BeautifulSoup(html_content, 'html.parser').find_all('p'):
+        # Use separator to avoid "Volthas" (merging valid tags without space)
+        text = p.get_text(separator=' ', strip=True)
+        # Filter out short/empty paragraphs or Update notes
+        if len(text) > 50 and "Update" not in text:
+            return {'found': True, 'text': text}
+    return {'found': True, 'text': None}
+
+# Item pages are Next.js: the item record is embedded as JSON, no DOM walk needed.
+# The key names below are best guesses, not checked against a recorded live page (the
+# replay fixture's __NEXT_DATA__ is hand-written); anything not found comes back None,
+# and og:image is the fallback for the image.
+NEXT_DATA = re.compile(rb'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.S)
+OG_IMAGE = re.compile(rb'<meta\s(?=[^>]*property=["\']og:image["\'])[^>]*content=["\']([^"\']+)', re.I)
+CATEGORY_KEYS = ('category', 'tag', 'type')
+MASTERY_KEYS = ('mastery_req', 'masteryReq', 'mastery_rank', 'mastery')
+IMAGE_KEYS = ('icon', 'image', 'image_url', 'imageName')
+
+def _item_record(node, depth=0):
+    """First dict under pageProps that looks like an item (a name plus a category)."""
+    if isinstance(node, dict):
+        if 'name' in node and any(k in node for k in CATEGORY_KEYS):
+            return node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    if depth < 4:
+        for child in children:
+            found = _item_record(child, depth + 1)
+            if found:
+                return found
+    return None
+
+def _first(record, keys):
+    for key in keys:
+        if record.get(key) not in (None, ''):
+            return record[key]
+    return None
+
+def item_meta(html):
+    """Overframe item page -> {'category', 'mastery', 'image'} (None where the page doesn't say)."""
+    record = {}
+    m = NEXT_DATA.search(html)
+    if m:
+        try:
+            record = _item_record(loads(m.group(1)).get('props', {}).get('pageProps', {})) or {}
+        except ValueError:
+            pass
+    category = _first(record, CATEGORY_KEYS)
+    mastery = _first(record, MASTERY_KEYS)
+    image = _first(record, IMAGE_KEYS)
+    if not isinstance(image, str):
+        og = OG_IMAGE.search(html)
+        image = og.group(1).decode('utf-8', 'replace') if og else None
+    if image and image.startswith('/'):
+        image = f"https://overframe.gg{image}"
+    return {
+        'category': category if isinstance(category, str) else None,
+        'mastery': int(mastery) if isinstance(mastery, (int, float)) or str(mastery).isdigit() else None,
+        'image': image,
+    }
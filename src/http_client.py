@@ -0,0 +1,361 @@
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from fileio import atomic_write_json, load_json, loads
+from metrics import REGISTRY
+
+# One pooled session for every client (keep-alive, shared connection pools)
+SESSION = requests.Session()
+POOL_SIZE = 16
+SESSION.mount('https://', HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+SESSION.mount('http://', HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+
+# Requests per second allowed per upstream host (only network requests count, not cache hits)
+HOST_RATE_LIMITS = {
+    'api.warframe.market': 3.0,
+}
+
+# (connect, read) seconds for every request that doesn't pass its own timeout
+DEFAULT_TIMEOUT = (5, 10)
+
+# Per-host circuit breaker: this many consecutive failures (errors, 5xx, 403/429 walls,
+# or answers slower than BREAKER_SLOW_SECONDS) open the circuit for BREAKER_COOLDOWN_SECONDS.
+# While open, requests to that host are answered from the cache (even expired entries) or
+# fail immediately with CircuitOpenError; after the cooldown one trial request is let through.
+BREAKER_FAILURES = 3
+BREAKER_SLOW_SECONDS = 8.0
+BREAKER_COOLDOWN_SECONDS = 30.0
+BREAKER_FAILURE_STATUS = (403, 429)
+
+# Redirect every upstream to a stand-in server (benchmarks / offline testing):
+# with PYFRAME_UPSTREAM_OVERRIDE=http://127.0.0.1:8099, a request for
+# https://api.warframestat.us/pc/ goes to http://127.0.0.1:8099/api.warframestat.us/pc/
+UPSTREAM_OVERRIDE = os.environ.get('PYFRAME_UPSTREAM_OVERRIDE', '')
+
+# Statuses worth remembering: hits, and "doesn't exist" answers to name probes
+CACHEABLE_STATUS = (200, 404)
+MAX_CACHE_ENTRIES = 512
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response that can live in the cache."""
+    __slots__ = ('url', 'status_code', 'content', 'headers', 'from_cache')
+
+    def __init__(self, url, status_code, content, headers, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return loads(self.content)
+
+class ResponseCache:
+    """Thread-safe LRU of responses with a per-entry expiry."""
+
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # url -> (expires_at, CachedResponse)
+        self._lock = threading.Lock()
+
+    def get(self, url, allow_stale=False):
+        """Cached response for url; expired entries only with allow_stale (they stay until evicted)."""
+        with self._lock:
+            hit = self._entries.get(url)
+            if not hit:
+                return None
+            expires_at, resp = hit
+            if expires_at < time.time() and not allow_stale:
+                return None
+            self._entries.move_to_end(url)
+            return resp
+
+    def put(self, url, resp, ttl):
+        with self._lock:
+            self._entries[url] = (time.time() + ttl, resp)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_fresh(self, url):
+        with self._lock:
+            hit = self._entries.get(url)
+            return bool(hit and hit[0] >= time.time())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path):
+        """Persist unexpired entries (used by the CLI tools between runs)."""
+        now = time.time()
+        with self._lock:
+            entries = [[url, exp, r.status_code, base64.b64encode(r.content).decode('ascii'), r.headers]
+                       for url, (exp, r) in self._entries.items() if exp > now]
+        atomic_write_json(path, entries)
+
+    def load(self, path):
+        now = time.time()
+        for url, exp, status, content, headers in load_json(path, []) or []:
+            if exp > now:
+                with self._lock:
+                    self._entries[url] = (exp, CachedResponse(url, status, base64.b64decode(content), headers))
+
+CACHE = ResponseCache()
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` acquisitions per second, bursting to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+_limiters = {host: RateLimiter(rate) for host, rate in HOST_RATE_LIMITS.items()}
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a host whose circuit is open (and nothing is cached)."""
+
+class CircuitBreaker:
+    """Thread-safe closed -> open -> half-open breaker for one host (see BREAKER_* above)."""
+
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN_SECONDS):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._consecutive = 0
+        self._opened_at = None # None while closed
+        self._trial = False    # a half-open trial request is in flight
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            return 'half-open' if time.monotonic() - self._opened_at >= self.cooldown else 'open'
+
+    def allow(self):
+        """True if a request may go out now (closed, or the one half-open trial)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record(self, ok):
+        """Record a request outcome; returns True if this opened the circuit."""
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._consecutive = 0
+                self._opened_at = None
+                return False
+            self._consecutive += 1
+            if self._opened_at is not None or self._consecutive >= self.failures:
+                # A failed trial (or the threshold) (re)opens for another cooldown
+                tripped = self._opened_at is None
+                self._opened_at = time.monotonic()
+                return tripped
+            return False
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def breaker(host):
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+def reset_breakers():
+    """Close every circuit (tests / benchmarks)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+def breaker_states():
+    """host -> 'closed' / 'open' / 'half-open' for every host seen so far."""
+    with _breakers_lock:
+        return {host: b.state for host, b in _breakers.items()}
+
+def set_upstream_override(base_url):
+    """Route all requests to base_url/<original host>/<path> ('' to disable)."""
+    global UPSTREAM_OVERRIDE
+    UPSTREAM_OVERRIDE = base_url.rstrip('/')
+
+def _route(url):
+    """Return (network_url, host) for url, applying UPSTREAM_OVERRIDE."""
+    parsed = urlparse(url)
+    # Local services (the engine daemon) are never upstreams
+    if not UPSTREAM_OVERRIDE or url.startswith(UPSTREAM_OVERRIDE) or parsed.hostname in ('127.0.0.1', 'localhost'):
+        return url, parsed.hostname
+    rest = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    return f"{UPSTREAM_OVERRIDE}/{parsed.hostname}{rest}", None
+
+class _Flight:
+    """One in-flight network request that concurrent identical callers wait on."""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+_inflight = {} # request key -> _Flight
+_inflight_lock = threading.Lock()
+
+def request_key(url, headers=None):
+    """Normalised identity of a GET: scheme/host case and query order don't matter, headers do."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalised = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+    return normalised, tuple(sorted((k.lower(), v) for k, v in (headers or {}).items()))
+
+def _single_flight(url, key, fetch):
+    """Run fetch() once for every concurrent caller with the same key; all get its result (or error)."""
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+    if not leader:
+        REGISTRY.record_shared(url)
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    try:
+        flight.result = fetch()
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        flight.done.set()
+
+def _short_circuit(url):
+    """Answer for a host whose circuit is open: any cached copy, else CircuitOpenError."""
+    REGISTRY.record_breaker(url, 'short_circuit')
+    cached = CACHE.get(url, allow_stale=True)
+    if cached:
+        return CachedResponse(cached.url, cached.status_code, cached.content, cached.headers, from_cache=True)
+    raise CircuitOpenError(f"Circuit open for {urlparse(url).hostname}")
+
+def get(url, headers=None, ttl=0, retries=0, circuit=None, **kwargs):
+    """GET through the shared session, serving from / storing into the response cache.
+
+    ttl is in seconds; 0 disables caching (e.g. for the world-state poll).
+    retries re-sends on connection errors and 5xx answers.
+    Requests time out after DEFAULT_TIMEOUT unless a timeout is passed, and go through
+    the host's circuit breaker (local services excepted); pass `circuit` to use a breaker of
+    its own instead, so background traffic tripping it doesn't cut off the host's searches.
+    Concurrent identical requests (same request_key) share one network call.
+    Every call is recorded in metrics.REGISTRY.
+    """
+    if ttl:
+        cached = CACHE.get(url)
+        if cached:
+            REGISTRY.record_request(url, cached.status_code, 0, from_cache=True)
+            return CachedResponse(cached.url, cached.status_code, cached.content, cached.headers, from_cache=True)
+    return _single_flight(url, request_key(url, headers), lambda: _fetch(url, headers, ttl, retries, circuit, kwargs))
+
+def _fetch(url, headers, ttl, retries, circuit, kwargs):
+    """The network part of get(): breaker, rate limit, retries, then the response cache."""
+    # Upstream politeness limits don't apply to a local stand-in server
+    network_url, host = _route(url)
+    limiter = _limiters.get(host)
+    hostname = urlparse(url).hostname
+    host_breaker = None if hostname in ('127.0.0.1', 'localhost') else breaker(circuit or hostname)
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+    for attempt in range(retries + 1):
+        if host_breaker and not host_breaker.allow():
+            return _short_circuit(url)
+        if attempt:
+            REGISTRY.record_retry(url)
+        if limiter:
+            limiter.acquire()
+
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            r = SESSION.get(network_url, headers=headers, **kwargs)
+        except requests.RequestException:
+            REGISTRY.record_request(url, 'error', (time.perf_counter() - t0) * 1000, start=start)
+            if host_breaker and host_breaker.record(False):
+                REGISTRY.record_breaker(url, 'opened')
+            if attempt < retries:
+                continue
+            raise
+        elapsed = time.perf_counter() - t0
+        resp = CachedResponse(r.url, r.status_code, r.content, dict(r.headers))
+        REGISTRY.record_request(url, r.status_code, elapsed * 1000, len(r.content), start=start)
+        if host_breaker:
+            ok = r.status_code < 500 and r.status_code not in BREAKER_FAILURE_STATUS and elapsed < BREAKER_SLOW_SECONDS
+            if host_breaker.record(ok):
+                REGISTRY.record_breaker(url, 'opened')
+        if r.status_code < 500 or attempt == retries:
+            break
+
+    if ttl and resp.status_code in CACHEABLE_STATUS:
+        CACHE.put(url, resp, ttl)
+    return resp
+
+def stream(url, headers=None, guarded=False, **kwargs):
+    """Open a streaming GET (e.g. server-sent events, a large sitemap); the caller iterates and closes it.
+
+    Not cached, retried or shared between callers; only the connect is recorded in metrics.
+    guarded=True also applies the host's rate limit and circuit breaker, for one-shot
+    downloads (a long-lived feed dropping shouldn't count against its host).
+    """
+    network_url, host = _route(url)
+    hostname = urlparse(url).hostname
+    host_breaker = breaker(hostname) if guarded and hostname not in ('127.0.0.1', 'localhost') else None
+    if host_breaker and not host_breaker.allow():
+        REGISTRY.record_breaker(url, 'short_circuit')
+        raise CircuitOpenError(f"Circuit open for {hostname}")
+    if guarded and host in _limiters:
+        _limiters[host].acquire()
+
+    start = time.time()
+    t0 = time.perf_counter()
+    try:
+        r = SESSION.get(network_url, headers=headers, stream=True, **kwargs)
+    except requests.RequestException:
+        REGISTRY.record_request(url, 'error', (time.perf_counter() - t0) * 1000, start=start)
+        if host_breaker and host_breaker.record(False):
+            REGISTRY.record_breaker(url, 'opened')
+        raise
+    elapsed = time.perf_counter() - t0
+    REGISTRY.record_request(url, r.status_code, elapsed * 1000, start=start)
+    if host_breaker:
+        ok = r.status_code < 500 and r.status_code not in BREAKER_FAILURE_STATUS and elapsed < BREAKER_SLOW_SECONDS
+        if host_breaker.record(ok):
+            REGISTRY.record_breaker(url, 'opened')
+    return r
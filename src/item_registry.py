@@ -0,0 +1,168 @@
+"""One registry of item identities across Overframe, warframe.market, the wiki and warframestat.
+
+Built in bulk from three lists (the Overframe catalogue, the market's item list and
+warframestat's item list) and stored in data/item_registry.json:
+
+    {"built": ts, "items": {"volt prime": {"name": "Volt Prime",
+                                           "overframe": {"id": "...", "slug": "...", "url": "..."},
+                                           "market": "volt_prime_set", "thumb": "items/images/...png",
+                                           "wiki": "Volt_Prime", "unique_name": "/Lotus/Powersuits/...",
+                                           "ducats": 300, "category": "Warframe", "mastery": 0,
+                                           "image": "https://..."},
+                           "volt": {"name": "Volt", ..., "variants": ["Volt Prime"]}},
+     "aliases": {"volt prime set": "volt prime", ...}}
+
+Every lookup is one dictionary hit on the normalised name; clients only fall back to
+guessing identifiers for names the registry doesn't know.
+"""
+import difflib
+import os
+import re
+import time
+from urllib.parse import unquote
+import http_client
+from fileio import atomic_write_json, load_json
+
+REGISTRY_FILE = os.path.join(os.path.dirname(__file__), 'data', 'item_registry.json')
+REFRESH_SECONDS = 24 * 60 * 60
+
+MARKET_ITEMS_URL = "https://api.warframe.market/v1/items"
+WARFRAMESTAT_ITEMS_URL = "https://api.warframestat.us/items/?only=name,uniqueName,wikiaUrl,components&language=en"
+
+# "Kuva Bramma" is a variant of "Bramma", "Volt Prime" of "Volt"
+VARIANT_PREFIXES = ('kuva ', 'tenet ', 'coda ', 'prisma ', 'mk1-', 'rakta ', 'sancti ', 'secura ', 'synoid ', 'telos ', 'vaykor ', 'dex ')
+VARIANT_SUFFIXES = (' prime', ' vandal', ' wraith', ' umbra')
+
+def normalise(name):
+    """'Volt_Prime  Set' / "volt prime set" -> 'volt prime set'."""
+    return ' '.join(name.lower().replace('_', ' ').replace("'", '').split())
+
+def base_name(key):
+    """Normalised name of the item key is a variant of, or None."""
+    for prefix in VARIANT_PREFIXES:
+        if key.startswith(prefix):
+            return key[len(prefix):]
+    for suffix in VARIANT_SUFFIXES:
+        if key.endswith(suffix):
+            return key[:-len(suffix)]
+    return None
+
+def extract_name(text):
+    """Item name in free text: a chat link ("WTS [Volt Prime Set] 100p") or the first line."""
+    text = text.strip()[:200]
+    bracketed = re.search(r'\[([^\]]+)\]', text)
+    if bracketed:
+        return bracketed.group(1).strip()
+    return text.splitlines()[0].strip() if text else ''
+
+def build_registry(overframe, market_items, warframestat_items):
+    """Merge the three item lists into {'items': {...}, 'aliases': {...}}."""
+    items = {}
+    aliases = {}
+
+    def entry(name):
+        return items.setdefault(normalise(name), {'name': name})
+
+    for v in overframe.values():
+        e = entry(v['name'])
+        e['overframe'] = {'id': v.get('id'), 'slug': v.get('slug'), 'url': v.get('url')}
+        # Crawled metadata (enrich_catalogue.py), where known
+        for field in ('category', 'mastery', 'image'):
+            if v.get(field) is not None:
+                e[field] = v[field]
+
+    for it in warframestat_items:
+        if not it.get('name'): continue
+        e = entry(it['name'])
+        e['unique_name'] = it.get('uniqueName')
+        if '/wiki/' in (it.get('wikiaUrl') or ''):
+            e['wiki'] = unquote(it['wikiaUrl'].split('/wiki/', 1)[1])
+        # Prime parts carry ducat values; a set is worth the sum of its parts
+        ducats = 0
+        for comp in it.get('components') or []:
+            if comp.get('ducats'):
+                entry(f"{it['name']} {comp['name']}")['ducats'] = comp['ducats']
+                ducats += comp['ducats'] * comp.get('itemCount', 1)
+        if ducats:
+            e['ducats'] = ducats
+
+    for it in market_items:
+        url_name, item_name = it.get('url_name'), it.get('item_name')
+        if not url_name or not item_name: continue
+        is_set = item_name.endswith(' Set')
+        # Sets are traded under the item's own name ("Volt Prime" -> volt_prime_set)
+        e = entry(item_name[:-4] if is_set else item_name)
+        if is_set or 'market' not in e:
+            e['market'] = url_name
+            e['thumb'] = it.get('thumb')
+        key = normalise(e['name'])
+        aliases[normalise(item_name)] = key
+
+    for key, e in items.items():
+        base = base_name(key)
+        if base in items:
+            items[base].setdefault('variants', []).append(e['name'])
+        if e.get('overframe', {}).get('slug'):
+            aliases.setdefault(normalise(e['overframe']['slug'].replace('-', ' ')), key)
+    # The item's own key always wins over an alias
+    for key in items:
+        aliases.pop(key, None)
+    return {'items': items, 'aliases': aliases}
+
+class ItemRegistry:
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self.items = {}
+        self.aliases = {}
+        self.built = 0
+        self.reload()
+
+    def reload(self):
+        """(Re)load from disk."""
+        data = load_json(self.path, None) or {}
+        self.items = data.get('items', {})
+        self.aliases = data.get('aliases', {})
+        self.built = data.get('built', 0)
+
+    def resolve(self, name):
+        """Registry entry for any known name or alias (market url_names normalise to one); None if unknown."""
+        key = normalise(name)
+        entry = self.items.get(key)
+        if entry is None and key in self.aliases:
+            entry = self.items.get(self.aliases[key])
+        return entry
+
+    def match(self, text):
+        """Best entry for free text (clipboard, chat): bracketed item links first, then close matches."""
+        name = extract_name(text)
+        if not name:
+            return None
+        entry = self.resolve(name)
+        if entry is None:
+            close = difflib.get_close_matches(normalise(name), list(self.items) + list(self.aliases), n=1, cutoff=0.8)
+            if close:
+                entry = self.resolve(close[0])
+        return entry
+
+    def variant(self, entry, suffix):
+        """The entry's variant with the given suffix ('Prime'), if the registry has it."""
+        return self.items.get(normalise(f"{entry['name']} {suffix}"))
+
+    def refresh(self, overframe, force=False):
+        """Rebuild from the upstream lists (at most daily unless forced). Returns True if rebuilt."""
+        if not force and time.time() - self.built < REFRESH_SECONDS:
+            return False
+        try:
+            market = http_client.get(MARKET_ITEMS_URL, headers={'User-Agent': 'Mozilla/5.0', 'Language': 'en'}, retries=1)
+            stat = http_client.get(WARFRAMESTAT_ITEMS_URL, retries=1)
+            if market.status_code != 200 or stat.status_code != 200:
+                print(f"Item registry refresh failed: market {market.status_code}, warframestat {stat.status_code}")
+                return False
+            data = build_registry(overframe, market.json().get('payload', {}).get('items', []), stat.json())
+        except Exception as e:
+            print(f"Item registry refresh failed: {e}")
+            return False
+        data['built'] = time.time()
+        atomic_write_json(self.path, data)
+        self.reload()
+        return True
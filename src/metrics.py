@@ -0,0 +1,184 @@
+"""In-process metrics: request/stage timings, bytes, cache hit rate, retries.
+
+Everything records into the module-level REGISTRY. The overlay's diagnostics tab
+renders REGISTRY.format_html(); export_trace() writes a Chrome trace-event JSON
+(open it in chrome://tracing or https://ui.perfetto.dev).
+"""
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from fileio import atomic_write_json
+
+# Latency histogram bucket upper bounds (ms)
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+MAX_TRACE_EVENTS = 5000
+
+# Collapse per-item URL segments so endpoints aggregate ("/v1/items/*/orders")
+ENDPOINT_PATTERNS = [
+    (re.compile(r'^/v1/items/[^/]+/orders$'), '/v1/items/*/orders'),
+    (re.compile(r'^/v1/items/[^/]+$'), '/v1/items/*'),
+    (re.compile(r'^/items/search/.*'), '/items/search/*'),
+    (re.compile(r'^/items/arsenal/.*'), '/items/arsenal/*'),
+    (re.compile(r'^/build/.*'), '/build/*'),
+    (re.compile(r'^/static/assets/.*'), '/static/assets/*'),
+    (re.compile(r'^/(pc|ps4|xb1|swi)/?$'), '/<platform>/'),
+]
+
+def endpoint_of(url):
+    """Return (host, normalised endpoint) for a URL."""
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    for pattern, name in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return parsed.hostname, name
+    return parsed.hostname, path
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, ms):
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.total += ms
+        self.count += 1
+        self.max = max(self.max, ms)
+
+    def quantile(self, q):
+        """Approximate quantile (bucket upper bound)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= target:
+                return self.max if bound == float('inf') else bound
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 1) if self.count else 0,
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'max_ms': round(self.max, 1),
+            'buckets': {('inf' if b == float('inf') else str(b)): n for b, n in zip(BUCKETS_MS, self.counts)},
+        }
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.requests = defaultdict(Histogram)   # (host, endpoint) -> latency
+            self.stages = defaultdict(Histogram)     # stage name -> duration
+            self.counters = defaultdict(int)         # "<host> bytes", "<host> cache_hit", ...
+            self.status = defaultdict(int)           # "<host> <status>" -> count
+            self.trace = deque(maxlen=MAX_TRACE_EVENTS)
+
+    def _event(self, name, cat, start, ms, args):
+        # Chrome trace "complete" event; timestamps in microseconds
+        self.trace.append({'name': name, 'cat': cat, 'ph': 'X', 'ts': int(start * 1e6),
+                           'dur': int(ms * 1000), 'pid': 1, 'tid': threading.get_ident(), 'args': args})
+
+    def record_request(self, url, status, ms, nbytes=0, from_cache=False, start=None):
+        host, endpoint = endpoint_of(url)
+        with self._lock:
+            if from_cache:
+                self.counters[f"{host} cache_hit"] += 1
+                return
+            self.counters[f"{host} cache_miss"] += 1
+            self.counters[f"{host} bytes"] += nbytes
+            self.status[f"{host} {status}"] += 1
+            self.requests[(host, endpoint)].observe(ms)
+            self._event(f"{host}{endpoint}", 'http', start or time.time() - ms / 1000, ms,
+                        {'status': status, 'bytes': nbytes})
+
+    def record_retry(self, url):
+        host, _ = endpoint_of(url)
+        with self._lock:
+            self.counters[f"{host} retries"] += 1
+
+    def record_breaker(self, url, event):
+        """Circuit breaker events: 'opened' (tripped) or 'short_circuit' (request not sent)."""
+        host, _ = endpoint_of(url)
+        with self._lock:
+            self.counters[f"{host} {event}"] += 1
+
+    def record_shared(self, url):
+        """A request answered by joining an identical one already in flight."""
+        host, _ = endpoint_of(url)
+        with self._lock:
+            self.counters[f"{host} shared"] += 1
+
+    def record_stage(self, stage, ms, start=None, **args):
+        with self._lock:
+            self.stages[stage].observe(ms)
+            self._event(stage, 'stage', start or time.time() - ms / 1000, ms, args)
+
+    @contextmanager
+    def timed(self, stage, **args):
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, (time.perf_counter() - t0) * 1000, start=start, **args)
+
+    def snapshot(self):
+        with self._lock:
+            hosts = defaultdict(dict)
+            for key, value in self.counters.items():
+                host, name = key.rsplit(' ', 1)
+                hosts[host][name] = value
+            for host, data in hosts.items():
+                hits, misses = data.get('cache_hit', 0), data.get('cache_miss', 0)
+                data['cache_hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else 0.0
+            return {
+                'since': self.started,
+                'hosts': dict(hosts),
+                'status': dict(self.status),
+                'requests': {f"{h}{e}": hist.to_dict() for (h, e), hist in self.requests.items()},
+                'stages': {name: hist.to_dict() for name, hist in self.stages.items()},
+            }
+
+    def export_trace(self, path):
+        """Write recorded events + summary as Chrome trace-event JSON."""
+        with self._lock:
+            events = list(self.trace)
+        atomic_write_json(path, {'traceEvents': events, 'displayTimeUnit': 'ms', 'metadata': self.snapshot()})
+
+    def format_html(self):
+        snap = self.snapshot()
+        html = "<b>Upstreams:</b><br><table>"
+        html += "<tr><th>Host</th><th>Hit %</th><th>KB</th><th>Retries</th><th>Shared</th><th>Trips</th><th>Skipped</th></tr>"
+        for host, data in sorted(snap['hosts'].items()):
+            html += (f"<tr><td>{host}</td><td>{data['cache_hit_rate'] * 100:.0f}</td>"
+                     f"<td>{data.get('bytes', 0) // 1024}</td><td>{data.get('retries', 0)}</td>"
+                     f"<td>{data.get('shared', 0)}</td><td>{data.get('opened', 0)}</td><td>{data.get('short_circuit', 0)}</td></tr>")
+        html += "</table><br><b>Endpoints (ms):</b><br><table>"
+        html += "<tr><th>Endpoint</th><th>n</th><th>p50</th><th>p95</th><th>max</th></tr>"
+        for name, h in sorted(snap['requests'].items(), key=lambda kv: -kv[1]['p95_ms']):
+            html += f"<tr><td>{name}</td><td>{h['count']}</td><td>{h['p50_ms']}</td><td>{h['p95_ms']}</td><td>{h['max_ms']}</td></tr>"
+        html += "</table><br><b>Stages (ms):</b><br><table>"
+        html += "<tr><th>Stage</th><th>n</th><th>mean</th><th>p95</th><th>max</th></tr>"
+        for name, h in sorted(snap['stages'].items()):
+            html += f"<tr><td>{name}</td><td>{h['count']}</td><td>{h['mean_ms']}</td><td>{h['p95_ms']}</td><td>{h['max_ms']}</td></tr>"
+        html += "</table>"
+        return html
+
+REGISTRY = MetricsRegistry()
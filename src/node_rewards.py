@@ -0,0 +1,113 @@
+"""Reverse index: mission node -> what drops there.
+
+Built from the drops.warframestat.us mission reward tables, saved to
+data/mission_rewards.json (refreshed daily by update_cache.py). Keys are the node names
+the world state uses ("Saxis (Eris)"), normalised, so fissure and invasion rows join
+against it with a dict lookup - no request per row.
+
+    python src/node_rewards.py --update "Saxis (Eris)" "Mot (Void)"
+"""
+import argparse
+import os
+import sys
+import time
+from fileio import atomic_write_json, load_json
+import http_client
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+REWARDS_FILE = os.path.join(DATA_DIR, 'mission_rewards.json')
+REWARDS_URL = "https://drops.warframestat.us/data/missionRewards.json"
+REWARDS_REFRESH_SECONDS = 24 * 60 * 60
+
+def node_key(node):
+    return ' '.join(node.lower().split())
+
+def _rotations(rewards):
+    """Drop-table rewards (a list, or {"A": [...], ...} for rotations) -> [[rotation, [[item, chance], ...]]], likeliest first."""
+    tables = sorted(rewards.items()) if isinstance(rewards, dict) else [('', rewards or [])]
+    return [[rotation, [[r['itemName'], r.get('chance', 0)]
+                        for r in sorted(items, key=lambda r: -r.get('chance', 0))]]
+            for rotation, items in tables if items]
+
+class NodeRewards:
+    def __init__(self, nodes):
+        self.nodes = nodes # node_key -> {'node', 'game_mode', 'rotations'}
+
+    @classmethod
+    def from_drops(cls, data):
+        """Build from the missionRewards.json payload ({planet: {node: {gameMode, rewards}}})."""
+        nodes = {}
+        for planet, planet_nodes in (data.get('missionRewards') or {}).items():
+            for name, mission in planet_nodes.items():
+                rotations = _rotations(mission.get('rewards'))
+                if not rotations: continue
+                node = f"{name} ({planet})"
+                nodes[node_key(node)] = {'node': node, 'game_mode': mission.get('gameMode', ''), 'rotations': rotations}
+        return cls(nodes)
+
+    def get(self, node):
+        return self.nodes.get(node_key(node)) if node else None
+
+    def lookup(self, nodes):
+        """{node: entry} for the given world-state node names that have reward tables."""
+        found = {}
+        for node in nodes:
+            entry = self.get(node)
+            if entry:
+                found[node] = entry
+        return found
+
+def load_index():
+    """NodeRewards for the saved tables; None if they haven't been downloaded."""
+    data = load_json(REWARDS_FILE, None)
+    if not data:
+        return None
+    try:
+        return NodeRewards.from_drops(data)
+    except Exception as e:
+        print(f"Failed to load mission reward tables: {e}")
+        return None
+
+def rewards_mtime():
+    return os.path.getmtime(REWARDS_FILE) if os.path.exists(REWARDS_FILE) else None
+
+def refresh(force=False):
+    """Download the mission reward tables (at most daily unless forced). Returns True if updated."""
+    if not force and os.path.exists(REWARDS_FILE) and time.time() - os.path.getmtime(REWARDS_FILE) < REWARDS_REFRESH_SECONDS:
+        return False
+    try:
+        resp = http_client.get(REWARDS_URL, retries=1)
+        if resp.status_code != 200:
+            print(f"Mission rewards refresh failed: HTTP {resp.status_code}")
+            return False
+        data = resp.json()
+    except Exception as e:
+        print(f"Mission rewards refresh failed: {e}")
+        return False
+    atomic_write_json(REWARDS_FILE, {'missionRewards': data.get('missionRewards', {})})
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What drops at a mission node")
+    parser.add_argument('node', nargs='+', help='World-state node name, e.g. "Saxis (Eris)"')
+    parser.add_argument('--update', action='store_true', help="Refresh the reward tables first")
+    args = parser.parse_args(argv)
+
+    if args.update:
+        refresh(force=True)
+    index = load_index()
+    if index is None:
+        print("No mission reward tables; run with --update first.", file=sys.stderr)
+        return 1
+    for node in args.node:
+        entry = index.get(node)
+        if not entry:
+            print(f"{node}: no reward table")
+            continue
+        print(f"{entry['node']} ({entry['game_mode']}):")
+        for rotation, items in entry['rotations']:
+            print(f"  {rotation or '-'}: " + ", ".join(f"{item} {chance:g}%" for item, chance in items))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
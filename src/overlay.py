@@ -1,14 +1,19 @@
 import sys
 import ctypes
-from ctypes import c_int, byref, sizeof, Structure, c_void_p, windll, POINTER
+from ctypes import c_int, byref, sizeof, Structure, c_void_p, POINTER
 from ctypes.wintypes import HWND, DWORD, ULONG
-from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget, QLineEdit, QScrollArea, QFrame, QTabWidget, QTextEdit, QTextBrowser, QHBoxLayout, QPushButton, QCompleter
+from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget, QLineEdit, QScrollArea, QFrame, QTabWidget, QTextEdit, QTextBrowser, QHBoxLayout, QPushButton, QCompleter, QComboBox
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import Qt, QPoint, pyqtSignal, QUrl, QStringListModel
-from PyQt6.QtGui import QScreen
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import Qt, QPoint, pyqtSignal, QUrl, QStringListModel, QTimer
+from PyQt6.QtGui import QScreen, QPixmapCache, QCursor
+from urllib.parse import unquote
 from config import ConfigManager
 from api_clients import OVERFRAME_CACHE
 
+# Pixmap cache budget while hidden (KB); restored to Qt's default on show
+HIDDEN_PIXMAP_CACHE_KB = 1024
+
 # --- DWM Structures for Acrylic/Blur ---
 class ACCENT_POLICY(Structure):
     _fields_ = [
@@ -26,6 +31,7 @@ class WINDOWCOMPOSITIONATTRIBDATA(Structure):
     ]
 
 def enable_acrylic(hwnd):
+    if sys.platform != 'win32': return # DWM blur is Windows-only
     try:
         policy = ACCENT_POLICY()
         # 3 = ACCENT_ENABLE_BLURBEHIND (Aero Blur), 4 = ACCENT_ENABLE_ACRYLICBLURBEHIND (Windows 10 Acrylic)
@@ -44,9 +50,46 @@ def enable_acrylic(hwnd):
     except Exception as e:
         print(f"Failed to enable Acrylic: {e}")
 
+class PriceToast(QLabel):
+    """Small transient price card shown at the cursor (works while the overlay is hidden)."""
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        # Never steal focus from the game / trade chat
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setStyleSheet("background-color: rgba(20, 20, 30, 230); color: #ddd; border: 1px solid #00d2ff; border-radius: 6px; padding: 6px; font-size: 12px;")
+        self.name = None
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide)
+
+    def show_price(self, name, html, duration_ms=5000):
+        self.name = name
+        self.setText(html)
+        self.adjustSize()
+        if not self.isVisible():
+            self.move(QCursor.pos() + QPoint(16, 16))
+            self.show()
+        self.hide_timer.start(duration_ms)
+
+    def update_price(self, name, html):
+        """Replace the card's content if it still shows `name` (e.g. after a background refresh)."""
+        if self.isVisible() and name == self.name:
+            self.show_price(name, html, max(self.hide_timer.remainingTime(), 2000))
+
 class WarframeOverlay(QMainWindow):
     search_triggered = pyqtSignal(str)
     exit_triggered = pyqtSignal()
+    export_trace_triggered = pyqtSignal()
+    minimize_triggered = pyqtSignal()
+    fissure_preset_changed = pyqtSignal(str)
+    stream_changed = pyqtSignal(str)
+    node_toggled = pyqtSignal(str) # node name; show/hide its reward table under the row
 
     def __init__(self):
         super().__init__()
@@ -127,6 +170,13 @@ class WarframeOverlay(QMainWindow):
         header_layout.addWidget(header)
         
         header_layout.addStretch()
+
+        # Platform/language switcher (hidden while only one stream is tracked)
+        self.stream_combo = QComboBox()
+        self.stream_combo.setStyleSheet("QComboBox { background: #222; color: #ddd; border: 1px solid #444; padding: 2px 6px; font-size: 11px; }")
+        self.stream_combo.currentTextChanged.connect(self.stream_changed.emit)
+        self.stream_combo.hide()
+        header_layout.addWidget(self.stream_combo)
         
         # Minimize Button
         min_btn = QPushButton("─")
@@ -144,7 +194,7 @@ class WarframeOverlay(QMainWindow):
                 color: #00d2ff;
             }
         """)
-        min_btn.clicked.connect(self.hide)
+        min_btn.clicked.connect(self.minimize_triggered.emit)
         header_layout.addWidget(min_btn)
 
         close_btn = QPushButton("✕")
@@ -167,6 +217,16 @@ class WarframeOverlay(QMainWindow):
 
         main_layout.addLayout(header_layout)
 
+        # Alert banner (hidden until a reward rule fires)
+        self.notification_label = QLabel("")
+        self.notification_label.setWordWrap(True)
+        self.notification_label.setStyleSheet("background: rgba(0, 210, 255, 40); color: #fff; border: 1px solid #00d2ff; border-radius: 4px; padding: 4px; font-size: 11px;")
+        self.notification_label.hide()
+        self.notification_timer = QTimer(self)
+        self.notification_timer.setSingleShot(True)
+        self.notification_timer.timeout.connect(self.notification_label.hide)
+        main_layout.addWidget(self.notification_label)
+
         # Global Search Bar
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search Item / Warframe...")
@@ -212,9 +272,24 @@ class WarframeOverlay(QMainWindow):
         self.layout_activities = QVBoxLayout(self.content_activities)
         self.layout_activities.setAlignment(Qt.AlignmentFlag.AlignTop)
 
+        # Fissure filter presets
+        preset_row = QHBoxLayout()
+        preset_label = QLabel("Fissures:")
+        preset_label.setStyleSheet("font-size: 11px; border: none; color: #aaa;")
+        preset_row.addWidget(preset_label)
+        self.fissure_preset_combo = QComboBox()
+        self.fissure_preset_combo.setStyleSheet("QComboBox { background: #222; color: #ddd; border: 1px solid #444; padding: 2px 6px; font-size: 11px; }")
+        self.fissure_preset_combo.currentTextChanged.connect(self.fissure_preset_changed.emit)
+        preset_row.addWidget(self.fissure_preset_combo)
+        preset_row.addStretch()
+        self.layout_activities.addLayout(preset_row)
+
         self.activities_label = QLabel("Loading Activities...")
         self.activities_label.setWordWrap(True)
         self.activities_label.setStyleSheet("font-size: 12px; border: none;")
+        # Node names in fissure/invasion rows are "node:<name>" links that expand what drops there
+        self.activities_label.setTextInteractionFlags(Qt.TextInteractionFlag.LinksAccessibleByMouse)
+        self.activities_label.linkActivated.connect(self.on_activity_link)
         self.layout_activities.addWidget(self.activities_label)
         scroll_act.setWidget(self.content_activities)
 
@@ -266,6 +341,31 @@ class WarframeOverlay(QMainWindow):
         """)
         self.layout_notes.addWidget(self.notes_input)
 
+        # Live status of noted items (prefetched in the background)
+        self.notes_status_label = QLabel("")
+        self.notes_status_label.setWordWrap(True)
+        self.notes_status_label.setStyleSheet("font-size: 11px; border: none; color: #aaa;")
+        self.layout_notes.addWidget(self.notes_status_label)
+
+        # --- Tab 6: Diagnostics (hidden until Ctrl+Alt+D) ---
+        self.tab_diag = QWidget()
+        self.layout_diag = QVBoxLayout(self.tab_diag)
+        self.diag_text = QTextBrowser()
+        self.diag_text.setStyleSheet("background: transparent; color: #ddd; font-size: 11px; border: none;")
+        self.layout_diag.addWidget(self.diag_text)
+
+        diag_footer = QHBoxLayout()
+        self.diag_status = QLabel("")
+        self.diag_status.setStyleSheet("color: #888; font-size: 10px; border: none;")
+        diag_footer.addWidget(self.diag_status)
+        diag_footer.addStretch()
+        export_btn = QPushButton("Export Trace")
+        export_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        export_btn.setStyleSheet("QPushButton { background: #333; color: #ddd; border: 1px solid #555; padding: 4px 8px; border-radius: 4px; }")
+        export_btn.clicked.connect(self.export_trace_triggered.emit)
+        diag_footer.addWidget(export_btn)
+        self.layout_diag.addLayout(diag_footer)
+
         # Footer
         footer = QLabel("Ctrl+Alt+O = Toggle | Ctrl+Alt+X = Exit")
         footer.setStyleSheet("color: #666; font-size: 10px; border: none; margin-top: 5px;")
@@ -376,6 +476,77 @@ class WarframeOverlay(QMainWindow):
     def update_activities_tab(self, text):
         self.activities_label.setText(text)
 
+    def on_activity_link(self, href):
+        if href.startswith('node:'):
+            self.node_toggled.emit(unquote(href[len('node:'):]))
+
+    def release_resources(self, discard_page=False):
+        """Low-footprint mode while hidden: freeze (or discard) the web page and shrink image caches.
+
+        A frozen page keeps its DOM but stops running scripts/timers; a discarded page
+        also frees the renderer's memory and is reloaded when made active again.
+        """
+        page = self.web_view.page()
+        state = QWebEnginePage.LifecycleState.Discarded if discard_page else QWebEnginePage.LifecycleState.Frozen
+        if page.lifecycleState() != state and not page.url().isEmpty():
+            page.setLifecycleState(state)
+
+        if not hasattr(self, "_pixmap_cache_limit"):
+            self._pixmap_cache_limit = QPixmapCache.cacheLimit()
+        QPixmapCache.clear()
+        QPixmapCache.setCacheLimit(HIDDEN_PIXMAP_CACHE_KB)
+
+    def restore_resources(self):
+        """Undo release_resources(); a discarded page reloads itself here."""
+        if hasattr(self, "_pixmap_cache_limit"):
+            QPixmapCache.setCacheLimit(self._pixmap_cache_limit)
+            del self._pixmap_cache_limit
+        page = self.web_view.page()
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
+    def show_notification(self, html, duration_ms=8000):
+        self.notification_label.setText(html)
+        self.notification_label.show()
+        self.notification_timer.start(duration_ms)
+
+    def toggle_diagnostics_tab(self):
+        """Show/hide the diagnostics tab. Returns True if it is now shown."""
+        index = self.tabs.indexOf(self.tab_diag)
+        if index >= 0:
+            self.tabs.removeTab(index)
+            return False
+        self.tabs.setCurrentIndex(self.tabs.addTab(self.tab_diag, "Diag"))
+        return True
+
+    def update_diagnostics(self, html):
+        # Keep the scroll position across refreshes
+        bar = self.diag_text.verticalScrollBar()
+        pos = bar.value()
+        self.diag_text.setHtml(html)
+        bar.setValue(pos)
+
+    def set_diagnostics_status(self, text):
+        self.diag_status.setText(text)
+
+    def set_streams(self, keys, current):
+        self.stream_combo.blockSignals(True)
+        self.stream_combo.clear()
+        self.stream_combo.addItems(keys)
+        self.stream_combo.setCurrentText(current)
+        self.stream_combo.blockSignals(False)
+        self.stream_combo.setVisible(len(keys) > 1)
+
+    def set_fissure_presets(self, names, current):
+        self.fissure_preset_combo.blockSignals(True)
+        self.fissure_preset_combo.clear()
+        self.fissure_preset_combo.addItems(names)
+        self.fissure_preset_combo.setCurrentText(current)
+        self.fissure_preset_combo.blockSignals(False)
+
+    def update_notes_status(self, text):
+        self.notes_status_label.setText(text)
+
     def update_search_results(self, text):
         self.search_results_label.setHtml(text)
 
@@ -390,21 +561,47 @@ class WarframeOverlay(QMainWindow):
         """Restore UI state from config."""
         notes = self.config.get("notes", "")
         self.notes_input.setPlainText(notes)
+        last_tab = self.config.get("last_tab", 0)
+        if 0 <= last_tab < self.tabs.count():
+            self.tabs.setCurrentIndex(last_tab)
 
-    def closeEvent(self, event):
-        """Save state on close."""
-        # Save geometry
+        # Autosave: these only mark the in-memory config dirty; ConfigManager
+        # writes to disk on a debounce from its own thread.
+        self.notes_input.textChanged.connect(self.save_notes)
+        self.tabs.currentChanged.connect(self.save_tab)
+        self._state_loaded = True
+
+    def save_notes(self):
+        ConfigManager.save_config({"notes": self.notes_input.toPlainText()})
+
+    def save_tab(self, index):
+        ConfigManager.save_config({"last_tab": index})
+
+    def save_geometry(self):
+        if not getattr(self, "_state_loaded", False): return
         geo = self.geometry()
-        data = {
+        ConfigManager.save_config({
             "window": {
                 "x": geo.x(),
                 "y": geo.y(),
                 "width": geo.width(),
                 "height": geo.height()
-            },
-            "notes": self.notes_input.toPlainText()
-        }
-        ConfigManager.save_config(data)
+            }
+        })
+
+    def moveEvent(self, event):
+        self.save_geometry()
+        super().moveEvent(event)
+
+    def resizeEvent(self, event):
+        self.save_geometry()
+        super().resizeEvent(event)
+
+    def closeEvent(self, event):
+        """Save state on close."""
+        self.save_geometry()
+        self.save_notes()
+        ConfigManager.flush()
         super().closeEvent(event)
 
     def mousePressEvent(self, event):
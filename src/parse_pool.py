@@ -0,0 +1,83 @@
+"""Small persistent process pool for CPU-bound parsing.
+
+BeautifulSoup holds the GIL for tens of milliseconds per page; run in a search thread
+it stalls the Qt event loop (dragging, typing, countdown ticks). run() hands the raw
+bytes to a worker process instead, and only the compact result comes back.
+
+The pool is opt-in: the overlay and the engine daemon call warm_up() at start (it
+spawns the workers and imports bs4 there, in the background) and shutdown() on exit.
+Until it is ready, or if it breaks, run() parses in-process, so scripts that never
+call warm_up() behave as before. Spawned workers re-run the parent's __main__ script,
+so entry points that warm up must keep their top level import-light (see main.py).
+"""
+import importlib
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+POOL_WORKERS = 2
+
+_pool = None
+_ready = threading.Event()
+_lock = threading.Lock()
+
+def _init_worker():
+    # Ctrl+C reaches the whole process group; the parent shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Pay for the bs4 import once per worker, up front
+    importlib.import_module('html_parse')
+
+def _ping():
+    return True
+
+def warm_up(workers=POOL_WORKERS):
+    """Start the pool in a background thread; run() uses it once every worker answered."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            return
+        # spawn everywhere: forking a process with Qt/threads running isn't safe
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=_init_worker)
+        pool = _pool
+
+    def wait_ready():
+        try:
+            for fut in [pool.submit(_ping) for _ in range(workers)]:
+                fut.result()
+            _ready.set()
+        except Exception as e:
+            print(f"Parse pool unavailable, parsing in-process: {e}")
+            _discard(pool)
+    threading.Thread(target=wait_ready, name="ParsePoolWarmUp", daemon=True).start()
+
+def _discard(pool, wait=False):
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+            _ready.clear()
+    pool.shutdown(wait=wait)
+
+def is_ready():
+    return _ready.is_set()
+
+def run(fn, *args):
+    """fn(*args) in a worker process if the pool is warm, else in this one. fn must be a module-level function."""
+    pool = _pool
+    if pool is None or not _ready.is_set():
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool as e:
+        print(f"Parse pool broke, parsing in-process: {e}")
+        _discard(pool)
+        return fn(*args)
+
+def shutdown():
+    """Stop the workers and wait for them (also ones still starting), so none is left half-spawned."""
+    pool = _pool
+    if pool is not None:
+        _discard(pool, wait=True)
@@ -0,0 +1,95 @@
+import re
+import time
+from api_clients import OVERFRAME_CACHE
+
+# Longest item name (in words) we try to match in a notes line
+MAX_NAME_WORDS = 5
+# Ignore tiny single-word hits ("ash" in "wash" can't happen, but "mag", "ash" etc. are
+# noise-prone); "mag prime" is long enough to match
+MIN_NAME_LENGTH = 4
+# Pause between items so prefetching never competes with a real search
+ITEM_DELAY_SECONDS = 0.5
+
+def parse_noted_items(text, catalogue=None):
+    """Return catalogue item names mentioned in free-form notes, in order, without duplicates.
+
+    Each line is scanned left to right, greedily taking the longest run of words
+    that is a catalogue key ("volt prime set x2" -> "volt prime").
+    """
+    catalogue = OVERFRAME_CACHE if catalogue is None else catalogue
+    found = []
+    seen = set()
+    for line in text.splitlines():
+        words = re.findall(r"[a-z0-9&]+", line.lower().replace("'", ""))
+        i = 0
+        while i < len(words):
+            for n in range(min(MAX_NAME_WORDS, len(words) - i), 0, -1):
+                candidate = ' '.join(words[i:i + n])
+                if len(candidate) >= MIN_NAME_LENGTH and candidate in catalogue:
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        found.append(catalogue[candidate].get('name', candidate.title()))
+                    i += n
+                    break
+            else:
+                i += 1
+    return found
+
+class NotesPrefetcher:
+    """Warms caches for every item on the farming list.
+
+    Runs the engine's full search pipeline for each noted item (market, wiki, drops,
+    build, icon), so a later search for it is served from cache. With a remote engine
+    this warms the shared daemon's cache instead. Keeps a compact per-item status.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.status = {} # name -> {'state': 'pending'|'warm'|'error', 'price': int|None, 'updated': epoch}
+
+    def set_items(self, names):
+        self.status = {n: self.status.get(n, {'state': 'pending', 'price': None, 'updated': None}) for n in names}
+
+    def prefetch_item(self, name):
+        return self.engine.search(name)
+
+    def next_item(self, done):
+        """First noted item not handled yet this run (the list may change while running)."""
+        return next((n for n in self.status if n not in done), None)
+
+    def run(self, is_busy=lambda: False, should_stop=lambda: False, on_update=None):
+        """Prefetch every noted item once. Yields to searches via is_busy().
+
+        Picks up items added (and skips items removed) by set_items() while running.
+        """
+        done = set()
+        while True:
+            name = self.next_item(done)
+            if name is None or should_stop(): return
+            done.add(name)
+            while is_busy():
+                if should_stop(): return
+                time.sleep(ITEM_DELAY_SECONDS)
+            try:
+                info = self.prefetch_item(name)
+                result = {'state': 'warm', 'price': info['price'], 'updated': time.time()}
+            except Exception as e:
+                print(f"Prefetch failed for {name}: {e}")
+                result = {**self.status.get(name, {}), 'state': 'error', 'updated': time.time()}
+            if name in self.status: # Notes may have changed while we were fetching
+                self.status[name] = result
+            if on_update:
+                on_update(dict(self.status))
+            time.sleep(ITEM_DELAY_SECONDS)
+
+    @staticmethod
+    def format_status(status):
+        """Compact HTML status line per noted item."""
+        if not status:
+            return ""
+        colors = {'warm': '#00ff88', 'pending': '#888', 'error': '#ff5555'}
+        rows = []
+        for name, st in status.items():
+            price = f"{st['price']}p" if st.get('price') is not None else "-"
+            rows.append(f"<span style='color:{colors.get(st['state'], '#888')};'>●</span> {name} <span style='color:#00d2ff;'>{price}</span>")
+        return "<br>".join(rows)
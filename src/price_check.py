@@ -0,0 +1,121 @@
+"""Bulk price check from the command line.
+
+    python src/price_check.py items.txt --format csv -o prices.csv
+    type items.txt | python src/price_check.py - --format json
+
+Reads one item name per line (blank lines and '#' comments ignored), resolves each
+against the item catalogue, fetches warframe.market prices concurrently (requests to
+the market are rate limited in http_client) and writes price statistics.
+"""
+import argparse
+import csv
+import difflib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+from api_clients import OVERFRAME_CACHE, WarframeAPI
+
+HTTP_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'data', 'http_cache.json')
+DEFAULT_WORKERS = 8
+
+FIELDS = ['query', 'name', 'market_key', 'sellers', 'min', 'median', 'mean', 'max', 'buy_max', 'error']
+
+def read_names(stream):
+    names = []
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            names.append(line)
+    return names
+
+def resolve_name(query):
+    """Map a typed name to its catalogue name (exact, then closest match), else keep it as-is."""
+    key = query.lower().strip()
+    if key in OVERFRAME_CACHE:
+        return OVERFRAME_CACHE[key]['name']
+    close = difflib.get_close_matches(key, OVERFRAME_CACHE.keys(), n=1, cutoff=0.85)
+    if close:
+        return OVERFRAME_CACHE[close[0]]['name']
+    return query.strip()
+
+def check_price(query, lookup=None):
+    lookup = lookup or (lambda name: WarframeAPI.lookup_market_price(name, with_icon=False))
+    name = resolve_name(query)
+    row = {'query': query, 'name': name}
+    try:
+        info = lookup(name)
+        row['name'] = info['full_name']
+        row['market_key'] = info['url_key']
+        if not info['url_key']:
+            row['error'] = 'not tradeable or not found'
+        row.update(info.get('stats') or {})
+    except Exception as e:
+        row['error'] = str(e)
+    return row
+
+def check_prices(names, workers=DEFAULT_WORKERS, lookup=None, progress=None):
+    """Price every name concurrently; results keep input order. Duplicates are looked up once."""
+    unique = list(dict.fromkeys(names))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(check_price, name, lookup) for name in unique}
+        results = {}
+        for i, (name, fut) in enumerate(futures.items(), 1):
+            results[name] = fut.result()
+            if progress:
+                progress(i, len(unique))
+    return [results[n] for n in names]
+
+def write_rows(rows, out, fmt):
+    if fmt == 'json':
+        json.dump(rows, out, indent=2)
+        out.write('\n')
+    else:
+        writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk warframe.market price check")
+    parser.add_argument('input', nargs='?', default='-', help="File with one item per line, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="Output file (default stdout)")
+    parser.add_argument('-f', '--format', choices=['csv', 'json'], default='csv')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--engine', default='', help="Use a shared engine daemon, e.g. http://127.0.0.1:8765")
+    parser.add_argument('--no-cache', action='store_true', help="Don't read/write the on-disk response cache")
+    args = parser.parse_args(argv)
+
+    if args.input == '-':
+        names = read_names(sys.stdin)
+    else:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            names = read_names(f)
+
+    lookup = None
+    if args.engine:
+        from engine_client import RemoteEngine
+        lookup = RemoteEngine(args.engine).lookup_price
+
+    if not args.no_cache:
+        http_client.CACHE.load(HTTP_CACHE_FILE)
+
+    start = time.time()
+    progress = lambda done, total: print(f"\r{done}/{total}", end='', file=sys.stderr, flush=True)
+    try:
+        rows = check_prices(names, workers=args.workers, lookup=lookup, progress=progress)
+    finally:
+        if not args.no_cache:
+            http_client.CACHE.save(HTTP_CACHE_FILE)
+    print(f"\rPriced {len(rows)} items in {time.time() - start:.1f}s", file=sys.stderr)
+
+    if args.output == '-':
+        write_rows(rows, sys.stdout, args.format)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_rows(rows, f, args.format)
+
+if __name__ == "__main__":
+    main()
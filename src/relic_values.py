@@ -0,0 +1,225 @@
+"""Expected platinum and ducat value of every void relic, for fissure planning.
+
+Built on two bulk lists kept in data/:
+    relic_drops.json   the drops.warframestat.us relic tables (every relic x refinement, one request)
+    relic_prices.json  {"updated": ts, "prices": {"volt prime neuroptics blueprint": 12.0, ...}}
+                       median in-game sell price of every relic reward
+
+All relics are valued in one NumPy pass. Rewards are indexed into a (relics, 6) matrix
+and chances into (relics, refinements, 6); for every relic, refinement and squad size
+we compute the expected value of the best of n draws - a squad where everyone opens
+the same relic and each player takes the best reward shown ("radshare"). Results are
+memoised and recomputed only when a price changes.
+
+NumPy is optional: without it RelicValuator is unavailable and the overlay simply
+doesn't show relic suggestions.
+
+    python src/relic_values.py --update        # refresh drop tables and reward prices
+    python src/relic_values.py Axi --squad 4   # best Axi relics
+"""
+import argparse
+import os
+import sys
+import time
+from fileio import atomic_write_json, load_json
+from fissure_index import TIER_ORDER
+import http_client
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DROPS_FILE = os.path.join(DATA_DIR, 'relic_drops.json')
+PRICES_FILE = os.path.join(DATA_DIR, 'relic_prices.json')
+DROPS_URL = "https://drops.warframestat.us/data/relics.json"
+DROPS_REFRESH_SECONDS = 24 * 60 * 60
+PRICES_REFRESH_SECONDS = 6 * 60 * 60
+
+REFINEMENTS = ('Intact', 'Exceptional', 'Flawless', 'Radiant')
+SQUAD_SIZES = (1, 2, 3, 4)
+REWARD_SLOTS = 6
+# Fissure tiers that accept relics of every tier (the feed says "Omnia")
+ANY_TIER = ('Omnia', 'Omni')
+
+def price_key(name):
+    return ' '.join(name.lower().split())
+
+def part_value(lookup, name):
+    """lookup(name) for a reward, retrying without " Blueprint" (drop tables say "Volt Prime Neuroptics Blueprint")."""
+    value = lookup(name)
+    if value is None and name.endswith(' Blueprint'):
+        value = lookup(name[:-len(' Blueprint')])
+    return value
+
+def expected_best(values, rewards, chances, squad_sizes=SQUAD_SIZES):
+    """E[best of n draws] for every relic x refinement x squad size.
+
+    values: (items,); rewards: (relics, slots) item indices; chances: (relics, refinements, slots).
+    Returns (relics, refinements, len(squad_sizes)).
+    """
+    # 1. Each relic's reward values, ascending, with chances in the same order
+    v = values[rewards]
+    order = np.argsort(v, axis=1)
+    v = np.take_along_axis(v, order, axis=1)
+    p = np.take_along_axis(chances, order[:, None, :], axis=2)
+
+    # 2. P(best of n <= v_j) = F(v_j)^n, so P(best == v_j) is the step between consecutive powers
+    cdf = np.minimum(np.cumsum(p, axis=2), 1.0)
+    n = np.asarray(squad_sizes, dtype=float).reshape(-1, 1, 1, 1)
+    weights = np.diff(cdf[None] ** n, axis=3, prepend=0.0)
+
+    # 3. Sum over slots; squad axis last
+    return np.moveaxis((weights * v[None, :, None, :]).sum(axis=3), 0, 2)
+
+class RelicTable:
+    """Relic drop tables as arrays (see expected_best)."""
+
+    def __init__(self, relics, items, rewards, chances):
+        self.relics = relics    # [(tier, name)] sorted by tier, then name
+        self.items = items      # reward names; rewards[] indexes into this
+        self.rewards = rewards
+        self.chances = chances
+        self.tiers = np.array([tier for tier, _ in relics])
+
+    @classmethod
+    def from_drops(cls, data):
+        """Build from the drops.warframestat.us relics.json payload."""
+        tables = {}
+        for relic in data.get('relics', []):
+            if relic.get('state') not in REFINEMENTS: continue
+            tables.setdefault((relic['tier'], relic['relicName']), {})[relic['state']] = {
+                r['itemName']: r.get('chance', 0) / 100 for r in relic.get('rewards', [])}
+
+        relics = sorted(tables, key=lambda k: (TIER_ORDER.get(k[0], 99), k[1]))
+        index = {}
+        # Relics with fewer rewards are padded with zero-chance slots, which add nothing
+        rewards = np.zeros((len(relics), REWARD_SLOTS), dtype=np.intp)
+        chances = np.zeros((len(relics), len(REFINEMENTS), REWARD_SLOTS))
+        for i, key in enumerate(relics):
+            states = tables[key]
+            names = list(dict.fromkeys(name for state in states.values() for name in state))[:REWARD_SLOTS]
+            for slot, name in enumerate(names):
+                rewards[i, slot] = index.setdefault(name, len(index))
+                for k, state in enumerate(REFINEMENTS):
+                    chances[i, k, slot] = states.get(state, {}).get(name, 0)
+        return cls(relics, list(index), rewards, chances)
+
+    def vector(self, lookup):
+        """Per-reward values from lookup(name) (unknown -> 0)."""
+        return np.array([part_value(lookup, name) or 0 for name in self.items], dtype=float)
+
+class RelicValuator:
+    def __init__(self, table):
+        self.table = table
+        self._inputs = None
+        self.platinum = None # (relics, refinements, squad sizes)
+        self.ducats = None
+
+    def update(self, price, ducats):
+        """Revalue with price(name) / ducats(name) lookups. Recomputes only if a value changed; returns True if it did."""
+        inputs = (self.table.vector(price), self.table.vector(ducats))
+        if self._inputs is not None and all(np.array_equal(a, b) for a, b in zip(inputs, self._inputs)):
+            return False
+        self._inputs = inputs
+        self.platinum = expected_best(inputs[0], self.table.rewards, self.table.chances)
+        self.ducats = expected_best(inputs[1], self.table.rewards, self.table.chances)
+        return True
+
+    def best(self, tier, refinement='Radiant', squad=4, count=3):
+        """Top relics of a fissure tier by expected platinum: [{'relic', 'platinum', 'ducats'}]. Omnia fissures take any tier."""
+        if self.platinum is None:
+            return []
+        k, s = REFINEMENTS.index(refinement), SQUAD_SIZES.index(squad)
+        candidates = np.arange(len(self.table.relics)) if tier in ANY_TIER else np.flatnonzero(self.table.tiers == tier)
+        plat = self.platinum[candidates, k, s]
+        top = candidates[np.argsort(-plat, kind='stable')[:count]]
+        return [{'relic': ' '.join(self.table.relics[i]), 'platinum': round(float(self.platinum[i, k, s]), 1),
+                 'ducats': round(float(self.ducats[i, k, s]), 1)} for i in top]
+
+def load_valuator():
+    """RelicValuator for the saved drop tables; None without NumPy or drop tables."""
+    if np is None:
+        return None
+    data = load_json(DROPS_FILE, None)
+    if not data:
+        return None
+    try:
+        return RelicValuator(RelicTable.from_drops(data))
+    except Exception as e:
+        print(f"Failed to load relic tables: {e}")
+        return None
+
+def drops_mtime():
+    return os.path.getmtime(DROPS_FILE) if os.path.exists(DROPS_FILE) else None
+
+def load_prices():
+    return load_json(PRICES_FILE, {}).get('prices', {})
+
+# --- Updating ---
+
+def refresh_drops(force=False):
+    """Download the relic drop tables (at most daily unless forced). Returns True if updated."""
+    if not force and os.path.exists(DROPS_FILE) and time.time() - os.path.getmtime(DROPS_FILE) < DROPS_REFRESH_SECONDS:
+        return False
+    try:
+        resp = http_client.get(DROPS_URL, retries=1)
+        if resp.status_code != 200:
+            print(f"Relic tables refresh failed: HTTP {resp.status_code}")
+            return False
+        data = resp.json()
+    except Exception as e:
+        print(f"Relic tables refresh failed: {e}")
+        return False
+    atomic_write_json(DROPS_FILE, {'relics': data.get('relics', [])})
+    return True
+
+def refresh_prices(force=False, workers=8, progress=None):
+    """Re-price every relic reward on warframe.market (concurrent, rate limited). Returns True if updated."""
+    saved = load_json(PRICES_FILE, {})
+    if not force and time.time() - saved.get('updated', 0) < PRICES_REFRESH_SECONDS:
+        return False
+    from price_check import check_prices # Only needed when updating
+    names = sorted({r['itemName'] for relic in load_json(DROPS_FILE, {}).get('relics', []) for r in relic.get('rewards', [])})
+    if not names:
+        return False
+    prices = {}
+    for row in check_prices(names, workers=workers, progress=progress):
+        if row.get('median') is not None:
+            prices[price_key(row['query'])] = row['median']
+    atomic_write_json(PRICES_FILE, {'updated': time.time(), 'prices': prices})
+    print(f"Relic rewards: {len(prices)}/{len(names)} priced")
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relic expected values")
+    parser.add_argument('tier', nargs='*', default=['Lith', 'Meso', 'Neo', 'Axi'])
+    parser.add_argument('--refinement', choices=REFINEMENTS, default='Radiant')
+    parser.add_argument('--squad', type=int, choices=SQUAD_SIZES, default=4)
+    parser.add_argument('-n', '--count', type=int, default=5)
+    parser.add_argument('--update', action='store_true', help="Refresh drop tables and reward prices first")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("NumPy is required (pip install numpy).", file=sys.stderr)
+        return 1
+    if args.update:
+        refresh_drops(force=True)
+        refresh_prices(force=True, progress=lambda done, total: print(f"\r{done}/{total}", end='', file=sys.stderr, flush=True))
+    valuator = load_valuator()
+    if valuator is None:
+        print("No relic tables; run with --update first.", file=sys.stderr)
+        return 1
+
+    from api_clients import ITEMS
+    prices = load_prices()
+    valuator.update(lambda name: prices.get(price_key(name)), lambda name: (ITEMS.resolve(name) or {}).get('ducats'))
+    for tier in args.tier:
+        print(f"{tier} ({args.refinement}, squad of {args.squad}):")
+        for row in valuator.best(tier, args.refinement, args.squad, args.count):
+            print(f"  {row['relic']:<14}{row['platinum']:>8.1f}p{row['ducats']:>8.1f}d")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
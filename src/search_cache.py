@@ -0,0 +1,103 @@
+"""Memoised search results, composed from independently expiring sections.
+
+A search result is built from five sections (market price, wiki intro, drops, build
+URL, icon), each with its own freshness window. Entries are keyed by the resolved
+item name, with every query that resolved to it as an alias, so "volt", "Volt Prime"
+and "volt prime" share one entry. A repeat search renders the memoised composite
+and refetches only the sections that expired (usually just the price).
+"""
+import threading
+import time
+from collections import OrderedDict
+from api_clients import TTL_MARKET_ORDERS, TTL_WIKI, TTL_DROPS, TTL_OVERFRAME, TTL_ICON
+
+SECTION_TTL = {
+    'market': TTL_MARKET_ORDERS,
+    'wiki': TTL_WIKI,
+    'drops': TTL_DROPS,
+    'bis_url': TTL_OVERFRAME,
+    'icon': TTL_ICON,
+}
+MAX_ENTRIES = 128
+
+def _alias(query):
+    return ' '.join(query.lower().split())
+
+class CachedResult:
+    __slots__ = ('query', 'sections', 'fetched', 'aliases', 'result')
+
+    def __init__(self):
+        self.query = None     # query the item was first resolved from (re-used for refreshes)
+        self.sections = {}    # section -> value
+        self.fetched = {}     # section -> fetch time
+        self.aliases = set()  # queries that resolved to this entry
+        self.result = None    # memoised rendered result; cleared when a section changes
+
+    @property
+    def key(self):
+        market = self.sections.get('market')
+        return _alias(market['full_name']) if market else None
+
+    def set(self, section, value, fetched_at=None):
+        if self.sections.get(section) != value:
+            self.result = None
+        self.sections[section] = value
+        self.fetched[section] = fetched_at if fetched_at is not None else time.time()
+
+    def stale(self, now=None):
+        """Sections that are missing or past their freshness window."""
+        now = now or time.time()
+        return [s for s, ttl in SECTION_TTL.items() if now - self.fetched.get(s, 0) >= ttl]
+
+    def record(self, query):
+        """Bundle-style record (see data_bundle.py) of the current sections."""
+        # The price check can miss a search deadline; render the rest under the typed name
+        market = self.sections.get('market') or {'price': None, 'stats': None, 'full_name': self.query or query,
+                                                 'icon_url': None, 'url_key': None, 'prime_set': False}
+        return {'query': query, 'full_name': market['full_name'], 'market': market,
+                'drops': self.sections.get('drops', ''), 'wiki': self.sections.get('wiki', ''),
+                'bis_url': self.sections.get('bis_url', ''), 'updated': self.fetched.get('market', 0)}
+
+class SearchResultCache:
+    """Thread-safe LRU of CachedResult entries."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # canonical key -> CachedResult
+        self._aliases = {}            # query alias -> canonical key
+        self._lock = threading.Lock()
+
+    def get(self, query):
+        with self._lock:
+            key = self._aliases.get(_alias(query))
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, query, entry):
+        """Store entry under its resolved name, remembering query as an alias."""
+        key = entry.key
+        if not key: return
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and existing is not entry:
+                entry.aliases |= existing.aliases
+            entry.aliases.update((_alias(query), key))
+            for alias in entry.aliases:
+                self._aliases[alias] = key
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                for alias in evicted.aliases:
+                    if self._aliases.get(alias) == evicted.key:
+                        del self._aliases[alias]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def __len__(self):
+        return len(self._entries)
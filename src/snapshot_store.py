@@ -0,0 +1,331 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from fileio import atomic_write_bytes, atomic_write_json, load_json, loads
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'data', 'snapshots')
+RETENTION_DAYS = 30
+
+# Sections that change on every fetch but carry no history value
+VOLATILE_KEYS = ('timestamp',)
+# Countdown strings inside sections ("17m 35s"), recomputed by the API on every fetch;
+# dropped before hashing so an otherwise unchanged section dedups
+VOLATILE_FIELDS = ('timeLeft', 'eta', 'remaining', 'startString', 'endString', 'shortString')
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+def _fissure_key(tier, mission_type, steel_path):
+    # "Axi|Survival|SP" / "Lith|Capture|"
+    return f"{tier}|{mission_type}|{'SP' if steel_path else ''}"
+
+class SnapshotStore:
+    """Append-only, deduplicated history of world states.
+
+    Layout (all under SNAPSHOT_DIR):
+      sections.dat    - zlib-compressed JSON blobs, one per distinct section body
+      snapshots.jsonl - one line per snapshot: {"ts": ..., "changed": {section: [sha1, offset, length]}}
+                        Only sections that differ from the previous snapshot are listed.
+      index.json      - query index (Baro sightings, fissure frequencies), updated on append
+
+    Queries read index.json only; blobs are only touched to rebuild a full state.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR, retention_days=RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.blob_file = os.path.join(directory, 'sections.dat')
+        self.log_file = os.path.join(directory, 'snapshots.jsonl')
+        self.index_file = os.path.join(directory, 'index.json')
+        os.makedirs(directory, exist_ok=True)
+
+        self.blobs = {}      # sha1 -> (offset, length)
+        self.latest = {}     # section -> sha1 (state as of the newest snapshot)
+        self.first_ts = None
+        self.last_ts = None
+        self.count = 0
+        self._load_log()
+
+        self.index = load_json(self.index_file, None) or self._empty_index()
+
+    @staticmethod
+    def _empty_index():
+        return {'baro': {}, 'fissures': {}, 'fissure_ids': [], 'since': None}
+
+    def _load_log(self):
+        if not os.path.exists(self.log_file):
+            return
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    continue # Torn trailing line from a crash
+                self._apply_entry(entry)
+
+    def _apply_entry(self, entry):
+        for section, ref in entry['changed'].items():
+            if ref is None:
+                self.latest.pop(section, None)
+                continue
+            digest, offset, length = ref
+            self.blobs[digest] = (offset, length)
+            self.latest[section] = digest
+        if self.first_ts is None:
+            self.first_ts = entry['ts']
+        self.last_ts = entry['ts']
+        self.count += 1
+
+    def _read_blob(self, digest, f):
+        offset, length = self.blobs[digest]
+        f.seek(offset)
+        return loads(zlib.decompress(f.read(length)))
+
+    def _sections(self, state):
+        """Split a state into {section: (sha1, JSON bytes)}, skipping volatile keys and fields."""
+        out = {}
+        for key, value in state.items():
+            if key in VOLATILE_KEYS:
+                continue
+            raw = json.dumps(_strip_volatile(value), sort_keys=True, separators=(',', ':')).encode('utf-8')
+            out[key] = (hashlib.sha1(raw).hexdigest(), raw)
+        return out
+
+    def append(self, state, ts=None):
+        """Record a world state. Returns False if nothing changed since the last snapshot."""
+        if not state: return False
+        ts = ts if ts is not None else time.time()
+
+        changed = {}
+        new_blobs = []
+        pending = {}  # sha1 -> (offset, length) for blobs not yet on disk
+        blob_end = os.path.getsize(self.blob_file) if os.path.exists(self.blob_file) else 0
+
+        sections = self._sections(state)
+        for key, (digest, raw) in sections.items():
+            if self.latest.get(key) == digest:
+                continue
+            ref = self.blobs.get(digest) or pending.get(digest)
+            if ref is None:
+                packed = zlib.compress(raw, 6)
+                new_blobs.append(packed)
+                ref = pending[digest] = (blob_end, len(packed))
+                blob_end += len(packed)
+            changed[key] = [digest, *ref]
+        for key in self.latest:
+            if key not in sections:
+                changed[key] = None
+
+        if self._update_index(state, ts):
+            atomic_write_json(self.index_file, self.index)
+
+        if not changed:
+            return False
+
+        if new_blobs:
+            with open(self.blob_file, 'ab') as f:
+                f.write(b''.join(new_blobs))
+                f.flush()
+                os.fsync(f.fileno())
+
+        entry = {'ts': ts, 'changed': changed}
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        # Blob refs only become visible once the data behind them is on disk
+        self._apply_entry(entry)
+
+        if self.first_ts and ts - self.first_ts > self.retention_days * 86400 * 1.1:
+            self.prune()
+        return True
+
+    def latest_state(self):
+        """Rebuild the newest stored world state (for instant warm start), or None."""
+        if not self.latest or not os.path.exists(self.blob_file):
+            return None
+        state = {}
+        try:
+            with open(self.blob_file, 'rb') as f:
+                for section, digest in self.latest.items():
+                    state[section] = self._read_blob(digest, f)
+        except Exception as e:
+            print(f"Failed to read snapshot: {e}")
+            return None
+        state['timestamp'] = _iso(self.last_ts)
+        return state
+
+    # --- Query index ---
+
+    def _update_index(self, state, ts):
+        """Fold a state into the query index. Returns True if it needs saving.
+
+        Bumping last_seen alone doesn't count; it rides along with the next real change.
+        """
+        idx = self.index
+        dirty = False
+        if idx['since'] is None:
+            idx['since'] = ts
+            dirty = True
+
+        # Baro: remember every item and which visits (by activation) carried it
+        trader = state.get('voidTrader') or {}
+        if trader.get('active'):
+            visit = trader.get('activation') or _iso(ts)
+            for item in trader.get('inventory', []):
+                name = item.get('item')
+                if not name: continue
+                rec = idx['baro'].setdefault(name, {'visits': [], 'last_seen': None})
+                if visit not in rec['visits']:
+                    rec['visits'].append(visit)
+                    dirty = True
+                rec['last_seen'] = ts
+
+        # Fissures: count each fissure once, when its id first appears
+        prev_ids = set(idx['fissure_ids'])
+        ids = []
+        for f in state.get('fissures', []):
+            fid = f.get('id')
+            if not fid: continue
+            ids.append(fid)
+            if fid in prev_ids: continue
+            key = _fissure_key(f.get('tier'), f.get('missionType'), f.get('isHard'))
+            rec = idx['fissures'].setdefault(key, {'count': 0, 'last_seen': None, 'seen': []})
+            rec.setdefault('seen', []).append(ts)
+            rec['count'] += 1
+            rec['last_seen'] = ts
+        if ids != idx['fissure_ids']:
+            idx['fissure_ids'] = ids
+            dirty = True
+        return dirty
+
+    def _prune_index(self, cutoff):
+        """Forget Baro items and fissure appearances older than the cutoff."""
+        idx = self.index
+        idx['baro'] = {name: rec for name, rec in idx['baro'].items()
+                       if (rec['last_seen'] or 0) >= cutoff}
+        fissures = {}
+        for key, rec in idx['fissures'].items():
+            if 'seen' in rec:
+                rec['seen'] = [t for t in rec['seen'] if t >= cutoff]
+                rec['count'] = len(rec['seen'])
+                if rec['count']:
+                    fissures[key] = rec
+            elif (rec['last_seen'] or 0) >= cutoff: # Index written before 'seen' existed
+                fissures[key] = rec
+        idx['fissures'] = fissures
+        if idx['since'] is not None:
+            idx['since'] = max(idx['since'], cutoff)
+        atomic_write_json(self.index_file, idx)
+
+    def baro_last_seen(self, query):
+        """Return [(item, last_seen_epoch, visit_count)] for Baro items matching query, newest first."""
+        q = query.lower().strip()
+        hits = [(name, rec['last_seen'], len(rec['visits']))
+                for name, rec in self.index['baro'].items() if q in name.lower()]
+        hits.sort(key=lambda h: h[1] or 0, reverse=True)
+        return hits
+
+    def fissure_frequency(self, tier, mission_type, steel_path=False):
+        """Return (appearances, appearances_per_day, last_seen_epoch) for a fissure kind."""
+        rec = self.index['fissures'].get(_fissure_key(tier, mission_type, steel_path))
+        if not rec:
+            return 0, 0.0, None
+        days = max((time.time() - self.index['since']) / 86400, 1 / 24)
+        return rec['count'], rec['count'] / days, rec['last_seen']
+
+    # --- Retention ---
+
+    def prune(self):
+        """Drop snapshots older than the retention window and compact the blob file.
+
+        The state as of the cutoff is folded into the first kept snapshot so the
+        chain of "changed only" entries still reconstructs correctly.
+        """
+        cutoff = time.time() - self.retention_days * 86400
+        entries = []
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(loads(line))
+                except ValueError:
+                    continue
+
+        base = {}
+        kept = []
+        for entry in entries:
+            if entry['ts'] < cutoff:
+                for section, ref in entry['changed'].items():
+                    if ref is None: base.pop(section, None)
+                    else: base[section] = ref
+            else:
+                kept.append(entry)
+        self._prune_index(cutoff)
+        if len(kept) == len(entries):
+            return
+        if kept:
+            kept[0]['changed'] = {**base, **kept[0]['changed']}
+        elif base:
+            kept = [{'ts': entries[-1]['ts'], 'changed': base}]
+
+        # Copy only referenced blobs into a fresh file, rewriting offsets
+        new_blobs = bytearray()
+        moved = {}
+        with open(self.blob_file, 'rb') as f:
+            for entry in kept:
+                for section, ref in entry['changed'].items():
+                    if ref is None: continue
+                    digest, offset, length = ref
+                    if digest not in moved:
+                        f.seek(offset)
+                        moved[digest] = len(new_blobs)
+                        new_blobs += f.read(length)
+                    ref[1] = moved[digest]
+
+        atomic_write_bytes(self.blob_file, bytes(new_blobs))
+        atomic_write_bytes(self.log_file, ''.join(json.dumps(e, separators=(',', ':')) + '\n' for e in kept).encode('utf-8'))
+
+        self.blobs, self.latest = {}, {}
+        self.first_ts = self.last_ts = None
+        self.count = 0
+        for entry in kept:
+            self._apply_entry(entry)
+        print(f"Pruned snapshot history: kept {len(kept)} of {len(entries)} snapshots.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the world-state snapshot history")
+    parser.add_argument('--dir', default=SNAPSHOT_DIR, help="Snapshot directory (default: pc/en)")
+    sub = parser.add_subparsers(dest='query', required=True)
+    baro = sub.add_parser('baro', help="When Baro last carried matching items")
+    baro.add_argument('item')
+    fissures = sub.add_parser('fissures', help="How often a fissure kind appeared")
+    fissures.add_argument('tier')
+    fissures.add_argument('mission_type')
+    fissures.add_argument('--sp', action='store_true', help="Steel Path")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.dir)
+    if args.query == 'baro':
+        hits = store.baro_last_seen(args.item)
+        if not hits:
+            print(f"No Baro sightings matching '{args.item}'.")
+        for item, last_seen, visits in hits:
+            print(f"{item:<40}{_iso(last_seen) if last_seen else '-':>22}{visits:>4} visit(s)")
+    else:
+        count, per_day, last_seen = store.fissure_frequency(args.tier, args.mission_type, args.sp)
+        print(f"{_fissure_key(args.tier, args.mission_type, args.sp)}: {count} appearance(s), "
+              f"{per_day:.2f}/day, last seen {_iso(last_seen) if last_seen else 'never'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,242 @@
-import requests
 import re
-import json
+import gzip
+import io
 import os
+import xml.etree.ElementTree as ET
+from fileio import atomic_write_json, load_json
+import http_client
+from item_registry import ItemRegistry
+import relic_values
+import node_rewards
 
 CACHE_FILE = os.path.join(os.path.dirname(__file__), 'data', 'overframe_cache.json')
+# Conditional-request state (ETags, Last-Modified, per-sitemap lastmod + items)
+META_FILE = os.path.join(os.path.dirname(__file__), 'data', 'overframe_cache_meta.json')
 
-def update_cache():
+SITEMAP_URL = "https://overframe.gg/sitemap.xml"
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+# <loc>https://overframe.gg/items/arsenal/60/volt/</loc>
+ITEM_PATTERN = re.compile(r'https://overframe\.gg/items/arsenal/(\d+)/([\w-]+)/')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_tag(tag):
+    # "{http://www.sitemaps.org/schemas/sitemap/0.9}loc" -> "loc"
+    return tag.rsplit('}', 1)[-1]
+
+
+def _open_sitemap(url, state):
+    """Conditionally GET a sitemap. Returns a readable stream, or None if unchanged (304)."""
+    headers = dict(HEADERS)
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+
+    r = http_client.stream(url, headers=headers, guarded=True, timeout=30)
+    if r.status_code == 304:
+        r.close()
+        return None, r
+    if r.status_code != 200:
+        r.close()
+        raise RuntimeError(f"Failed to fetch sitemap {url}: {r.status_code}")
+
+    # Transfer-level gzip (Content-Encoding) is handled by urllib3;
+    # .xml.gz files are gzip on top of that, so sniff the magic bytes.
+    r.raw.decode_content = True
+    r.raw.auto_close = False # Else urllib3 closes it at EOF, under the BufferedReader's read-ahead
+    raw = io.BufferedReader(r.raw)
+    if raw.peek(2)[:2] == GZIP_MAGIC:
+        raw = gzip.GzipFile(fileobj=raw)
+    return raw, r
+
+
+def _iter_sitemap(stream):
+    """Stream-parse a sitemap or sitemap index.
+
+    Yields (kind, loc, lastmod) where kind is 'sitemap' for index children
+    and 'url' for page entries. Elements are cleared as we go so memory stays
+    flat regardless of sitemap size.
+    """
+    loc = lastmod = None
+    for event, elem in ET.iterparse(stream, events=('end',)):
+        tag = _local_tag(elem.tag)
+        if tag == 'loc':
+            loc = (elem.text or '').strip()
+        elif tag == 'lastmod':
+            lastmod = (elem.text or '').strip() or None
+        elif tag in ('url', 'sitemap'):
+            if loc:
+                yield tag, loc, lastmod
+            loc = lastmod = None
+            elem.clear()
+
+
+def _item_from_loc(loc, lastmod):
+    m = ITEM_PATTERN.match(loc)
+    if not m:
+        return None, None
+    item_id, slug = m.groups()
+    # Normalize name: "volt-prime" -> "Volt Prime"
+    name = slug.replace('-', ' ').title()
+    entry = {
+        "id": item_id,
+        "slug": slug,
+        "name": name,
+        "url": f"https://overframe.gg/items/arsenal/{item_id}/{slug}/"
+    }
+    if lastmod:
+        entry["lastmod"] = lastmod
+    # Key by lowercase name for easy search
+    return name.lower(), entry
+
+
+def _scan_sitemap(url, sitemaps_meta, new_meta, items, report, force):
+    """Fetch one sitemap (recursing into indexes), collecting items into `items`.
+
+    Unchanged sitemaps (304 / same lastmod) reuse the items recorded last run.
+    """
+    state = {} if force else sitemaps_meta.get(url, {})
+    stream, resp = _open_sitemap(url, state)
+
+    if stream is None:
+        report['unchanged_sitemaps'] += 1
+        _reuse_sitemap(url, sitemaps_meta, new_meta, items)
+        return
+
+    with resp:
+        entry = {
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'items': [],
+            'children': [],
+        }
+        children = []
+        for kind, loc, lastmod in _iter_sitemap(stream):
+            if kind == 'sitemap':
+                children.append((loc, lastmod))
+            else:
+                key, item = _item_from_loc(loc, lastmod)
+                if key:
+                    items[key] = item
+                    entry['items'].append(key)
+        # Bytes actually pulled off the wire (compressed size)
+        report['bytes'] += resp.raw.tell()
+
+    new_meta[url] = entry
+    report['fetched_sitemaps'] += 1
+
+    for child_url, child_lastmod in children:
+        entry['children'].append(child_url)
+        prev = sitemaps_meta.get(child_url)
+        if not force and prev and child_lastmod and prev.get('lastmod') == child_lastmod:
+            # Index says this child hasn't changed; skip the request entirely
+            report['unchanged_sitemaps'] += 1
+            _reuse_sitemap(child_url, sitemaps_meta, new_meta, items)
+            continue
+        _scan_sitemap(child_url, sitemaps_meta, new_meta, items, report, force)
+        new_meta[child_url]['lastmod'] = child_lastmod
+
+
+def _reuse_sitemap(url, sitemaps_meta, new_meta, items):
+    prev = sitemaps_meta.get(url, {})
+    new_meta[url] = prev
+    for key in prev.get('items', []):
+        items.setdefault(key, None)  # Placeholder: keep whatever the current cache has
+    for child_url in prev.get('children', []):
+        _reuse_sitemap(child_url, sitemaps_meta, new_meta, items)
+
+
+def update_cache(force=False):
+    """Incrementally refresh the Overframe item catalogue.
+
+    Returns a diff report dict ({'added': [...], 'removed': [...], 'changed': [...], ...})
+    or None if the refresh failed.
+    """
     print("Fetching sitemap...")
-    url = "https://overframe.gg/sitemap.xml"
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    
+    current = load_json(CACHE_FILE, {}) or {}
+    meta = load_json(META_FILE, {}) or {}
+    sitemaps_meta = meta.get('sitemaps', {})
+    if not current:
+        # Nothing to merge into; unchanged sitemaps would contribute no items
+        force = True
+
+    report = {'added': [], 'removed': [], 'changed': [],
+              'fetched_sitemaps': 0, 'unchanged_sitemaps': 0, 'bytes': 0}
+
     try:
-        r = requests.get(url, headers=headers)
-        if r.status_code != 200:
-            print(f"Failed to fetch sitemap: {r.status_code}")
-            return
-        
-        content = r.text
-        print(f"Sitemap size: {len(content)} bytes")
-        
-        # Regex to find all Arsenal item URLs
-        # <loc>https://overframe.gg/items/arsenal/60/volt/</loc>
-        pattern = re.compile(r'https://overframe\.gg/items/arsenal/(\d+)/([\w-]+)/')
-        matches = pattern.findall(content)
-        
-        print(f"Found {len(matches)} items.")
-        
-        cache = {}
-        for item_id, slug in matches:
-            # Normalize name: "volt-prime" -> "Volt Prime"
-            name = slug.replace('-', ' ').title()
-            
-            # Key by lowercase name for easy search
-            key = name.lower()
-            
-            cache[key] = {
-                "id": item_id,
-                "slug": slug,
-                "name": name,
-                "url": f"https://overframe.gg/items/arsenal/{item_id}/{slug}/"
-            }
-            
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=2)
-            
-        print(f"Saved {len(cache)} items to {CACHE_FILE}")
-        
+        items = {}
+        new_meta = {}
+        _scan_sitemap(SITEMAP_URL, sitemaps_meta, new_meta, items, report, force)
     except Exception as e:
         print(f"Error updating cache: {e}")
+        return None
+
+    # Merge into the existing catalogue
+    merged = {}
+    for key, item in items.items():
+        old = current.get(key)
+        if item is None:
+            if old:
+                merged[key] = old
+            continue
+        if old is None:
+            report['added'].append(key)
+        elif old.get('url') != item['url'] or old.get('lastmod') != item.get('lastmod'):
+            report['changed'].append(key)
+        merged[key] = {**old, **item} if old else item
+
+    report['removed'] = [k for k in current if k not in merged]
+
+    if report['added'] or report['removed'] or report['changed'] or not os.path.exists(CACHE_FILE):
+        atomic_write_json(CACHE_FILE, merged, indent=2)
+    atomic_write_json(META_FILE, {'sitemaps': new_meta}, indent=2)
+
+    print(f"Catalogue: {len(merged)} items (+{len(report['added'])} / -{len(report['removed'])} / ~{len(report['changed'])}), "
+          f"{report['fetched_sitemaps']} sitemap(s) fetched, {report['unchanged_sitemaps']} unchanged, "
+          f"{report['bytes']} bytes")
+    return report
+
+
+def update_registry(force=False):
+    """Rebuild the item identity registry (item_registry.py) from the current catalogue; at most daily unless forced."""
+    registry = ItemRegistry()
+    rebuilt = registry.refresh(load_json(CACHE_FILE, {}), force=force)
+    if rebuilt:
+        print(f"Item registry: {len(registry.items)} items, {len(registry.aliases)} aliases")
+    return rebuilt
+
+
+def update_relics(force=False):
+    """Relic drop tables (daily) and reward prices (every few hours) for relic_values.py. Returns True if either changed."""
+    drops = relic_values.refresh_drops(force)
+    prices = relic_values.refresh_prices(force=force or drops)
+    return drops or prices
+
+
+def update_all(force=False, stop=None, enrich=True):
+    """Catalogue, item metadata for new/changed items (unless enrich is False), registry (rebuilt
+    right away when either changed), then relic and mission reward data. Setting `stop` cuts the
+    metadata crawl short.
+
+    Returns the catalogue report + 'enriched' count and 'registry', 'relics' and 'nodes' flags."""
+    from enrich_catalogue import enrich_catalogue # Imports this module
+    report = update_cache(force)
+    changed = bool(report and (report['added'] or report['removed'] or report['changed']))
+    enriched = enrich_catalogue(stop=stop)['enriched'] if enrich and report is not None else 0
+    rebuilt = update_registry(force=force or changed or bool(enriched))
+    relics = update_relics(force)
+    nodes = node_rewards.refresh(force)
+    if report is not None:
+        report['enriched'] = enriched
+        report['registry'] = rebuilt
+        report['relics'] = relics
+        report['nodes'] = nodes
+    return report
+
 
 if __name__ == "__main__":
-    update_cache()
+    import sys
+    update_all(force='--force' in sys.argv)
@@ -0,0 +1,136 @@
+"""Typed view of a world-state payload.
+
+WorldState wraps the decoded dict and builds each section's model the first time a
+consumer touches it: rendering cycles and fissures never converts the sortie, and
+nothing converts the sections the overlay doesn't show (news, syndicates, events...).
+Models are slotted dataclasses; expiries are epoch seconds, parsed once per update,
+so countdowns are a subtraction from time.time().
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+CYCLE_KEYS = {
+    'earth': 'earthCycle',
+    'cetus': 'cetusCycle',
+    'vallis': 'vallisCycle',
+    'cambion': 'cambionCycle',
+    'zariman': 'zarimanCycle',
+}
+
+@lru_cache(maxsize=1024)
+def parse_epoch(time_str):
+    """ISO timestamp (e.g. 2026-02-08T20:00:00.558Z) -> epoch seconds, or None.
+
+    Memoised: most expiries are unchanged from one poll to the next.
+    """
+    if not time_str: return None
+    try:
+        return datetime.fromisoformat(time_str.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+# Explicit __slots__ rather than dataclass(slots=True), which needs Python 3.10
+
+@dataclass
+class Cycle:
+    __slots__ = ('state', 'expiry')
+    state: str
+    expiry: Optional[float]
+
+@dataclass
+class Fissure:
+    __slots__ = ('tier', 'mission_type', 'node', 'enemy', 'expiry', 'is_hard', 'is_storm')
+    tier: Optional[str]
+    mission_type: Optional[str]
+    node: Optional[str]
+    enemy: Optional[str]
+    expiry: Optional[float]
+    is_hard: bool
+    is_storm: bool
+
+@dataclass
+class Mission:
+    __slots__ = ('mission_type', 'modifier')
+    mission_type: str
+    modifier: Optional[str]
+
+@dataclass
+class Sortie:
+    """Also used for the Archon Hunt (no faction, no modifiers)."""
+    __slots__ = ('boss', 'faction', 'missions')
+    boss: str
+    faction: str
+    missions: Tuple[Mission, ...]
+
+@dataclass
+class Challenge:
+    __slots__ = ('title', 'reputation')
+    title: str
+    reputation: int
+
+def _cycles(raw):
+    cycles = {}
+    for key, section in CYCLE_KEYS.items():
+        data = raw.get(section) or {}
+        label = data.get('state', 'Unknown')
+        if key == 'cambion':
+            label = data.get('active', label)
+        cycles[key] = Cycle(label, parse_epoch(data.get('expiry')))
+    return cycles
+
+def _fissures(raw):
+    return tuple(Fissure(f.get('tier'), f.get('missionType'), f.get('node'), f.get('enemy'),
+                         parse_epoch(f.get('expiry')), f.get('isHard', False), f.get('isStorm', False))
+                 for f in raw.get('fissures') or [])
+
+def _sortie(data):
+    if not data: return None
+    return Sortie(data.get('boss', 'Unknown'), data.get('faction', 'Unknown'),
+                  tuple(Mission(m['missionType'], m.get('modifier')) for m in data.get('variants', [])))
+
+def _nightwave(raw):
+    nw = raw.get('nightwave') or {}
+    return tuple(Challenge(c['title'], c['reputation']) for c in nw.get('activeChallenges') or [])
+
+class WorldState:
+    """Lazily typed sections of one world-state dict (`raw` stays available for alerts/snapshots)."""
+    __slots__ = ('raw', '_sections')
+
+    def __init__(self, raw):
+        self.raw = raw or {}
+        self._sections = {}
+
+    def _section(self, name, build):
+        if name not in self._sections:
+            self._sections[name] = build()
+        return self._sections[name]
+
+    @property
+    def cycles(self) -> Dict[str, Cycle]:
+        return self._section('cycles', lambda: _cycles(self.raw))
+
+    @property
+    def fissures(self) -> Tuple[Fissure, ...]:
+        return self._section('fissures', lambda: _fissures(self.raw))
+
+    @property
+    def sortie(self) -> Optional[Sortie]:
+        return self._section('sortie', lambda: _sortie(self.raw.get('sortie')))
+
+    @property
+    def archon_hunt(self) -> Optional[Sortie]:
+        return self._section('archon_hunt', lambda: _sortie(self.raw.get('archonHunt')))
+
+    @property
+    def nightwave(self) -> Tuple[Challenge, ...]:
+        return self._section('nightwave', lambda: _nightwave(self.raw))
+
+    @property
+    def void_trader(self):
+        return self.raw.get('voidTrader') or {}
+
+    @property
+    def invasions(self):
+        return self.raw.get('invasions') or []
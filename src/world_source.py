@@ -0,0 +1,144 @@
+"""Push subscription to a world-state feed (server-sent events).
+
+The feed is a text/event-stream; each event's data is JSON:
+    event: snapshot   full world state (sent on connect)
+    event: update     {section: value, ...} - only the sections that changed
+Comment lines (": heartbeat") keep the channel alive between events.
+
+A subscription that errors, ends, or stays silent for longer than READ_TIMEOUT is
+treated as dropped: it is marked disconnected (the engine then falls back to
+conditional polling for that stream) and reconnects with exponential backoff.
+"""
+import threading
+import time
+import http_client
+from fileio import loads
+
+READ_TIMEOUT = 45 # seconds without any event or heartbeat
+RETRY_MIN_SECONDS = 5
+RETRY_MAX_SECONDS = 300
+
+def iter_events(lines):
+    """Parse SSE lines into (event, data) pairs."""
+    event, data = 'message', []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line:
+            if data:
+                yield event, '\n'.join(data)
+            event, data = 'message', []
+        elif line.startswith(':'):
+            yield 'heartbeat', ''
+        else:
+            field, _, value = line.partition(':')
+            value = value[1:] if value.startswith(' ') else value
+            if field == 'event':
+                event = value
+            elif field == 'data':
+                data.append(value)
+
+def read_lines(raw, chunk_size=65536):
+    """Yield lines from a streaming urllib3 response as soon as each one is complete.
+
+    requests' iter_lines() waits for a whole chunk_size block before yielding, which
+    holds back small events on a quiet stream; read1() returns whatever has arrived.
+    """
+    if not hasattr(raw, 'read1'): # urllib3 < 2.3
+        for line in iter(raw.readline, b''):
+            yield line.rstrip(b'\r\n')
+        return
+    partial = []
+    while True:
+        chunk = raw.read1(chunk_size, decode_content=True)
+        if not chunk:
+            break
+        *lines, rest = chunk.split(b'\n')
+        for line in lines:
+            if partial:
+                line, partial = b''.join(partial) + line, []
+            yield line.rstrip(b'\r')
+        if rest:
+            partial.append(rest)
+    if partial:
+        yield b''.join(partial).rstrip(b'\r')
+
+def apply_event(state, event, data):
+    """Return the state after an event, or None if the event carries no state."""
+    if event == 'snapshot':
+        return loads(data)
+    if event == 'update' and state is not None:
+        patched = dict(state)
+        patched.update(loads(data))
+        return patched
+    return None
+
+class PushSubscription:
+    """Background SSE reader for one stream.
+
+    on_state(state) is called (from the reader thread) with every new full state;
+    on_status(connected) whenever the channel comes up or drops.
+    """
+
+    def __init__(self, url, on_state, on_status=None):
+        self.url = url
+        self.on_state = on_state
+        self.on_status = on_status
+        self.connected = False
+        self.last_event_time = 0
+        self._stop = threading.Event()
+        self._response = None
+        self._thread = None
+
+    def start(self):
+        if self._thread: return self
+        self._thread = threading.Thread(target=self._run, name="WorldStatePush", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close() # Unblocks the reader
+
+    def _set_connected(self, connected):
+        if connected == self.connected: return
+        self.connected = connected
+        if self.on_status:
+            self.on_status(connected)
+
+    def _run(self):
+        delay = RETRY_MIN_SECONDS
+        while not self._stop.is_set():
+            try:
+                if self._consume():
+                    delay = RETRY_MIN_SECONDS # The channel worked; reconnect quickly
+            except Exception as e:
+                if not self._stop.is_set():
+                    print(f"World-state push dropped ({self.url}): {e}")
+            self._set_connected(False)
+            self._stop.wait(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+    def _consume(self):
+        """Read events until the channel ends; returns True if any state arrived."""
+        headers = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache'}
+        self._response = http_client.stream(self.url, headers=headers, timeout=(10, READ_TIMEOUT))
+        try:
+            if self._response.status_code != 200:
+                raise RuntimeError(f"HTTP {self._response.status_code}")
+            state = None
+            for event, data in iter_events(read_lines(self._response.raw)):
+                if self._stop.is_set():
+                    break
+                self.last_event_time = time.time()
+                new_state = apply_event(state, event, data)
+                if new_state is not None:
+                    state = new_state
+                    self._set_connected(True)
+                    self.on_state(state)
+            return state is not None
+        finally:
+            self._response.close()
+            self._response = None
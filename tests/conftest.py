@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+# The app runs with src/ as its working directory and imports modules flat;
+# benchmarks/ holds the replay server that stands in for the upstreams
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+@pytest.fixture
+def replay():
+    """A running ReplayServer with every upstream request routed to it."""
+    import http_client
+    from replay_server import ReplayServer
+    server = ReplayServer().start()
+    http_client.set_upstream_override(server.base_url)
+    yield server
+    http_client.set_upstream_override('')
+    server.stop()
@@ -0,0 +1,27 @@
+import os
+
+from alert_rules import AlertEngine, reward_string
+from api_clients import WarframeAPI
+from fileio import load_json
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures', 'world_state.json')
+
+def test_default_rules_fire_on_a_recorded_world_state():
+    state = load_json(FIXTURE)
+    alerts = AlertEngine().evaluate(state)
+
+    invasions = [a['text'] for a in alerts if a['section'] == 'invasions']
+    expected = [f"{reward} ({node})" for reward, node in WarframeAPI.process_invasions(state['invasions'])]
+    assert invasions and invasions == expected
+    assert '3x Fieldron (Hydra (Pluto))' in invasions
+    assert any(a['section'] == 'alerts' and a['terms'] == ['catalyst'] for a in alerts)
+
+    primed = AlertEngine()
+    primed.prime(state)
+    assert primed.evaluate(state) == [] # Already seen entries never alert twice
+
+def test_reward_string_shapes():
+    assert reward_string({'countedItems': [{'count': 3, 'type': 'Fieldron'}], 'items': ['Orokin Catalyst Blueprint']}) \
+        == '3x Fieldron + Orokin Catalyst Blueprint'
+    assert reward_string({'asString': 'Forma Blueprint', 'items': ['ignored']}) == 'Forma Blueprint'
+    assert reward_string({}) == ''
@@ -0,0 +1,62 @@
+import pytest
+
+import http_client
+from http_client import CircuitBreaker
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_client.time, 'monotonic', lambda: now[0])
+    return now
+
+def test_opens_after_consecutive_failures(clock):
+    b = CircuitBreaker(failures=3, cooldown=30)
+    assert not b.record(False)
+    assert not b.record(False)
+    assert b.record(True) is False  # A success resets the streak
+    assert not b.record(False) and not b.record(False)
+    assert b.state == 'closed' and b.allow()
+
+    assert b.record(False)  # Third in a row trips it
+    assert b.state == 'open'
+    assert not b.allow()
+
+def test_half_open_allows_one_trial_and_closes_on_success(clock):
+    b = CircuitBreaker(failures=1, cooldown=30)
+    b.record(False)
+    clock[0] += 30
+    assert b.state == 'half-open'
+    assert b.allow()
+    assert not b.allow()  # Only one trial in flight
+    assert not b.record(True)
+    assert b.state == 'closed' and b.allow()
+
+def test_failed_trial_reopens_for_another_cooldown(clock):
+    b = CircuitBreaker(failures=1, cooldown=30)
+    assert b.record(False)
+    clock[0] += 30
+    assert b.allow()
+    assert not b.record(False)  # Re-opened, not a fresh trip
+    assert b.state == 'open' and not b.allow()
+
+    clock[0] += 29
+    assert not b.allow()
+    clock[0] += 1
+    assert b.state == 'half-open' and b.allow()
+
+def test_named_circuit_trips_apart_from_the_host(replay):
+    import enrich_catalogue
+    http_client.reset_breakers()
+    replay.host_error_rate['overframe.gg'] = 1.0
+    url = "https://overframe.gg/items/arsenal/61/volt-prime/"
+    try:
+        for _ in range(http_client.BREAKER_FAILURES):
+            http_client.get(url, circuit=enrich_catalogue.CRAWL_CIRCUIT)
+        with pytest.raises(http_client.CircuitOpenError):
+            http_client.get(url, circuit=enrich_catalogue.CRAWL_CIRCUIT)
+
+        # Searches still go out to the host (and get its 503) rather than being short-circuited
+        assert http_client.get(url).status_code == 503
+        assert http_client.breaker_states()['overframe.gg'] == 'closed'
+    finally:
+        http_client.reset_breakers()
@@ -0,0 +1,45 @@
+import copy
+
+import pytest
+
+from data_bundle import DataBundle, load_bundle, write_delta
+
+def _record(query, price, full_name=None):
+    return {'query': query, 'full_name': full_name or query.title(), 'market': {'price': price, 'url_key': query.replace(' ', '_')},
+            'drops': '', 'wiki': '', 'bis_url': '', 'updated': 0}
+
+def _versions():
+    v1 = DataBundle({'volt prime set': _record('volt prime set', 100), 'forma': _record('forma', 10)}, version=1)
+    v2 = DataBundle(copy.deepcopy(v1.items), version=2)
+    v2.items['volt prime set']['market']['price'] = 120
+    v2.items['saryn prime set'] = _record('saryn prime set', 90, 'Saryn Prime Warframe Set')
+    v3 = DataBundle(copy.deepcopy(v2.items), version=3)
+    del v3.items['forma']
+    return v1, v2, v3
+
+def test_deltas_chain_onto_the_loaded_version(tmp_path):
+    v1, v2, v3 = _versions()
+    path = str(tmp_path / 'offline_bundle.json.gz')
+    v1.save(path)
+    write_delta(v2.diff(v1), str(tmp_path))
+    write_delta(v3.diff(v2), str(tmp_path))
+    write_delta(DataBundle({}, version=9).diff(DataBundle({}, version=7)), str(tmp_path)) # Doesn't chain
+
+    bundle = load_bundle(path)
+    assert bundle.version == 3
+    assert bundle.items == v3.items
+    assert bundle.lookup('volt prime')['market']['price'] == 120
+    assert bundle.lookup('Saryn Prime Warframe Set') is not None  # Aliases rebuilt from the delta
+    assert bundle.lookup('forma') is None
+
+def test_delta_for_another_version_is_rejected():
+    v1, v2, v3 = _versions()
+    with pytest.raises(ValueError):
+        v1.apply_delta(v3.diff(v2))
+    assert v1.version == 1 and 'forma' in v1.items
+
+def test_delta_carries_only_changes():
+    v1, v2, v3 = _versions()
+    delta = v2.diff(v1)
+    assert sorted(delta['items']) == ['saryn prime set', 'volt prime set']
+    assert delta['removed'] == [] and v3.diff(v2)['removed'] == ['forma']
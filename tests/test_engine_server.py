@@ -0,0 +1,55 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import engine
+from engine_server import make_server
+
+@pytest.fixture
+def daemon(replay, tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, 'SNAPSHOT_DIR', str(tmp_path))
+    data = engine.DataEngine()
+    server = make_server(data, port=0, max_streams=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", data
+    server.shutdown()
+    server.server_close()
+    data.stop()
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as r:
+            return r.status, json.load(r)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+@pytest.mark.parametrize('key', ['nope/en', 'pc/../../tmp', 'pc/xx'])
+def test_invalid_stream_is_a_bad_request(daemon, key):
+    base, data = daemon
+    status, body = _get(f"{base}/worldstate?stream={key}")
+    assert status == 400 and 'Unknown' in body['error']
+    assert list(data.streams) == ['pc/en']
+
+def test_client_streams_are_capped(daemon):
+    base, data = daemon
+    assert _get(f"{base}/worldstate?stream=ps4")[0] == 200
+    assert _get(f"{base}/worldstate?stream=PC/EN")[0] == 200 # Already tracked, however it's spelled
+    status, body = _get(f"{base}/worldstate?stream=xb1/en")
+    assert status == 403 and 'limit' in body['error']
+    assert sorted(data.streams) == ['pc/en', 'ps4/en']
+
+def test_history_endpoints(daemon):
+    base, data = daemon
+    data.streams['pc/en'].snapshots.append({
+        'voidTrader': {'active': True, 'activation': 'visit-1', 'inventory': [{'item': 'Primed Chamber'}]},
+        'fissures': [{'id': 'f1', 'tier': 'Axi', 'missionType': 'Survival', 'isHard': True}],
+    })
+    status, body = _get(f"{base}/history/baro?q=primed")
+    assert status == 200 and [(h['item'], h['visits']) for h in body] == [('Primed Chamber', 1)]
+    status, body = _get(f"{base}/history/fissures?tier=Axi&mission=Survival&sp=1")
+    assert status == 200 and body['count'] == 1
+    assert _get(f"{base}/history/fissures?tier=Axi&mission=Survival")[1]['count'] == 0
+    assert _get(f"{base}/history/baro?q=primed&stream=xb1")[0] == 404
@@ -0,0 +1,51 @@
+import itertools
+
+import pytest
+
+np = pytest.importorskip('numpy')
+from relic_values import expected_best, RelicTable
+
+def _brute_force(values, chances, n):
+    """E[max of n independent draws], enumerating every outcome."""
+    total = 0.0
+    for draw in itertools.product(range(len(values)), repeat=n):
+        p = np.prod([chances[i] for i in draw])
+        total += p * max(values[i] for i in draw)
+    return total
+
+def test_two_rewards_by_hand():
+    values = np.array([0.0, 10.0])
+    rewards = np.array([[1, 0]])          # Slots out of value order
+    chances = np.array([[[0.5, 0.5]]])
+    ev = expected_best(values, rewards, chances, squad_sizes=(1, 2))
+    assert ev.shape == (1, 1, 2)
+    assert ev[0, 0].tolist() == pytest.approx([5.0, 7.5])
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(3)
+    values = rng.uniform(0, 60, size=12)
+    values[5] = values[7]                 # Ties
+    rewards = np.array([rng.choice(12, 6, replace=False) for _ in range(3)])
+    chances = rng.uniform(size=(3, 2, 6))
+    chances[0, 0, 4:] = 0                 # Padding slots
+    chances /= chances.sum(axis=2, keepdims=True)
+
+    ev = expected_best(values, rewards, chances)
+    for r in range(3):
+        for k in range(2):
+            expected = [_brute_force(values[rewards[r]], chances[r, k], n) for n in (1, 2, 3, 4)]
+            assert ev[r, k].tolist() == pytest.approx(expected)
+
+def test_from_drops_pads_short_tables():
+    data = {'relics': [
+        {'tier': 'Lith', 'relicName': 'A1', 'state': 'Intact',
+         'rewards': [{'itemName': 'Forma Blueprint', 'chance': 50}, {'itemName': 'Volt Prime Neuroptics Blueprint', 'chance': 50}]},
+        {'tier': 'Axi', 'relicName': 'B1', 'state': 'Radiant', 'rewards': [{'itemName': 'Forma Blueprint', 'chance': 100}]},
+    ]}
+    table = RelicTable.from_drops(data)
+    assert table.relics == [('Lith', 'A1'), ('Axi', 'B1')]
+    assert table.chances.sum(axis=2).tolist() == [[1, 0, 0, 0], [0, 0, 0, 1]]
+    values = table.vector({'Forma': 10, 'Volt Prime Neuroptics': 30}.get) # Found without " Blueprint"
+    assert values.tolist() == [10, 30]
+    ev = expected_best(values, table.rewards, table.chances)
+    assert ev[0, 0, 0] == pytest.approx(20) and ev[1, 3, 3] == pytest.approx(10)
@@ -0,0 +1,48 @@
+from search_cache import CachedResult, SearchResultCache, SECTION_TTL
+
+def _entry(name):
+    entry = CachedResult()
+    entry.set('market', {'full_name': name, 'price': 10})
+    return entry
+
+def test_queries_resolving_to_one_item_share_an_entry():
+    cache = SearchResultCache()
+    volt = _entry('Volt Prime Set')
+    cache.put('volt', volt)
+    cache.put('VOLT  prime', volt)
+
+    assert cache.get('Volt') is volt
+    assert cache.get('volt prime') is volt
+    assert cache.get('volt prime set') is volt  # The resolved name is an alias too
+    assert cache.get('saryn') is None
+    assert len(cache) == 1
+
+def test_replacing_an_entry_keeps_its_aliases():
+    cache = SearchResultCache()
+    cache.put('volt', _entry('Volt Prime Set'))
+    fresh = _entry('Volt Prime Set')
+    cache.put('vp', fresh)
+    assert cache.get('volt') is fresh and cache.get('vp') is fresh
+
+def test_lru_eviction_drops_aliases():
+    cache = SearchResultCache(max_entries=2)
+    cache.put('a', _entry('Alpha'))
+    cache.put('b', _entry('Beta'))
+    cache.get('a')  # Alpha is now most recent
+    cache.put('c', _entry('Gamma'))
+
+    assert cache.get('b') is None and cache.get('beta') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert 'b' not in cache._aliases
+
+def test_stale_sections_and_memoised_result():
+    entry = _entry('Alpha')
+    now = entry.fetched['market']
+    assert 'market' not in entry.stale(now)
+    assert 'market' in entry.stale(now + SECTION_TTL['market'])
+
+    entry.result = 'rendered'
+    entry.set('market', {'full_name': 'Alpha', 'price': 10})
+    assert entry.result == 'rendered'  # Same value: keep the render
+    entry.set('market', {'full_name': 'Alpha', 'price': 12})
+    assert entry.result is None
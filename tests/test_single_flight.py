@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+import http_client
+
+def _run_together(n, fetch, key=('https://example.org/x', ())):
+    """Call _single_flight from n threads at once; returns (results, errors)."""
+    results, errors = [], []
+    def worker():
+        try:
+            results.append(http_client._single_flight(key[0], key, fetch))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+@pytest.mark.parametrize('fail', [False, True])
+def test_concurrent_callers_share_one_call(fail, monkeypatch):
+    release = threading.Event()
+    calls, joined = [], []
+    monkeypatch.setattr(http_client.REGISTRY, 'record_shared', joined.append)
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        if fail:
+            raise ConnectionError('upstream down')
+        return object()
+
+    threads, results, errors = _run_together(4, fetch)
+    # Let every follower find the leader's flight before it finishes
+    for _ in range(500):
+        if len(joined) == 3:
+            break
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and len(joined) == 3
+    if fail:
+        assert len(errors) == 4 and len({id(e) for e in errors}) == 1
+    else:
+        assert len(results) == 4 and len({id(r) for r in results}) == 1
+    assert not http_client._inflight
+
+def test_separate_keys_do_not_share():
+    assert http_client.request_key('HTTPS://Example.org/a?b=1&a=2') == http_client.request_key('https://example.org/a?a=2&b=1')
+    assert http_client.request_key('https://example.org/a', {'If-None-Match': '"x"'}) != http_client.request_key('https://example.org/a')
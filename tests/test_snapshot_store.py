@@ -0,0 +1,57 @@
+import os
+import time
+
+import pytest
+
+from snapshot_store import SnapshotStore
+
+def _state(fissure_id='a', baro=True):
+    trader = {'active': True, 'activation': 'visit-1', 'inventory': [{'item': 'Prisma Skana'}]} if baro else {}
+    return {
+        'timestamp': 'ignored',
+        'fissures': [{'id': fissure_id, 'tier': 'Axi', 'missionType': 'Survival', 'isHard': False}],
+        'voidTrader': trader,
+    }
+
+def test_unchanged_poll_does_not_rewrite_index(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    assert store.append(_state(), ts=1000)
+    mtime = os.stat(store.index_file).st_mtime_ns
+    time.sleep(0.01)
+
+    assert not store.append(_state(), ts=1060)
+    assert os.stat(store.index_file).st_mtime_ns == mtime
+    assert store.index['baro']['Prisma Skana']['last_seen'] == 1060
+
+def test_failed_blob_write_leaves_no_dangling_refs(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path))
+    def broken_fsync(fd):
+        raise OSError('disk full')
+    monkeypatch.setattr(os, 'fsync', broken_fsync)
+    with pytest.raises(OSError):
+        store.append(_state(), ts=1000)
+    assert store.blobs == {}
+
+    monkeypatch.undo()
+    assert store.append(_state(), ts=1001)
+    assert store.latest_state()['fissures'][0]['id'] == 'a'
+
+def test_prune_trims_index(tmp_path):
+    store = SnapshotStore(str(tmp_path), retention_days=1)
+    old = time.time() - 3 * 86400
+    store.append(_state('a'), ts=old)
+    store.append(_state('b', baro=False))  # Triggers prune: history spans > retention
+
+    assert 'Prisma Skana' not in store.index['baro']
+    assert store.fissure_frequency('Axi', 'Survival')[0] == 1
+    assert store.index['since'] > old
+    assert store.latest_state()['fissures'][0]['id'] == 'b'
+
+def test_countdown_fields_do_not_break_dedup(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    cycle = {'id': 'cetusCycle1', 'state': 'night', 'expiry': '2026-02-08T20:58:00.000Z'}
+    assert store.append({'cetusCycle': dict(cycle, timeLeft='17m 35s'), 'steelPath': {'remaining': '3h 19m'}}, ts=1000)
+    assert not store.append({'cetusCycle': dict(cycle, timeLeft='16m 35s'), 'steelPath': {'remaining': '3h 18m'}}, ts=1060)
+    assert store.count == 1
+    assert store.append({'cetusCycle': dict(cycle, state='day', timeLeft='1h'), 'steelPath': {'remaining': '3h 17m'}}, ts=1120)
+    assert store.latest_state()['cetusCycle']['state'] == 'day'
@@ -0,0 +1,14 @@
+import update_cache
+
+def test_sitemap_goes_through_http_client(replay, tmp_path, monkeypatch):
+    monkeypatch.setattr(update_cache, 'CACHE_FILE', str(tmp_path / 'overframe_cache.json'))
+    monkeypatch.setattr(update_cache, 'META_FILE', str(tmp_path / 'overframe_cache_meta.json'))
+
+    report = update_cache.update_cache()
+    assert sorted(report['added']) == ['acceltra', 'volt', 'volt prime']
+    assert ('overframe.gg', '/sitemap.xml', 200) in replay.requests
+
+    # The stored ETag makes the next run a conditional request
+    report = update_cache.update_cache()
+    assert report['unchanged_sitemaps'] == 1 and not report['added']
+    assert replay.requests[-1] == ('overframe.gg', '/sitemap.xml', 304)
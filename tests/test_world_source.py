@@ -0,0 +1,54 @@
+import queue
+import time
+
+import engine
+from world_source import iter_events, read_lines
+
+PUSH_URL = "https://api.warframestat.us/{platform}/events?language={language}"
+
+class _Chunks:
+    """Stands in for a urllib3 response delivering the stream in arbitrary pieces."""
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read1(self, amt, decode_content=None):
+        return self.chunks.pop(0) if self.chunks else b''
+
+def _wait_for(predicate, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+def test_read_lines_joins_split_lines():
+    raw = _Chunks([b'event: upd', b'ate\r\ndata: {"a"', b':1}\n', b'\n: heartbeat\n'])
+    assert list(read_lines(raw)) == [b'event: update', b'data: {"a":1}', b'', b': heartbeat']
+    assert list(iter_events([b'event: update', b'data: {"a":1}', b''])) == [('update', '{"a":1}')]
+
+def test_push_event_arrives_promptly_then_falls_back_to_polling(replay, tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, 'SNAPSHOT_DIR', str(tmp_path))
+    data = engine.DataEngine(push_url=PUSH_URL)
+    pushed = queue.Queue()
+    data.add_listener(lambda key, state: pushed.put(state))
+    stream = data.streams[data.active]
+    try:
+        assert pushed.get(timeout=5) # Snapshot sent on connect
+        assert stream.push.connected
+
+        start = time.perf_counter()
+        replay.publish('update', {'alerts': [{'id': 'pushed'}]})
+        state = pushed.get(timeout=1)
+        assert state['alerts'] == [{'id': 'pushed'}]
+        assert time.perf_counter() - start < 1
+
+        # Drop the channel and refuse reconnects: the stream must go back to conditional polls
+        replay.push_enabled = False
+        replay.drop_push()
+        assert _wait_for(lambda: not stream.push.connected and stream.etag, 5)
+        assert data.refresh_world_state() is stream.state
+        host, path, status = replay.requests[-1]
+        assert not path.endswith('/events') and status == 304
+    finally:
+        data.stop()